@@ -0,0 +1,96 @@
+"""Count IMAS round-trips in `copy_ids_entry_complex`.
+
+Replaces IMAS with a fake backend that records every `get`, `put` and
+`partialGet` call. The data entry holds a few filled IDSs, all other
+IDS occurrences from the (synthetic) data dictionary are empty.
+
+Usage:
+
+    python benchmarks/bench_copy_ids.py [n_idss] [maxoccur] [n_filled]
+"""
+from __future__ import annotations
+
+import sys
+from collections import Counter
+from types import SimpleNamespace
+
+from duqtools.ids import ImasHandle, _copy
+
+EMPTY_INT = -999999999
+
+
+class FakeIDS:
+    def __init__(self, name: str, filled: set[tuple[str, int]], calls: Counter):
+        self.name = name
+        self.filled = filled
+        self.calls = calls
+        self.ids_properties = SimpleNamespace(homogeneous_time=EMPTY_INT)
+
+    def _homogeneous_time(self, occurrence: int) -> int:
+        return 1 if (self.name, occurrence) in self.filled else EMPTY_INT
+
+    def partialGet(self, path: str, occurrence: int = 0):
+        self.calls["partialGet"] += 1
+        return self._homogeneous_time(occurrence)
+
+    def get(self, occurrence: int = 0):
+        self.calls["get"] += 1
+        self.ids_properties.homogeneous_time = self._homogeneous_time(occurrence)
+
+    def put(self, occurrence: int = 0):
+        self.calls["put"] += 1
+
+    def setExpIdx(self, idx):
+        pass
+
+
+class FakeEntry:
+    expIdx = 0
+
+    def __init__(self, names, filled, calls):
+        for name in names:
+            self.__dict__[name] = FakeIDS(name, filled, calls)
+
+    def open_env(self, *args):
+        return (0,)
+
+    def create_env(self, *args):
+        return (0,)
+
+    def close(self):
+        pass
+
+
+def main(n_idss: int = 80, maxoccur: int = 2, n_filled: int = 5):
+    names = [f"ids_{i:03d}" for i in range(n_idss)]
+    filled = {(name, 0) for name in names[:n_filled]}
+    calls: Counter = Counter()
+
+    _copy.imas = SimpleNamespace(
+        names=["imas_3_38_0_ual_4_11_0"],
+        ids=lambda *_: FakeEntry(names, filled, calls),
+    )
+    _copy.imasdef = SimpleNamespace(EMPTY_INT=EMPTY_INT)
+    _copy.Parser = SimpleNamespace(
+        load_idsdef=lambda: SimpleNamespace(
+            idss=[{"name": name, "maxoccur": str(maxoccur)} for name in names]
+        )
+    )
+
+    source = ImasHandle(user="/tmp/source", db="jet", shot=1, run=1)
+    target = ImasHandle(user="/tmp/target", db="jet", shot=1, run=2)
+
+    _copy.copy_ids_entry_complex(source, target)
+
+    n_occurrences = n_idss * (maxoccur + 1)
+    before = 2 * n_occurrences  # one `get` and one `put` per occurrence
+    after = sum(calls.values())
+
+    print(f"{n_idss} IDSs, maxoccur={maxoccur}, {n_filled} filled occurrences")
+    print(f"Round-trips without probing: {before}")
+    print(f"Round-trips with probing:    {after} ({dict(calls)})")
+    print(f"Saved: {before - after} ({1 - after / before:.0%})")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
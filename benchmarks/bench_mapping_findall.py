@@ -0,0 +1,98 @@
+"""Benchmark `IDSMapping.findall` / `IDSMapping.find_by_group`.
+
+Compares the key tree lookup for `*`-wildcard patterns against a linear
+regex scan over all keys, on a synthetic IDS with many time slices.
+
+Usage:
+
+    python benchmarks/bench_mapping_findall.py [n_time] [n_ions]
+"""
+from __future__ import annotations
+
+import re
+import sys
+from timeit import repeat
+from types import SimpleNamespace
+
+import numpy as np
+
+from duqtools.ids._mapping import (
+    IDSMapping,
+    insert_re_caret_dollar,
+    replace_index_str,
+)
+
+PATTERNS = (
+    "profiles_1d/*/t_i_ave",
+    "profiles_1d/*/ion/*/temperature",
+    "profiles_1d/*/electrons/density",
+)
+
+
+def make_ids(n_time: int = 500, n_ions: int = 5, n_grid: int = 100):
+    """Generate synthetic `core_profiles`-like IDS."""
+
+    def ion():
+        return SimpleNamespace(
+            temperature=np.random.rand(n_grid),
+            density=np.random.rand(n_grid),
+            velocity=SimpleNamespace(
+                toroidal=np.random.rand(n_grid),
+                poloidal=np.random.rand(n_grid),
+            ),
+        )
+
+    def profile():
+        return SimpleNamespace(
+            grid=SimpleNamespace(rho_tor_norm=np.linspace(0, 1, n_grid)),
+            electrons=SimpleNamespace(
+                temperature=np.random.rand(n_grid),
+                density=np.random.rand(n_grid),
+            ),
+            ion=[ion() for _ in range(n_ions)],
+            t_i_ave=np.random.rand(n_grid),
+            zeff=np.random.rand(n_grid),
+        )
+
+    return SimpleNamespace(
+        profiles_1d=[profile() for _ in range(n_time)],
+        time=np.arange(float(n_time)),
+    )
+
+
+def findall_regex(mapping: IDSMapping, pattern: str) -> dict:
+    """Reference implementation: linear regex scan over all keys."""
+    pattern = replace_index_str(insert_re_caret_dollar(pattern))
+    pat = re.compile(pattern)
+    return {key: mapping[key] for key in mapping._keys if pat.match(key)}
+
+
+def main(n_time: int = 500, n_ions: int = 5, number: int = 10):
+    ids = make_ids(n_time=n_time, n_ions=n_ions)
+    mapping = IDSMapping(ids)
+
+    print(f"Synthetic IDS: {n_time} time slices, {n_ions} ions, {len(mapping)} keys")
+    print()
+    print(f"{'pattern':40s} {'regex (ms)':>12s} {'tree (ms)':>12s} {'speedup':>8s}")
+
+    for pattern in PATTERNS:
+        assert findall_regex(mapping, pattern).keys() == mapping.findall(pattern).keys()
+
+        t_regex = min(
+            repeat(lambda: findall_regex(mapping, pattern), number=number, repeat=3)
+        )
+        t_tree = min(
+            repeat(lambda: mapping.findall(pattern), number=number, repeat=3)
+        )
+
+        t_regex_ms = 1000 * t_regex / number
+        t_tree_ms = 1000 * t_tree / number
+
+        print(
+            f"{pattern:40s} {t_regex_ms:12.3f} {t_tree_ms:12.3f} "
+            f"{t_regex / t_tree:7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,99 @@
+"""Benchmark `IDSMapping.to_xarray` for struct array variables.
+
+Compares the bulk reader against the reference implementation that builds
+nested lists by looking up every time slice from the root of the IDS.
+
+Usage:
+
+    python benchmarks/bench_mapping_to_xarray.py [n_time] [n_ions]
+"""
+from __future__ import annotations
+
+import sys
+from timeit import repeat
+
+import xarray as xr
+from bench_mapping_findall import make_ids
+
+from duqtools.ids import IDSMapping
+from duqtools.schema import IDSVariableModel
+
+VARIABLES = [
+    IDSVariableModel(
+        name="rho_tor_norm",
+        ids="core_profiles",
+        path="profiles_1d/*/grid/rho_tor_norm",
+        dims=["time", "x"],
+    ),
+    IDSVariableModel(
+        name="t_i_ave",
+        ids="core_profiles",
+        path="profiles_1d/*/t_i_ave",
+        dims=["time", "x"],
+    ),
+    IDSVariableModel(
+        name="t_e",
+        ids="core_profiles",
+        path="profiles_1d/*/electrons/temperature",
+        dims=["time", "x"],
+    ),
+    IDSVariableModel(
+        name="t_ion",
+        ids="core_profiles",
+        path="profiles_1d/*/ion/*/temperature",
+        dims=["time", "ion", "x"],
+    ),
+]
+
+
+def read_array_from_parts_lists(mapping: IDSMapping, *parts: str) -> list:
+    """Reference implementation: nested lists, every lookup from the root."""
+    arr = list()
+    root, sub, *remaining = parts
+    nodes = mapping[root]
+
+    for index in range(len(nodes)):
+        path = f"{root}/{index}/{sub}"
+
+        if remaining:
+            sub_arr = read_array_from_parts_lists(mapping, path, *remaining)
+        else:
+            sub_arr = mapping[path]
+
+        arr.append(sub_arr)
+
+    return arr
+
+
+def to_xarray_lists(mapping: IDSMapping, variables) -> xr.Dataset:
+    data_vars = {}
+    for var in variables:
+        parts = var.path.split("/*/")
+        data_vars[var.name] = (var.dims, read_array_from_parts_lists(mapping, *parts))
+    return xr.Dataset(data_vars=data_vars)
+
+
+def main(n_time: int = 500, n_ions: int = 5, number: int = 5):
+    mapping = IDSMapping(make_ids(n_time=n_time, n_ions=n_ions), lazy=True)
+
+    xr.testing.assert_equal(
+        to_xarray_lists(mapping, VARIABLES), mapping.to_xarray(VARIABLES)
+    )
+
+    t_lists = min(
+        repeat(lambda: to_xarray_lists(mapping, VARIABLES), number=number, repeat=3)
+    )
+    t_bulk = min(
+        repeat(lambda: mapping.to_xarray(VARIABLES), number=number, repeat=3)
+    )
+
+    print(f"Synthetic IDS: {n_time} time slices, {n_ions} ions")
+    print(f"{len(VARIABLES)} variables")
+    print()
+    print(f"nested lists (ms): {1000 * t_lists / number:10.3f}")
+    print(f"bulk reader  (ms): {1000 * t_bulk / number:10.3f}")
+    print(f"speedup          : {t_lists / t_bulk:10.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,51 @@
+"""Time enqueueing operations with `add_to_op_queue`.
+
+The queue is enabled, so that operations are only queued and not applied.
+Descriptions are formatted when the queue is printed, this is timed
+separately.
+
+Usage:
+
+    python benchmarks/bench_op_queue.py [n_operations]
+"""
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+from duqtools.operations import add_to_op_queue, op_queue
+
+
+@add_to_op_queue("Writing new batchfile", "{run_dir.name}", quiet=True)
+def write_batchfile(run_dir: Path, *, force: bool = False):
+    pass
+
+
+def main(n_operations: int = 100_000):
+    run_dirs = [Path(f"runs/run_{i:06d}") for i in range(n_operations)]
+
+    op_queue.enabled = True
+
+    try:
+        start = time.perf_counter()
+        for run_dir in run_dirs:
+            write_batchfile(run_dir, force=True)
+        t_enqueue = time.perf_counter() - start
+
+        start = time.perf_counter()
+        descriptions = [op.long_description for op in op_queue]
+        t_describe = time.perf_counter() - start
+    finally:
+        op_queue.clear()
+        op_queue.enabled = False
+
+    assert len(descriptions) == n_operations
+
+    print(f"Enqueue {n_operations} operations: {t_enqueue:.2f} s")
+    print(f"  per operation: {t_enqueue / n_operations * 1e6:.1f} us")
+    print(f"Format descriptions: {t_describe:.2f} s")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,63 @@
+"""Compare `rebase_all_coords` with calling `xr.Dataset.interp` per dataset.
+
+All datasets share the same time and grid coordinates, as for runs that
+were sampled from the same template. These differ from the coordinates
+of the reference dataset.
+
+Usage:
+
+    python benchmarks/bench_rebase_all_coords.py [n_datasets] [n_time] [n_grid]
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+import numpy as np
+import xarray as xr
+
+from duqtools.ids import rebase_all_coords
+
+
+def make_dataset(rng, t: np.ndarray, rho: np.ndarray) -> xr.Dataset:
+    shape = (len(t), len(rho))
+    return xr.Dataset(
+        {f"var_{i}": (("time", "rho_tor_norm"), rng.random(shape)) for i in range(5)},
+        coords={"time": t, "rho_tor_norm": rho},
+    )
+
+
+def main(n_datasets: int = 1000, n_time: int = 50, n_grid: int = 100):
+    rng = np.random.default_rng(0)
+
+    t = np.linspace(0, 1, n_time)
+    rho = np.linspace(0, 1, n_grid)
+
+    reference = make_dataset(rng, t * 1.01, rho[::2])
+    datasets = [make_dataset(rng, t, rho) for _ in range(n_datasets)]
+
+    interp_dict = {
+        name: dim for name, dim in reference.coords.items() if dim.size > 1
+    }
+
+    start = time.perf_counter()
+    expected = [
+        ds.interp(coords=interp_dict, kwargs={"fill_value": "extrapolate"})
+        for ds in datasets
+    ]
+    t_before = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = rebase_all_coords(datasets, reference)
+    t_after = time.perf_counter() - start
+
+    for a, b in zip(result, expected):
+        xr.testing.assert_allclose(a, b, rtol=1e-12)
+
+    print(f"{n_datasets} datasets, {n_time} time steps, {n_grid} grid points")
+    print(f"xr.Dataset.interp: {t_before:.2f} s")
+    print(f"Cached plans:      {t_after:.2f} s ({t_before / t_after:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
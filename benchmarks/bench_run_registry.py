@@ -0,0 +1,100 @@
+"""Time writing and reading the created runs as `runs.yaml` and as the
+compact run registry (`create.run_registry: compact`).
+
+The design is the cartesian product of three dimensions with
+`n_values` values each.
+
+Usage:
+
+    python benchmarks/bench_run_registry.py [n_values]
+"""
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+from pydantic_yaml import parse_yaml_raw_as, to_yaml_file
+
+from duqtools.config import Config
+from duqtools.create import CreateManager
+from duqtools.models import RunRegistry, Runs
+
+
+def main(n_values: int = 10):
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+
+        values = [0.5 + i / n_values for i in range(n_values)]
+
+        cfg = Config.from_dict(
+            {
+                "create": {
+                    "runs_dir": str(tmp_path / "runs"),
+                    "template_data": {
+                        "user": str(tmp_path / "imasdb"),
+                        "db": "jet",
+                        "shot": 123,
+                        "run": 1,
+                    },
+                    "dimensions": [
+                        {"variable": var, "operator": "multiply", "values": values}
+                        for var in ("t_e", "t_i_ave", "zeff")
+                    ],
+                },
+                "system": {"name": "nosystem"},
+            }
+        )
+
+        create_mgr = CreateManager(cfg)
+        create_mgr.runs_yaml = tmp_path / "runs.yaml"
+        create_mgr.runs_registry = tmp_path / "runs_registry.json"
+        create_mgr.runs_dir.mkdir()
+
+        ops_dict = create_mgr.generate_ops_dict()
+        runs = create_mgr.make_run_models(ops_dict=ops_dict, absolute_dirpath=True)
+
+        start = time.perf_counter()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            to_yaml_file(create_mgr.runs_yaml, Runs.model_validate(runs))
+        t_write_yaml = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with open(create_mgr.runs_yaml) as f:
+            parsed = parse_yaml_raw_as(Runs, f)
+        t_read_yaml = time.perf_counter() - start
+
+        # Writing the registry removes runs.yaml
+        size_yaml = create_mgr.runs_yaml.stat().st_size / 1e6
+
+        start = time.perf_counter()
+        create_mgr.write_runs_registry(runs, ops_dict)
+        t_write_registry = time.perf_counter() - start
+
+        start = time.perf_counter()
+        registry = RunRegistry.read(create_mgr.runs_registry)
+        t_read_registry = time.perf_counter() - start
+
+        start = time.perf_counter()
+        dirnames = [run.dirname for run in registry]
+        t_expand_registry = time.perf_counter() - start
+
+        assert len(parsed) == len(dirnames) == len(runs)
+
+        size_registry = create_mgr.runs_registry.stat().st_size / 1e6
+
+    print(f"{len(runs)} runs")
+    print(f"runs.yaml:          write {t_write_yaml:.2f} s, read {t_read_yaml:.2f} s")
+    print(f"  size: {size_yaml:.2f} MB")
+    print(
+        f"runs_registry.json: write {t_write_registry:.2f} s, "
+        f"read {t_read_registry:.2f} s, expand all {t_expand_registry:.2f} s"
+    )
+    print(f"  size: {size_registry:.2f} MB")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
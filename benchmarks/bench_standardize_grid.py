@@ -0,0 +1,77 @@
+"""Compare `standardize_grid` with the per-group `interp` implementation.
+
+Builds a dataset with time-dependent grids, as returned by
+`get_variables(squash=False)`, and standardizes it with both
+implementations. The results are checked to be equal.
+
+Usage:
+
+    python benchmarks/bench_standardize_grid.py [n_time] [n_grid] [n_vars]
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+import numpy as np
+import xarray as xr
+
+from duqtools.ids import standardize_grid
+
+
+def standardize_grid_per_group(
+    ds: xr.Dataset, *, new_dim: str, old_dim: str, group: str
+) -> xr.Dataset:
+    """Split-apply-combine implementation, interpolates one group at a time."""
+    new_dim_data = ds.isel(**{group: 0})[new_dim].data
+
+    groups = []
+    for i in range(ds.sizes[group]):
+        part = ds.isel(**{group: i}).swap_dims({old_dim: new_dim})
+        groups.append(part.interp(**{new_dim: new_dim_data}))
+
+    return xr.concat(groups, dim=group)
+
+
+def make_dataset(n_time: int, n_grid: int, n_vars: int) -> xr.Dataset:
+    rng = np.random.default_rng(0)
+
+    grid = np.linspace(0, 1, n_grid)
+    stretch = 1 + 0.1 * rng.random((n_time, 1))
+    grids = grid * stretch
+
+    data_vars = {"rho_tor_norm": (("time", "$rho_tor_norm"), grids)}
+    for i in range(n_vars):
+        data_vars[f"var_{i}"] = (
+            ("time", "$rho_tor_norm"),
+            rng.random((n_time, n_grid)),
+        )
+    data_vars["var_ion"] = (
+        ("time", "$rho_tor_norm", "ion"),
+        rng.random((n_time, n_grid, 3)),
+    )
+
+    return xr.Dataset(data_vars, coords={"time": np.arange(n_time, dtype=float)})
+
+
+def main(n_time: int = 500, n_grid: int = 100, n_vars: int = 20):
+    ds = make_dataset(n_time, n_grid, n_vars)
+    kwargs = {"new_dim": "rho_tor_norm", "old_dim": "$rho_tor_norm", "group": "time"}
+
+    start = time.perf_counter()
+    expected = standardize_grid_per_group(ds, **kwargs)
+    t_before = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = standardize_grid(ds, **kwargs)
+    t_after = time.perf_counter() - start
+
+    xr.testing.assert_allclose(result, expected.transpose(*result.dims), rtol=1e-12)
+
+    print(f"{n_time} time slices, {n_grid} grid points, {n_vars + 1} variables")
+    print(f"Per-group interp: {t_before:.3f} s")
+    print(f"Vectorized:       {t_after:.3f} s ({t_before / t_after:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
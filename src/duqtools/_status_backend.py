@@ -0,0 +1,297 @@
+"""Backends to query the status of many jobs at once."""
+from __future__ import annotations
+
+import getpass
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess as sp
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional, Sequence
+
+from .models import JobStatus
+
+if TYPE_CHECKING:
+    from .models import Job
+
+logger = logging.getLogger(__name__)
+
+SLURM_JOB_ID = re.compile(rb"Submitted batch job (\d+)")
+
+# Maximum number of job ids per `sacct` call
+SACCT_CHUNK_SIZE = 500
+
+SLURM_STATES = {
+    "PENDING": JobStatus.SUBMITTED,
+    "CONFIGURING": JobStatus.SUBMITTED,
+    "REQUEUED": JobStatus.SUBMITTED,
+    "RESIZING": JobStatus.SUBMITTED,
+    "SUSPENDED": JobStatus.SUBMITTED,
+    "RUNNING": JobStatus.RUNNING,
+    "COMPLETING": JobStatus.RUNNING,
+    "STAGE_OUT": JobStatus.RUNNING,
+    "FAILED": JobStatus.FAILED,
+    "CANCELLED": JobStatus.FAILED,
+    "TIMEOUT": JobStatus.FAILED,
+    "OUT_OF_MEMORY": JobStatus.FAILED,
+    "NODE_FAIL": JobStatus.FAILED,
+    "BOOT_FAIL": JobStatus.FAILED,
+    "DEADLINE": JobStatus.FAILED,
+    "PREEMPTED": JobStatus.FAILED,
+}
+
+
+class StatusBackend(ABC):
+    """Query the status for a collection of jobs."""
+
+    @abstractmethod
+    def query(self, jobs: Sequence[Job]) -> list[JobStatus]:
+        """Return the status for every job, in order."""
+        pass
+
+
+class FileStatusBackend(StatusBackend):
+    """Read the status files of the jobs in a thread pool.
+
+    Statuses are cached by the modification time and size of the status
+    file, so that a status file is only read again when it has changed.
+    Completed and failed jobs are frozen: their status files are checked
+    once when the cache is loaded, and not touched again after that.
+
+    Parameters
+    ----------
+    workers : int
+        Number of threads used to read the status files.
+    index_file : Optional[Path]
+        If given, the cache is persisted to this file.
+    """
+
+    def __init__(self, workers: int = 16, index_file: Optional[Path] = None):
+        self.workers = workers
+        self.index_file = index_file
+
+        self._cache: dict[str, tuple[int, int, JobStatus]] = {}
+        self._frozen: dict[str, JobStatus] = {}
+        self._changed = False
+
+        if index_file:
+            self._load()
+
+    def _load(self):
+        assert self.index_file
+
+        try:
+            with open(self.index_file) as f:
+                index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+
+        self._cache = {
+            path: (mtime, size, JobStatus(status))
+            for path, (mtime, size, status) in index.items()
+        }
+
+    def _save(self):
+        assert self.index_file
+
+        index = {
+            path: (mtime, size, status.value)
+            for path, (mtime, size, status) in self._cache.items()
+        }
+
+        tmp_file = self.index_file.with_suffix(".tmp")
+
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump(index, f)
+            os.replace(tmp_file, self.index_file)
+        except OSError as err:
+            logger.debug("Cannot write status cache %s: %s", self.index_file, err)
+
+        self._changed = False
+
+    def _status(self, job: Job) -> JobStatus:
+        status_file = job.status_file
+        key = str(status_file)
+
+        if key in self._frozen:
+            return self._frozen[key]
+
+        try:
+            stat = status_file.stat()
+        except FileNotFoundError:
+            if self._cache.pop(key, None):
+                self._changed = True
+            return JobStatus.NOSTATUS
+
+        cached = self._cache.get(key)
+
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            status = cached[2]
+        else:
+            status = job.status()
+
+            # Submitted/unknown also depend on the lockfile
+            if status in (JobStatus.SUBMITTED, JobStatus.UNKNOWN):
+                return status
+
+            self._cache[key] = (stat.st_mtime_ns, stat.st_size, status)
+            self._changed = True
+
+        if status in (JobStatus.COMPLETED, JobStatus.FAILED):
+            self._frozen[key] = status
+
+        return status
+
+    def query(self, jobs: Sequence[Job]) -> list[JobStatus]:
+        if self.workers <= 1 or len(jobs) <= 1:
+            statuses = [self._status(job) for job in jobs]
+        else:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                statuses = list(executor.map(self._status, jobs))
+
+        if self.index_file and self._changed:
+            self._save()
+
+        return statuses
+
+
+def _run_command(cmd: list[str]) -> str:
+    ret = sp.run(cmd, check=True, capture_output=True, text=True)
+    return ret.stdout
+
+
+class SlurmStatusBackend(StatusBackend):
+    """Query the job status from slurm.
+
+    The slurm job ids are read from `duqtools.submit.lock`. Active jobs are
+    looked up with a single `squeue` call, jobs that have left the queue
+    with `sacct`. Jobs without a (unique) job id, and jobs that slurm
+    reports as completed, are resolved from their status files, because
+    only the status file tells if the simulation itself succeeded.
+
+    Parameters
+    ----------
+    fallback : Optional[StatusBackend]
+        Backend for jobs that cannot be resolved through slurm.
+    run : Callable[[list[str]], str]
+        Function that runs a command and returns its output,
+        can be replaced for testing.
+    """
+
+    def __init__(
+        self,
+        fallback: Optional[StatusBackend] = None,
+        run: Callable[[list[str]], str] = _run_command,
+    ):
+        self.fallback = fallback or FileStatusBackend()
+        self.run = run
+
+    @staticmethod
+    def is_available() -> bool:
+        """Return True if the slurm commands are available."""
+        return shutil.which("squeue") is not None
+
+    @staticmethod
+    def get_job_id(job: Job) -> Optional[str]:
+        """Read slurm job id from lockfile."""
+        try:
+            content = job.lockfile.read_bytes()
+        except FileNotFoundError:
+            return None
+
+        match = SLURM_JOB_ID.search(content)
+        return match.group(1).decode() if match else None
+
+    def _squeue(self) -> dict[str, str]:
+        out = self.run(["squeue", "-h", "-u", getpass.getuser(), "-o", "%i %T"])
+        return dict(line.split()[:2] for line in out.splitlines() if line.strip())
+
+    def _sacct(self, job_ids: Sequence[str]) -> dict[str, str]:
+        states = {}
+
+        for i in range(0, len(job_ids), SACCT_CHUNK_SIZE):
+            chunk = ",".join(job_ids[i : i + SACCT_CHUNK_SIZE])
+            out = self.run(
+                ["sacct", "-n", "-X", "-P", "-o", "JobID,State", "-j", chunk]
+            )
+            for line in out.splitlines():
+                if not line.strip():
+                    continue
+                job_id, state = line.split("|")[:2]
+                # i.e. `CANCELLED by 1234`
+                states[job_id] = state.split()[0]
+
+        return states
+
+    def query(self, jobs: Sequence[Job]) -> list[JobStatus]:
+        job_ids = [self.get_job_id(job) for job in jobs]
+
+        # Array jobs share the id of the array, these cannot be resolved
+        counts: dict[str, int] = {}
+        for job_id in job_ids:
+            if job_id:
+                counts[job_id] = counts.get(job_id, 0) + 1
+
+        unique_ids = [job_id for job_id, n in counts.items() if n == 1]
+
+        states: dict[str, str] = {}
+
+        if unique_ids:
+            try:
+                states = self._squeue()
+                finished = [job_id for job_id in unique_ids if job_id not in states]
+                if finished:
+                    states.update(self._sacct(finished))
+            except (OSError, sp.CalledProcessError) as err:
+                logger.debug("Slurm query failed, reading status files: %s", err)
+
+        statuses: list[Optional[JobStatus]] = []
+
+        for job_id in job_ids:
+            state = states.get(job_id) if job_id and counts[job_id] == 1 else None
+            statuses.append(SLURM_STATES.get(state) if state else None)
+
+        unresolved = [i for i, status in enumerate(statuses) if status is None]
+        logger.debug("Resolved %d jobs via slurm", len(jobs) - len(unresolved))
+
+        for i, status in zip(
+            unresolved, self.fallback.query([jobs[i] for i in unresolved])
+        ):
+            statuses[i] = status
+
+        return statuses  # type: ignore
+
+
+def get_status_backend(
+    name: str = "auto", index_file: Optional[Path] = None
+) -> StatusBackend:
+    """Get status backend.
+
+    Parameters
+    ----------
+    name : str
+        One of `auto`, `slurm`, or `files`. With `auto`, slurm is used
+        if `squeue` is available.
+    index_file : Optional[Path]
+        File to persist the status file cache to.
+
+    Returns
+    -------
+    StatusBackend
+    """
+    if name == "auto":
+        name = "slurm" if SlurmStatusBackend.is_available() else "files"
+
+    files_backend = FileStatusBackend(index_file=index_file)
+
+    if name == "slurm":
+        return SlurmStatusBackend(fallback=files_backend)
+    elif name == "files":
+        return files_backend
+    else:
+        raise NotImplementedError(f"Status backend {name!r} is not implemented")
@@ -7,6 +7,7 @@ Functions:
 - [recreate][duqtools.api.recreate]
 - [submit][duqtools.api.submit]
 - [duqmap][duqtools.api.duqmap]
+- [load_datasets][duqtools.api.load_datasets]
 - [rebase_on_grid][duqtools.api.rebase_on_grid]
 - [rebase_on_time][duqtools.api.rebase_on_time]
 - [standardize_grid_and_time][duqtools.api.standardize_grid_and_time]
@@ -34,6 +35,7 @@ from .duqmap import duqmap
 from .ids import (
     IDSMapping,
     ImasHandle,
+    load_datasets,
     rebase_all_coords,
     rebase_on_grid,
     rebase_on_time,
@@ -53,6 +55,7 @@ __all__ = [
     "IDSMapping",
     "ImasHandle",
     "Job",
+    "load_datasets",
     "rebase_all_coords",
     "rebase_on_grid",
     "rebase_on_time",
@@ -37,7 +37,7 @@ def remove_run(model: Run):
 
 
 def cleanup(*, cfg: Config, out: bool, force: bool, **kwargs):
-    """Read runs.yaml and clean the current directory.
+    """Read the created runs and clean the current directory.
 
     Parameters
     ----------
@@ -50,14 +50,21 @@ def cleanup(*, cfg: Config, out: bool, force: bool, **kwargs):
     """
     locations = Locations(cfg=cfg)
 
+    runs_files = (
+        (locations.runs_yaml, locations.runs_yaml_old),
+        (locations.runs_registry, locations.runs_registry_old),
+    )
+
     try:
         runs = locations.runs
     except OSError:
         runs = []
     else:
-        if locations.runs_yaml.exists() and not force:
-            if locations.runs_yaml_old.exists():
-                raise OSError("`runs.yaml.old` exists, use --force to overwrite anyway")
+        for runs_file, runs_file_old in runs_files:
+            if runs_file.exists() and runs_file_old.exists() and not force:
+                raise OSError(
+                    f"`{runs_file_old.name}` exists, use --force to overwrite anyway"
+                )
 
     for run in runs:
         data_in = ImasHandle.model_validate(run.data_in, from_attributes=True)
@@ -74,12 +81,14 @@ def cleanup(*, cfg: Config, out: bool, force: bool, **kwargs):
 
         remove_run(run)
 
-    op_queue.add(
-        action=shutil.move,
-        args=(locations.runs_yaml, locations.runs_yaml_old),
-        description="Moving runs.yaml",
-        extra_description=f"{locations.runs_yaml_old}",
-    )
+    for runs_file, runs_file_old in runs_files:
+        if runs_file.exists():
+            op_queue.add(
+                action=shutil.move,
+                args=(runs_file, runs_file_old),
+                description=f"Moving {runs_file.name}",
+                extra_description=f"{runs_file_old}",
+            )
 
     op_queue.add(
         action=remove_files,
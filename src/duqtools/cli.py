@@ -101,6 +101,20 @@ def logfile_option(f):
     )(f)
 
 
+def threads_option(f):
+    """Only for commands that create runs via the operations queue."""
+    return click.option(
+        "--threads",
+        type=int,
+        default=1,
+        help=(
+            "Number of threads used to set up independent runs (default = 1). "
+            "Reading and writing IMAS data is serialized, only the other "
+            "operations run in parallel."
+        ),
+    )(f)
+
+
 logging_options = (logfile_option, debug_option)
 all_options = (
     *logging_options,
@@ -151,6 +165,7 @@ class OptionParser:
                 self.parse_yes,
                 self.parse_dry_run,
                 self.parse_quiet,
+                self.parse_threads,
             ):
                 try:
                     parse(**kwargs)
@@ -205,6 +220,9 @@ class OptionParser:
     def parse_yes(self, *, yes, **kwargs):
         op_queue.yes = yes
 
+    def parse_threads(self, *, threads, **kwargs):
+        op_queue.workers = threads
+
 
 def common_options(*options):
     """common_options.
@@ -312,6 +330,13 @@ def cli_setup(**kwargs):
     is_flag=True,
     help="Create base run (ignores `dimensions`/`sampler`).",
 )
+@click.option(
+    "--workers",
+    type=int,
+    default=1,
+    help="Number of worker processes used to create the runs (default = 1).",
+)
+@threads_option
 @common_options(*all_options)
 def cli_create(**kwargs):
     """Create the UQ run files."""
@@ -323,6 +348,7 @@ def cli_create(**kwargs):
 
 @cli.command("recreate", cls=GroupCmd)
 @click.argument("runs", type=Path, nargs=-1)
+@threads_option
 @common_options(*all_options)
 def cli_recreate(**kwargs):
     """Read `runs.yaml` and re-create the given runs.
@@ -343,6 +369,13 @@ def cli_recreate(**kwargs):
 @click.option(
     "--schedule", is_flag=True, help=("Schedule and submit jobs automatically.")
 )
+@click.option(
+    "--retries",
+    "max_retries",
+    type=int,
+    default=0,
+    help="With --schedule, resubmit failed jobs up to this many times.",
+)
 @click.option(
     "-j",
     "--max_jobs",
@@ -350,6 +383,27 @@ def cli_recreate(**kwargs):
     help="Maximum number of jobs running simultaneously.",
     default=10,
 )
+@click.option(
+    "--workers",
+    type=int,
+    default=4,
+    help="Number of worker threads used to submit jobs (default = 4).",
+)
+@click.option(
+    "--submit-retries",
+    type=int,
+    default=3,
+    help=(
+        "Retry a submission up to this many times when the submit command "
+        "fails with a transient error, i.e. a timeout (default = 3)."
+    ),
+)
+@click.option(
+    "--rate",
+    type=float,
+    default=5.0,
+    help="Maximum number of submissions per second (default = 5).",
+)
 @click.option(
     "--max_array_size",
     type=int,
@@ -364,6 +418,15 @@ def cli_recreate(**kwargs):
         "Create script to submit jobs as array. " "Like --array, but does not submit."
     ),
 )
+@click.option(
+    "--pack",
+    type=int,
+    default=1,
+    help=(
+        "With --array, run this many runs at the same time per array task. "
+        "The tasks and nodes requested per array task are scaled accordingly."
+    ),
+)
 @click.option("--limit", type=int, help=("Limits total number of jobs to submit."))
 @click.option(
     "-r",
@@ -421,6 +484,15 @@ def cli_sync_prominence(**kwargs):
 @cli.command("status", cls=GroupCmd)
 @click.option("--detailed", is_flag=True, help="Detailed info on progress")
 @click.option("--progress", is_flag=True, help="Fancy progress bar")
+@click.option(
+    "--backend",
+    type=click.Choice(["auto", "slurm", "files"]),
+    default="auto",
+    help=(
+        "Query job status from slurm or from the status files (default = auto). "
+        "With slurm, jobs waiting in the queue are counted as submitted."
+    ),
+)
 @common_options(*all_options)
 def cli_status(**kwargs):
     """Print the status of the UQ runs."""
@@ -442,6 +514,14 @@ def cli_status(**kwargs):
     multiple=True,
 )
 @click.option("-e", "--errorbars", is_flag=True, help="Plot the errorbars (if present)")
+@click.option(
+    "--lazy",
+    is_flag=True,
+    help=(
+        "Load the data lazily, one chunk per run (requires dask). "
+        "Every run is only read when it is plotted."
+    ),
+)
 @datafile_option
 @common_options(*logging_options)
 def cli_plot(**kwargs):
@@ -455,6 +535,7 @@ def cli_plot(**kwargs):
     - `duqtools plot -v zeff -h db/91234/5 -h db/91234/6 -h db/91234/7`
     - `duqtools plot -v zeff -h db/91234/5 -i data.csv`
     - `duqtools plot -v zeff -h db/91234/5 -o json`
+    - `duqtools plot -v zeff -i data.csv --lazy`
     """
     from .plot import plot
 
@@ -542,6 +623,12 @@ def cli_dash(**kwargs):
 )
 @datafile_option
 @click.option("--force", is_flag=True, help="Overwrite existing output dataset.")
+@click.option(
+    "--workers",
+    type=int,
+    default=1,
+    help="Number of worker processes used to read the data (default = 1).",
+)
 @common_options(*all_options)
 def cli_merge(**kwargs):
     """Merge data sets with error propagation.
@@ -596,6 +683,41 @@ def cli_list_variables(config, **kwargs):
     list_variables(cfg=cfg, **kwargs)
 
 
+@cli.command("cache")
+@click.option("--clear", is_flag=True, help="Remove all entries from the cache.")
+def cli_cache(clear, **kwargs):
+    """Inspect or clear the on-disk data cache.
+
+    The cache is enabled by setting `DUQTOOLS_CACHE=1`.
+    """
+    from .ids._cache import VariableCache, cache_enabled
+
+    store = VariableCache.from_environment()
+
+    if clear:
+        n = store.clear()
+        click.echo(f"Removed {n} entries from {store.directory}")
+        return
+
+    entries = store.entries()
+    size = sum(entry["size"] for entry in entries)
+
+    click.echo(f"Cache directory: {store.directory}")
+    click.echo(f"Enabled: {cache_enabled()}")
+    click.echo(
+        f"Size: {size / 1024**2:.1f} / {store.max_size / 1024**2:.0f} MB "
+        f"({len(entries)} entries)"
+    )
+
+    for entry in reversed(entries):
+        last_used = datetime.fromtimestamp(entry["last_used"])
+        variables = ", ".join(entry["variables"])
+        click.echo(
+            f"    - {entry['handle']} ({entry['ids']}): {variables} "
+            f"[{entry['size'] / 1024:.0f} kB, {last_used:%Y-%m-%d %H:%M}]"
+        )
+
+
 @cli.command("version")
 def cli_version(**kwargs):
     """Print the version and exit."""
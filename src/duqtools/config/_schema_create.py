@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Optional, Union
+from typing import Literal, Optional, Union
 
 from pydantic import Field
 
@@ -103,6 +103,19 @@ class CreateConfigModel(BaseModel):
         ),
     )
 
+    run_registry: Literal["yaml", "compact"] = Field(
+        "yaml",
+        description=f(
+            """
+        How to store the created runs. With `yaml` (default), the runs and their
+        operations are written to `runs.yaml`. With `compact`, the operations
+        of every dimension are stored once in `runs_registry.json`, and for every
+        run only the index of the sampled value in each dimension. This is much
+        faster to read and write for large designs.
+        """
+        ),
+    )
+
     data: Optional[DataLocation] = Field(
         None,
         description=f(
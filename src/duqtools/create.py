@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import copy
 import logging
+import multiprocessing
 import shutil
+import threading
 import warnings
+from collections import defaultdict, deque
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Any, Sequence
+from typing import Any, Iterator, Optional, Sequence
 
 import pandas as pd
 from pydantic_yaml import to_yaml_file
@@ -12,21 +19,135 @@ from pydantic_yaml import to_yaml_file
 from .apply_model import apply_model
 from .cleanup import remove_run
 from .config import Config
-from .ids import ImasHandle
-from .matrix_samplers import get_matrix_sampler
-from .models import Job, Locations, Run, Runs
+from .ids import IDSMapping, ImasHandle
+from .ids._apply_model import apply_ids_operations
+from .matrix_samplers import Design, get_matrix_sampler
+from .models import Job, Locations, Run, RunRegistry, Runs
 from .operations import add_to_op_queue, op_queue
+from .schema import IDSOperation
 from .systems import get_system
 
 logger = logging.getLogger(__name__)
 
 RUN_PREFIX = "run_"
 
+# Runs may be created in multiple threads, see `Operations.workers`
+_source_ids_lock = threading.Lock()
+
 
 class CreateError(Exception):
     ...
 
 
+def _flatten(operations: Sequence[Any]) -> list[Any]:
+    """Flatten (coupled) operations into a single list."""
+    flat = []
+    for model in operations:
+        if isinstance(model, (list, tuple)):
+            flat.extend(_flatten(model))
+        else:
+            flat.append(model)
+    return flat
+
+
+class SampledOperations(Mapping):
+    """Operations for every run, keyed by run name.
+
+    The operations for a run are only generated when they are accessed,
+    so that large designs are not materialized.
+
+    Parameters
+    ----------
+    base_ops : list[Any]
+        Operations applied to every run.
+    design : Design
+        Sampled operations.
+    """
+
+    def __init__(self, base_ops: list[Any], design: Design):
+        self.base_ops = base_ops
+        self.design = design
+
+    @staticmethod
+    def name(i: int) -> str:
+        return f"{RUN_PREFIX}{i:04d}"
+
+    def __len__(self) -> int:
+        return len(self.design)
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.name(i) for i in range(len(self)))
+
+    def __getitem__(self, name: str) -> list[Any]:
+        try:
+            i = int(name[len(RUN_PREFIX) :])
+        except (TypeError, ValueError):
+            raise KeyError(name) from None
+
+        if not (0 <= i < len(self) and name == self.name(i)):
+            raise KeyError(name)
+
+        return [*self.base_ops, *self.design[i]]
+
+    def items(self):
+        # Avoid decoding the names again
+        for i, ops_list in enumerate(self.design):
+            yield self.name(i), [*self.base_ops, *ops_list]
+
+
+class RunModels(Sequence):
+    """Run models for the operations in `ops_dict`, created on access.
+
+    Iterating creates the models one at a time, so that the models for
+    a large design do not all have to be in memory at the same time.
+
+    Parameters
+    ----------
+    create_mgr : CreateManager
+        Creates the models.
+    ops_dict : Mapping[str, list[Any]]
+        Operations for every run, keyed by run name.
+    absolute_dirpath : bool
+        Passed on to `CreateManager.make_run_model`.
+    """
+
+    def __init__(
+        self,
+        create_mgr: CreateManager,
+        ops_dict: Mapping[str, list[Any]],
+        *,
+        absolute_dirpath: bool,
+    ):
+        self.create_mgr = create_mgr
+        self.ops_dict = ops_dict
+        self.absolute_dirpath = absolute_dirpath
+
+    def __len__(self) -> int:
+        return len(self.ops_dict)
+
+    def __iter__(self) -> Iterator[Run]:
+        for i, (name, operations) in enumerate(self.ops_dict.items()):
+            yield self.create_mgr.make_run_model(
+                i, name, operations, absolute_dirpath=self.absolute_dirpath
+            )
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("run index out of range")
+
+        name = next(islice(self.ops_dict, i, None))
+
+        return self.create_mgr.make_run_model(
+            i, name, self.ops_dict[name], absolute_dirpath=self.absolute_dirpath
+        )
+
+
 class CreateManager:
     """Docstring for CreateManager."""
 
@@ -42,11 +163,19 @@ class CreateManager:
         self.system = get_system(cfg=cfg)
         self.runs_dir = self.system.get_runs_dir()
         self.source = self._get_source_handle()
+        self._source_ids: dict[str, IDSMapping] = {}
 
         locations = Locations(cfg=cfg)
         self.runs_yaml = locations.runs_yaml
+        self.runs_registry = locations.runs_registry
         self.data_csv = locations.data_csv
 
+    def __getstate__(self):
+        # IDS data are not sent to worker processes
+        state = self.__dict__.copy()
+        state["_source_ids"] = {}
+        return state
+
     def _get_source_handle(self) -> ImasHandle:
         template_data = self.options.template_data
 
@@ -66,8 +195,11 @@ class CreateManager:
         base_ops = [op.convert() for op in self.options.operations]
         return base_ops
 
-    def generate_ops_dict(self, *, base_only: bool = False) -> dict[str, list[Any]]:
-        """Generate set of operations for a run."""
+    def generate_ops_dict(self, *, base_only: bool = False) -> Mapping[str, list[Any]]:
+        """Generate set of operations for a run.
+
+        The operations for the sampled runs are generated on access.
+        """
         base_ops = self.get_base_ops()
 
         if base_only:
@@ -76,58 +208,61 @@ class CreateManager:
         matrix = tuple(model.expand() for model in self.options.dimensions)
         matrix_sampler = get_matrix_sampler(self.options.sampler.method)
 
-        sampled_ops_lists = matrix_sampler(*matrix, **dict(self.options.sampler))
-
-        ops_dict = dict()
-        for i, ops_list in enumerate(sampled_ops_lists):
-            name = f"{RUN_PREFIX}{i:04d}"
-            ops_dict[name] = [*base_ops, *ops_list]
+        design = matrix_sampler(*matrix, **dict(self.options.sampler), lazy=True)
 
-        return ops_dict
-
-    def make_run_models(
-        self, *, ops_dict: dict[str, list[Any]], absolute_dirpath: bool
-    ) -> list[Run]:
-        """Take list of operations and create run models."""
-        run_models = []
-
-        for i, (name, operations) in enumerate(ops_dict.items()):
-            dirname = self.runs_dir / name
-
-            data_in = self.system.get_data_in_handle(
-                dirname=dirname,
-                seq_number=i,
-                source=self.source,
-                options=self.options.data,
+        if not isinstance(design, Design):
+            raise TypeError(
+                f"Sampler {self.options.sampler.method!r} did not return a design."
             )
 
-            data_out = self.system.get_data_out_handle(
-                dirname=dirname,
-                seq_number=i,
-                source=self.source,
-                options=self.options.data,
-            )
+        return SampledOperations(base_ops, design)
 
-            model = Run(
-                dirname=dirname,
-                shortname=name,
-                data_in=data_in,
-                data_out=data_out,
-                operations=operations,
-            )
+    def make_run_models(
+        self, *, ops_dict: Mapping[str, list[Any]], absolute_dirpath: bool
+    ) -> RunModels:
+        """Take list of operations and create run models.
+
+        The models are created when they are accessed, see `RunModels`.
+        """
+        return RunModels(self, ops_dict, absolute_dirpath=absolute_dirpath)
+
+    def make_run_model(
+        self, i: int, name: str, operations: list[Any], *, absolute_dirpath: bool
+    ) -> Run:
+        """Create the model for run number `i` from its operations."""
+        dirname = self.runs_dir / name
+
+        data_in = self.system.get_data_in_handle(
+            dirname=dirname,
+            seq_number=i,
+            source=self.source,
+            options=self.options.data,
+        )
 
-            run_models.append(model)
+        data_out = self.system.get_data_out_handle(
+            dirname=dirname,
+            seq_number=i,
+            source=self.source,
+            options=self.options.data,
+        )
 
-        return run_models
+        return Run(
+            dirname=dirname,
+            shortname=name,
+            data_in=data_in,
+            data_out=data_out,
+            operations=operations,
+        )
 
     def runs_yaml_exists(self) -> bool:
-        """Check if runs.yaml exists."""
-        if self.runs_yaml.exists():
-            op_queue.add_no_op(
-                description="Not creating runs.yaml",
-                extra_description=f"{self.runs_yaml} exists",
-            )
-            return True
+        """Check if runs.yaml or the run registry exists."""
+        for runs_file in (self.runs_yaml, self.runs_registry):
+            if runs_file.exists():
+                op_queue.add_no_op(
+                    description=f"Not creating {runs_file.name}",
+                    extra_description=f"{runs_file} exists",
+                )
+                return True
         return False
 
     def data_locations_exist(self, models: Sequence[Run]) -> bool:
@@ -167,15 +302,60 @@ class CreateManager:
             extra_description="Some targets already exist, " "use --force to override",
         )
 
+    def get_source_ids(self, ids: str) -> IDSMapping:
+        """Return an in-memory copy of the IDS from the source data.
+
+        The source IDS is read only once, subsequent calls return
+        a deep copy of the cached data.
+        """
+        with _source_ids_lock:
+            if ids not in self._source_ids:
+                self._source_ids[ids] = self.source.get(ids, lazy=True)
+
+            source_ids = self._source_ids[ids]
+
+        return copy.deepcopy(source_ids)
+
     @add_to_op_queue("Setting inital condition of", "{data_in}", quiet=True)
     def apply_operations(
         self, data_in: ImasHandle, run_dir: Path, operations: list[Any]
     ):
-        for model in operations:
-            apply_model(model, run_dir=run_dir, ids_mapping=data_in, system=self.system)
+        """Apply operations to the run.
+
+        IDS operations are grouped per IDS and applied to an in-memory
+        copy of the source data, so that every modified IDS is written
+        to `data_in` only once.
+
+        Other operations (i.e. on the system settings in `run_dir`) are
+        applied first, in order. The IDS operations are applied after them,
+        keeping the order of the operations on each IDS. The two kinds of
+        operations act on different data, so they do not depend on each other.
+        """
+        ids_operations = defaultdict(list)
+
+        for model in _flatten(operations):
+            if isinstance(model, IDSOperation):
+                ids_operations[model.variable.ids].append(model)
+            else:
+                apply_model(
+                    model, run_dir=run_dir, ids_mapping=data_in, system=self.system
+                )
+
+        for ids, models in ids_operations.items():
+            apply_ids_operations(
+                models, ids_mapping=self.get_source_ids(ids), target=data_in
+            )
+
+    def _remove_runs_file(self, runs_file: Path):
+        """Remove runs file written in the other format by an earlier create,
+        so that it does not shadow the new one."""
+        runs_file.unlink(missing_ok=True)
+        (self.runs_dir / runs_file.name).unlink(missing_ok=True)
 
     @add_to_op_queue("Writing runs", "{self.runs_yaml}", quiet=True)
     def write_runs_file(self, runs: Sequence[Run]) -> None:
+        self._remove_runs_file(self.runs_registry)
+
         runs = Runs.model_validate(runs, from_attributes=True)
 
         with warnings.catch_warnings():
@@ -186,6 +366,34 @@ class CreateManager:
             if self._is_runs_dir_different_from_config_dir():
                 to_yaml_file(self.runs_dir / "runs.yaml", runs)
 
+    @add_to_op_queue("Writing run registry", "{self.runs_registry}", quiet=True)
+    def write_runs_registry(
+        self, runs: Sequence[Run], ops_dict: Mapping[str, list[Any]]
+    ) -> None:
+        """Write runs to the compact run registry.
+
+        For sampled runs, only the index into every dimension is stored.
+        """
+        self._remove_runs_file(self.runs_yaml)
+
+        if isinstance(ops_dict, SampledOperations):
+            base_ops = ops_dict.base_ops
+            dimensions = ops_dict.design.iterables
+            indices = [ops_dict.design.sample_indices(i) for i in range(len(runs))]
+        else:
+            # Without sampling, there is only the base run
+            (base_ops,) = ops_dict.values()
+            dimensions = ()
+            indices = [() for _ in runs]
+
+        registry = RunRegistry.from_runs(
+            runs, base_operations=base_ops, dimensions=dimensions, indices=indices
+        )
+        registry.write(self.runs_registry)
+
+        if self._is_runs_dir_different_from_config_dir():
+            registry.write(self.runs_dir / self.runs_registry.name)
+
     @add_to_op_queue("Writing csv", quiet=True)
     def write_runs_csv(self, runs: Sequence[Run]):
         fname = self.data_csv
@@ -253,6 +461,118 @@ class CreateManager:
         else:
             raise Exception("data not present in model, this should not happen")
 
+    def list_run(self, model: Run, *, force: bool = False):
+        """Queue the operations for a run without their actions.
+
+        Used when the runs are created in worker processes, so that what
+        happens to every run is still shown in the listing before it is
+        confirmed. Does nothing if the queue is not enabled.
+        """
+        if not op_queue.enabled:
+            return
+
+        n_queued = len(op_queue)
+
+        with op_queue.group(str(model.dirname)):
+            self.create_run(model, force=force)
+
+        ops = [op_queue.pop() for _ in range(len(op_queue) - n_queued)]
+
+        for op in reversed(ops):
+            op_queue.add(
+                action=None,
+                description=op.description,
+                extra_description=op.extra_description,
+                quiet=op.quiet,
+                style=op.style,
+            )
+
+    @add_to_op_queue("Creating runs", "{self.runs_dir} ({workers} workers)")
+    def create_runs_parallel(
+        self, runs: Sequence[Run], *, force: bool = False, workers: int = 2
+    ):
+        """Create runs in a pool of `workers` processes.
+
+        A run that fails does not stop the others, the failed runs
+        are reported at the end. The workers are started with the `spawn`
+        method, they only get the state that is passed to them explicitly.
+        """
+        max_in_flight = 2 * workers
+        pending: deque = deque()
+        failed = {}
+
+        def collect():
+            name, future = pending.popleft()
+            error = future.result()
+            if error:
+                logger.error("Failed to create %s: %s", name, error)
+                failed[name] = error
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self, logging.getLogger("duqtools").getEffectiveLevel()),
+        ) as executor:
+            for model in runs:
+                future = executor.submit(_create_run_in_worker, model, force)
+                pending.append((model.shortname, future))
+                if len(pending) >= max_in_flight:
+                    collect()
+
+            while pending:
+                collect()
+
+        logger.info("Created %d of %d runs", len(runs) - len(failed), len(runs))
+
+        if failed:
+            names = " ".join(str(name) for name in failed)
+            logger.warning(
+                "%d runs failed, use `duqtools recreate %s` to retry",
+                len(failed),
+                names,
+            )
+
+
+_worker_create_mgr: Optional[CreateManager] = None
+
+
+def _init_worker(create_mgr: CreateManager, log_level: int):
+    """Store the create manager in the worker process."""
+    global _worker_create_mgr
+    _worker_create_mgr = create_mgr
+
+    logging.getLogger("duqtools").setLevel(log_level)
+
+
+def _create_run_in_worker(model: Run, force: bool) -> Optional[str]:
+    """Create run in a worker process.
+
+    The operations for the run are queued and applied directly in the
+    worker, because the user has already confirmed them in the main process.
+
+    Returns
+    -------
+    Optional[str]
+        Error message if the run could not be created, otherwise None.
+    """
+    assert _worker_create_mgr is not None
+
+    # The queue may hold a copy of the operations from the parent process
+    op_queue.clear()
+    op_queue.enabled = True
+
+    try:
+        _worker_create_mgr.create_run(model, force=force)
+        op_queue._apply_all()
+    except Exception as err:
+        logger.debug("Failed to create %s", model.shortname, exc_info=True)
+        return f"{type(err).__name__}: {err}"
+    finally:
+        op_queue.clear()
+
+    return None
+
 
 def create(
     *,
@@ -260,8 +580,9 @@ def create(
     force: bool = False,
     no_sampling: bool = False,
     absolute_dirpath: bool = False,
+    workers: int = 1,
     **kwargs,
-) -> list[Run]:
+) -> Sequence[Run]:
     """Create input for jetto and IDS data structures.
 
     Parameters
@@ -272,6 +593,8 @@ def create(
         Duqtools config
     no_sampling : bool
         If true, create base run by ignoring `sampler`/`dimensions`.
+    workers : int
+        Number of processes used to create the runs.
 
     **kwargs
         Unused.
@@ -298,10 +621,19 @@ def create(
             create_mgr.warn_no_create_runs()
             return []
 
-    for model in runs:
-        create_mgr.create_run(model, force=force)
-
-    create_mgr.write_runs_file(runs)
+    if workers > 1:
+        for model in runs:
+            create_mgr.list_run(model, force=force)
+        create_mgr.create_runs_parallel(runs, force=force, workers=workers)
+    else:
+        for model in runs:
+            with op_queue.group(str(model.dirname)):
+                create_mgr.create_run(model, force=force)
+
+    if create_mgr.options.run_registry == "compact":
+        create_mgr.write_runs_registry(runs, ops_dict)
+    else:
+        create_mgr.write_runs_file(runs)
     create_mgr.write_runs_csv(runs)
     create_mgr.copy_config()
 
@@ -338,7 +670,7 @@ def recreate(*, cfg: Config, runs: Sequence[Path], **kwargs):
     run_models = []
     for run in runs:
         if run not in run_dict:
-            raise ValueError(f"`{run}` not in `runs.yaml`.")
+            raise ValueError(f"`{run}` not in the created runs.")
 
         model = run_dict[run]
         model.data_in = ImasHandle.model_validate(model.data_in, from_attributes=True)
@@ -353,7 +685,8 @@ def recreate(*, cfg: Config, runs: Sequence[Path], **kwargs):
         run_models.append(model)
 
     for model in run_models:
-        create_mgr.create_run(model)
+        with op_queue.group(str(model.dirname)):
+            create_mgr.create_run(model)
 
     return run_models
 
@@ -50,10 +50,18 @@ with st.sidebar:
         "Show error bars",
         help=("Show standard deviation band around mean y-value."),
     )
+    lazy = st.checkbox(
+        "Load data lazily",
+        help=(
+            "Read the data for every run as a separate chunk when it is "
+            "needed, instead of loading all runs up front (requires dask). "
+            "Runs without data are shown as empty instead of skipped."
+        ),
+    )
 
 for variable in (var_lookup[var_name] for var_name in var_names):
     source, time_var, grid_var, data_var = get_dataset(
-        handles, variable, include_error=show_errorbar
+        handles, variable, include_error=show_errorbar, lazy=lazy
     )
 
     st.header(f"{grid_var} vs. {data_var}")
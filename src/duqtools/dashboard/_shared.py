@@ -2,13 +2,13 @@ from __future__ import annotations
 
 import base64
 import sys
+from functools import partial
 from pathlib import Path
 from typing import Sequence
 
 import streamlit as st
-import xarray as xr
 
-from duqtools.api import ImasHandle, standardize_grid_and_time
+from duqtools.api import ImasHandle, load_datasets, standardize_grid_and_time
 from duqtools.config import var_lookup
 from duqtools.ids._mapping import EmptyVarError
 
@@ -47,54 +47,49 @@ def get_variables(*, ids: str, x_key: str, y_keys: Sequence[str]):
     }
 
 
+def _standardize(ds, reference, *, grid_var: str, time_var: str):
+    """Standardize grid and time of `ds` onto the reference."""
+    _, ds = standardize_grid_and_time(
+        (reference, ds), grid_var=grid_var, time_var=time_var
+    )
+    return ds
+
+
 @st.cache_data
-def _get_dataset(handles, variable, *, include_error: bool = False):
+def _get_dataset(handles, variable, *, include_error: bool = False, lazy: bool = False):
     data_var = variable["name"]
     time_var = variable["dims"][0]
     grid_var = variable["dims"][1]
     variables = [data_var, time_var, grid_var]
 
-    datasets = list()
-
     if include_error:
         variables.append(var_lookup.error_upper(data_var))
 
-    runs = list()
-
-    for name, handle in handles.items():
-        handle = ImasHandle(**handle)
-
-        try:
-            ds = handle.get_variables(variables=variables)
-        except EmptyVarError as e:
-            st.warning(f"Skipping {handle}, {e}.")
-            continue
-
-        runs.append(name)
-
-        datasets.append(ds)
+    handles = {name: ImasHandle(**handle) for name, handle in handles.items()}
 
     grid_var_norm = str(var_lookup.normalize(grid_var))
     time_var_norm = str(var_lookup.normalize(time_var))
 
-    datasets = standardize_grid_and_time(
-        datasets,
-        grid_var=grid_var_norm,
-        time_var=time_var_norm,
+    dataset = load_datasets(
+        handles,
+        variables=variables,
+        rebase=partial(_standardize, grid_var=grid_var_norm, time_var=time_var_norm),
+        lazy=lazy,
+        errors=(EmptyVarError,),
     )
 
-    dataset = xr.concat(datasets, "run")
-    dataset["run"] = runs
+    for name in handles.keys() - set(dataset["run"].values):
+        st.warning(f"Skipping {handles[name]}, no data for {data_var}.")
 
     return dataset, time_var_norm, grid_var_norm, data_var
 
 
-def get_dataset(handles, variable, *, include_error: bool = False):
+def get_dataset(handles, variable, *, include_error: bool = False, lazy: bool = False):
     """Convert to hashable types before calling `_get_dataset`."""
     handles = {name: handle.model_dump() for name, handle in handles.items()}
     variable = variable.model_dump()
 
-    return _get_dataset(handles, variable, include_error=include_error)
+    return _get_dataset(handles, variable, include_error=include_error, lazy=lazy)
 
 
 @st.cache_data
@@ -60,7 +60,7 @@ def duqmap(
     ----------
     function : Callable[[Run | ImasHandle], Any]
         function which is called for each run, specified either by `runs`, or implicitly
-        by any available `runs.yaml`
+        by any available `runs.yaml` or run registry
     runs : Optional[List[Run | Path]]
         A list of runs over which to operate the function
     kwargs :
@@ -4,6 +4,7 @@ import logging
 
 from ._handle import ImasHandle
 from ._imas import imas_mocked
+from ._load import load_datasets
 from ._mapping import IDSMapping
 from ._merge import merge_data
 from ._rebase import (
@@ -21,6 +22,7 @@ logger = logging.getLogger(__name__)
 __all__ = [
     "IDSMapping",
     "ImasHandle",
+    "load_datasets",
     "merge_data",
     "rebase_on_grid",
     "rebase_on_time",
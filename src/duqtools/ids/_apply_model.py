@@ -2,11 +2,12 @@ from __future__ import annotations
 
 import logging
 from functools import partial
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Sequence, Union
 
 import numpy as np
 
 from .._logging_utils import duqlog_screen
+from ._copy import set_provenance_info
 from ._handle import ImasHandle
 
 if TYPE_CHECKING:
@@ -40,7 +41,7 @@ def _apply_ids(
     target_in = None
     if isinstance(ids_mapping, ImasHandle):
         target_in = ids_mapping
-        ids_mapping = ids_mapping.get(model.variable.ids)
+        ids_mapping = ids_mapping.get(model.variable.ids, lazy=True)
 
     if isinstance(model.variable, str):
         raise TypeError("`model.variable` must have a `path` attribute.")
@@ -99,3 +100,39 @@ def _apply_ids(
     if target_in:
         logger.info("Writing data entry: %s", target_in)
         ids_mapping.sync(target_in)
+
+
+def apply_ids_operations(
+    models: Sequence[IDSOperation], *, ids_mapping: IDSMapping, target: ImasHandle
+) -> None:
+    """Apply IDS operations in memory and write the result to the target.
+
+    All operations must act on the same IDS. The IDS is written to the
+    target once, after all operations have been applied. Provenance
+    information is always added to `core_profiles` of the target.
+
+    Parameters
+    ----------
+    models : Sequence[IDSOperation]
+        Operations to apply.
+    ids_mapping : IDSMapping
+        In-memory data to apply operations to, modified in-place.
+    target : ImasHandle
+        Data entry to write the IDS to.
+    """
+    idss = {model.variable.ids for model in models}
+
+    if len(idss) > 1:
+        raise ValueError(f"All operations must act on the same IDS, got {idss}")
+
+    for model in models:
+        _apply_ids(model, ids_mapping=ids_mapping)
+
+    # Provenance info lives in core_profiles, set it in memory to avoid
+    # reading and writing the IDS a second time
+    is_core_profiles = idss == {"core_profiles"}
+    if is_core_profiles:
+        set_provenance_info(ids_mapping._ids)
+
+    logger.info("Writing data entry: %s", target)
+    ids_mapping.sync(target, provenance=not is_core_profiles)
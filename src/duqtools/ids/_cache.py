@@ -0,0 +1,264 @@
+"""Persistent on-disk cache for data extracted from IMAS entries.
+
+The cache is opt-in, set `$DUQTOOLS_CACHE=1` to enable it. Each entry holds
+one dataset as returned by `ImasHandle.get_variables`, keyed by the handle,
+the ids, and the requested variables. An entry is invalidated when the
+modification time or size of any of the data files of the handle changes.
+Handles without local data files are never cached.
+
+The cache is stored in `$DUQTOOLS_CACHE_DIR`, which defaults to
+`$XDG_CACHE_HOME/duqtools` (`~/.cache/duqtools`). The least recently used
+entries are evicted when the total size exceeds `$DUQTOOLS_CACHE_SIZE`
+(in MB, default: 1024).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional, Sequence
+
+if TYPE_CHECKING:
+    import xarray as xr
+
+    from ..schema import IDSVariableModel
+    from ._handle import ImasHandle
+
+logger = logging.getLogger(__name__)
+
+CACHE_ENV = "DUQTOOLS_CACHE"
+CACHE_DIR_ENV = "DUQTOOLS_CACHE_DIR"
+CACHE_SIZE_ENV = "DUQTOOLS_CACHE_SIZE"
+USER_CACHE_HOME = Path.home() / ".cache"
+DUQTOOLS_DIR = "duqtools"
+DEFAULT_CACHE_SIZE = 1024  # MB
+
+DATA_SUFFIX = ".nc"
+META_SUFFIX = ".json"
+
+
+def cache_enabled() -> bool:
+    """Return True if the cache is enabled through `$DUQTOOLS_CACHE`."""
+    return os.environ.get(CACHE_ENV, "").lower() in ("1", "true", "yes", "on")
+
+
+def _file_stamp(handle: ImasHandle) -> Optional[list[tuple[str, int, int]]]:
+    """Return path, modification time and size for the data files of the
+    handle.
+
+    Returns None if none of the data files exist, i.e. the data are not
+    stored locally, so that changes to the data cannot be detected.
+    """
+    stamp = []
+
+    for path in handle.paths():
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        stamp.append((str(path), stat.st_mtime_ns, stat.st_size))
+
+    return stamp or None
+
+
+class VariableCache:
+    """Cache for datasets extracted from IMAS entries.
+
+    Parameters
+    ----------
+    directory : Path
+        Directory where the cache entries are stored.
+    max_size : int
+        Maximum size of the cache in bytes.
+    """
+
+    def __init__(self, directory: Path, max_size: int):
+        self.directory = Path(directory)
+        self.max_size = max_size
+
+    @classmethod
+    def from_environment(cls) -> VariableCache:
+        """Set up cache from environment variables."""
+        cache_home = os.environ.get("XDG_CACHE_HOME", USER_CACHE_HOME)
+        directory = os.environ.get(CACHE_DIR_ENV, Path(cache_home) / DUQTOOLS_DIR)
+
+        max_size = int(os.environ.get(CACHE_SIZE_ENV, DEFAULT_CACHE_SIZE))
+
+        return cls(directory=Path(directory), max_size=max_size * 1024**2)
+
+    @staticmethod
+    def make_key(
+        handle: ImasHandle,
+        ids: str,
+        variables: Sequence[IDSVariableModel],
+        **kwargs,
+    ) -> str:
+        """Generate cache key for the handle, ids, and set of variables.
+
+        Keyword arguments must be json-serializable and are included in
+        the key.
+        """
+        identifier = {
+            "handle": handle.to_string(),
+            "ids": ids,
+            "variables": sorted(
+                (var.name, var.path, tuple(var.dims)) for var in variables
+            ),
+            "kwargs": kwargs,
+        }
+        string = json.dumps(identifier, sort_keys=True, default=str)
+        return hashlib.sha256(string.encode()).hexdigest()
+
+    def _data_path(self, key: str) -> Path:
+        return self.directory / f"{key}{DATA_SUFFIX}"
+
+    def _meta_path(self, key: str) -> Path:
+        return self.directory / f"{key}{META_SUFFIX}"
+
+    def get(self, key: str, handle: ImasHandle) -> Optional[xr.Dataset]:
+        """Return cached dataset, or None if there is no valid entry.
+
+        Entries for which the data files of the handle have changed
+        are removed.
+        """
+        import xarray as xr
+
+        meta_path = self._meta_path(key)
+        data_path = self._data_path(key)
+
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        stamp = [tuple(item) for item in meta.get("stamp", ())]
+        current = _file_stamp(handle)
+
+        if current is None or stamp != current:
+            logger.debug("Cache entry for %s is outdated", handle)
+            self.remove(key)
+            return None
+
+        try:
+            ds = xr.load_dataset(data_path, engine="scipy")
+        except (FileNotFoundError, ValueError, OSError):
+            self.remove(key)
+            return None
+
+        # Use the modification time of the metadata to track usage
+        os.utime(meta_path)
+
+        logger.debug("Loaded %s from cache", handle)
+
+        return ds
+
+    def put(self, key: str, handle: ImasHandle, ds: xr.Dataset, **meta: Any):
+        """Store dataset in the cache and evict old entries if necessary.
+
+        Nothing is stored if the data files of the handle cannot be found.
+        """
+        stamp = _file_stamp(handle)
+
+        if stamp is None:
+            logger.debug("Not caching %s, no local data files", handle)
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        data_path = self._data_path(key)
+        tmp_path = data_path.with_suffix(".tmp")
+
+        try:
+            ds.to_netcdf(tmp_path, engine="scipy")
+        except (ValueError, TypeError, OSError) as err:
+            logger.warning("Could not cache data for %s: %s", handle, err)
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        os.replace(tmp_path, data_path)
+
+        meta = {
+            "handle": handle.to_string(),
+            "stamp": stamp,
+            "created": time.time(),
+            **meta,
+        }
+
+        with open(self._meta_path(key), "w") as f:
+            json.dump(meta, f)
+
+        self.evict()
+
+    def remove(self, key: str):
+        """Remove entry from the cache."""
+        for path in (self._meta_path(key), self._data_path(key)):
+            path.unlink(missing_ok=True)
+
+    def entries(self) -> list[dict[str, Any]]:
+        """Return list of cache entries, least recently used first."""
+        entries = []
+
+        for meta_path in self.directory.glob(f"*{META_SUFFIX}"):
+            key = meta_path.stem
+            data_path = self._data_path(key)
+
+            try:
+                with open(meta_path) as f:
+                    meta = json.load(f)
+                last_used = meta_path.stat().st_mtime
+                size = data_path.stat().st_size
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+
+            entries.append(
+                {
+                    "key": key,
+                    "handle": meta.get("handle"),
+                    "ids": meta.get("ids"),
+                    "variables": meta.get("variables", []),
+                    "size": size,
+                    "last_used": last_used,
+                }
+            )
+
+        return sorted(entries, key=lambda entry: entry["last_used"])
+
+    @property
+    def size(self) -> int:
+        """Total size of the cache in bytes."""
+        return sum(entry["size"] for entry in self.entries())
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in
+        `max_size`."""
+        entries = self.entries()
+        total = sum(entry["size"] for entry in entries)
+
+        for entry in entries:
+            if total <= self.max_size:
+                break
+            logger.debug("Evicting %s from cache", entry["handle"])
+            self.remove(entry["key"])
+            total -= entry["size"]
+
+    def clear(self) -> int:
+        """Remove all entries from the cache.
+
+        Returns
+        -------
+        int
+            Number of entries removed.
+        """
+        entries = self.entries()
+
+        for entry in entries:
+            self.remove(entry["key"])
+
+        for tmp_path in self.directory.glob("*.tmp"):
+            tmp_path.unlink(missing_ok=True)
+
+        return len(entries)
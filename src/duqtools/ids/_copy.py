@@ -1,20 +1,28 @@
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
-import shutil
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable, Optional
 
 from packaging import version
 
 from .._logging_utils import LoggingContext
 from ..operations import add_to_op_queue
-from ._imas import Parser, imas
+from ._imas import IMAS_LOCK, Parser, imas, imasdef
 
 if TYPE_CHECKING:
     from .ids import ImasHandle
 
+logger = logging.getLogger(__name__)
+
+COPY_STRATEGY_ENV = "DUQTOOLS_COPY_STRATEGY"
+CHUNK_SIZE = 2**20
+
+# Linux ioctl to clone a file (copy-on-write), see `man ioctl_ficlone`
+FICLONE = 0x40049409
+
 
 def get_imas_ual_version():
     """Get imas/ual versions.
@@ -34,6 +42,38 @@ def get_imas_ual_version():
     return imas_version, ual_version
 
 
+def set_provenance_info(entry):
+    """Set provenance information on an IDS in memory.
+
+    Parameters
+    ----------
+    entry
+        IDS to add provenance information to.
+    """
+    import git
+    import pkg_resources  # type: ignore
+
+    # Set the name
+    entry.code.name = "duqtools"
+
+    # Get the commit if we are in a repository
+    try:
+        entry.code.commit = git.Repo(
+            Path(__file__).parent, search_parent_directories=True
+        ).head.object.hexsha
+    except Exception:
+        entry.code.commit = "unknown"
+
+    # Set the version if available
+    try:
+        entry.code.version = pkg_resources.get_distribution("duqtools").version
+    except Exception:
+        entry.code.version = "unknown"
+
+    # The repository, always set to duqtools
+    entry.code.repository = "https://github.com/duqtools/duqtools/"
+
+
 def add_provenance_info(handle: ImasHandle, ids: str = "core_profiles"):
     """Add provenance information to handle.
 
@@ -44,40 +84,37 @@ def add_provenance_info(handle: ImasHandle, ids: str = "core_profiles"):
     ids : str, optional
         Which IDS to add provenance to.
     """
-
-    import git
-    import pkg_resources  # type: ignore
-
     with handle.open() as data_entry_target:
         entry = data_entry_target.get(ids)
+        set_provenance_info(entry)
+        entry.put(db_entry=data_entry_target)
 
-        # Set the name
-        entry.code.name = "duqtools"
 
-        # Get the commit if we are in a repository
-        try:
-            entry.code.commit = git.Repo(
-                Path(__file__).parent, search_parent_directories=True
-            ).head.object.hexsha
-        except Exception:
-            entry.code.commit = "unknown"
+def _is_empty(homogeneous_time) -> bool:
+    """Return True if `ids_properties.homogeneous_time` marks an empty IDS."""
+    return homogeneous_time == imasdef.EMPTY_INT
 
-        # Set the version if available
-        try:
-            entry.code.version = pkg_resources.get_distribution("duqtools").version
-        except Exception:
-            entry.code.version = "unknown"
 
-        # The repository, always set to duqtools
-        entry.code.repository = "https://github.com/duqtools/duqtools/"
+def _is_empty_occurrence(ids, occurrence: int) -> bool:
+    """Check if the IDS occurrence is empty without reading all its data.
 
-        entry.put(db_entry=data_entry_target)
+    Only `ids_properties/homogeneous_time` is read, which is set for
+    every IDS that holds data. Returns False if the occupancy cannot
+    be determined.
+    """
+    try:
+        homogeneous_time = ids.partialGet("ids_properties/homogeneous_time", occurrence)
+    except Exception:
+        return False
+
+    return _is_empty(homogeneous_time)
 
 
 def copy_ids_entry_complex(source: ImasHandle, target: ImasHandle):
     """Old way of copying by reading and writing via IMAS.
 
-    Copies the ids entry to a new location.
+    Copies the ids entry to a new location. Empty IDS occurrences
+    are skipped.
 
     Parameters
     ----------
@@ -91,43 +128,202 @@ def copy_ids_entry_complex(source: ImasHandle, target: ImasHandle):
     KeyError
         If the IDS entry you are trying to copy does not exist.
     """
-    imas_version, _ = get_imas_ual_version()
+    with IMAS_LOCK:
+        imas_version, _ = get_imas_ual_version()
+
+        idss_in = imas.ids(source.shot, source.run)  # type: ignore
+        op = idss_in.open_env(source.user, source.db, str(imas_version.major))
+
+        ids_not_found = op[0] < 0
+        if ids_not_found:
+            raise KeyError("The entry you are trying to copy does not exist")
+
+        idss_out = imas.ids(target.shot, target.run)  # type: ignore
+
+        idss_out.create_env(target.user, target.db, str(imas_version.major))
+        idx = idss_out.expIdx
+
+        parser = Parser.load_idsdef()
+
+        n_copied = n_skipped = 0
+
+        # Temporarily hide warnings, because this loop is very spammy
+        with LoggingContext(level=logging.CRITICAL):
+            for ids_info in parser.idss:
+                name = ids_info["name"]
+                maxoccur = int(ids_info["maxoccur"])
+
+                if name in ("ec_launchers", "numerics", "sdn"):
+                    continue
+
+                for i in range(maxoccur + 1):
+                    ids = idss_in.__dict__[name]
+
+                    if _is_empty_occurrence(ids, i):
+                        n_skipped += 1
+                        continue
+
+                    ids.get(i)
 
-    idss_in = imas.ids(source.shot, source.run)  # type: ignore
-    op = idss_in.open_env(source.user, source.db, str(imas_version.major))
+                    if _is_empty(ids.ids_properties.homogeneous_time):
+                        n_skipped += 1
+                        continue
 
-    ids_not_found = op[0] < 0
-    if ids_not_found:
-        raise KeyError("The entry you are trying to copy does not exist")
+                    ids.setExpIdx(idx)  # this line sets the index to the output
+                    ids.put(i)
+                    n_copied += 1
 
-    idss_out = imas.ids(target.shot, target.run)  # type: ignore
+        idss_in.close()
+        idss_out.close()
 
-    idss_out.create_env(target.user, target.db, str(imas_version.major))
-    idx = idss_out.expIdx
+    logger.debug("Copied %d ids occurrences, skipped %d empty", n_copied, n_skipped)
 
-    parser = Parser.load_idsdef()
 
-    # Temporarily hide warnings, because this loop is very spammy
-    with LoggingContext(level=logging.CRITICAL):
-        for ids_info in parser.idss:
-            name = ids_info["name"]
-            maxoccur = int(ids_info["maxoccur"])
+def _checksum(path: Path) -> str:
+    """Return checksum of file."""
+    digest = hashlib.blake2b()
 
-            if name in ("ec_launchers", "numerics", "sdn"):
-                continue
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
 
-            for i in range(maxoccur + 1):
-                ids = idss_in.__dict__[name]
-                ids.get(i)
-                ids.setExpIdx(idx)  # this line sets the index to the output
-                ids.put(i)
+    return digest.hexdigest()
 
-    idss_in.close()
-    idss_out.close()
+
+def _copy_file(src: Path, dst: Path):
+    """Copy file in chunks and verify the checksum of the copy.
+
+    Raises
+    ------
+    OSError
+        If the checksum of the copy does not match the source.
+    """
+    digest = hashlib.blake2b()
+
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        while chunk := fsrc.read(CHUNK_SIZE):
+            digest.update(chunk)
+            fdst.write(chunk)
+
+    if _checksum(dst) != digest.hexdigest():
+        raise OSError(f"Checksum mismatch after copying {src} to {dst}")
+
+
+def _reflink(src: Path, dst: Path):
+    """Clone file using copy-on-write.
+
+    Raises
+    ------
+    OSError
+        If the file system does not support reflinks.
+    """
+    try:
+        import fcntl
+    except ImportError as err:
+        raise OSError("Reflinks are not supported on this platform") from err
+
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+
+
+def copy_ids_entry_bytecopy(source: ImasHandle, target: ImasHandle):
+    """Copy the data files of the ids entry and verify their checksums.
+
+    Parameters
+    ----------
+    source : ImasHandle
+        Source ids entry
+    target : ImasHandle
+        Target ids entry
+
+    Raises
+    ------
+    OSError
+        If the checksum of a copied file does not match the source.
+    """
+    for src, dst in zip(source.paths(), target.paths()):
+        _copy_file(src, dst)
+
+
+def copy_ids_entry_reflink(source: ImasHandle, target: ImasHandle):
+    """Clone the data files of the ids entry using copy-on-write.
+
+    Files on file systems without reflink support (i.e. ext4) are copied
+    using `copy_ids_entry_bytecopy` instead.
+
+    Parameters
+    ----------
+    source : ImasHandle
+        Source ids entry
+    target : ImasHandle
+        Target ids entry
+    """
+    for src, dst in zip(source.paths(), target.paths()):
+        try:
+            _reflink(src, dst)
+        except OSError as err:
+            logger.debug("Cannot reflink %s (%s), copying instead", src, err)
+            _copy_file(src, dst)
+
+
+COPY_STRATEGIES: dict[str, Callable[[ImasHandle, ImasHandle], None]] = {
+    "imas": copy_ids_entry_complex,
+    "bytecopy": copy_ids_entry_bytecopy,
+    "reflink": copy_ids_entry_reflink,
+}
+
+
+def get_copy_strategy(
+    source: ImasHandle, target: ImasHandle, backend=imasdef.MDSPLUS_BACKEND
+) -> str:
+    """Select strategy to copy ids entry.
+
+    The strategy can be set through `$DUQTOOLS_COPY_STRATEGY`. Otherwise,
+    the data files are copied directly if source and target are local
+    MDSplus databases, and via IMAS in all other cases.
+
+    Parameters
+    ----------
+    source : ImasHandle
+        Source ids entry
+    target : ImasHandle
+        Target ids entry
+    backend : optional
+        IMAS backend of the data
+
+    Returns
+    -------
+    str
+        Name of the copy strategy, one of `COPY_STRATEGIES`.
+    """
+    strategy = os.environ.get(COPY_STRATEGY_ENV, "auto")
+
+    # Backwards compatibility
+    if strategy == "auto" and os.environ.get("SIMPLE_IDS_COPY"):
+        strategy = "bytecopy"
+
+    if strategy != "auto":
+        if strategy not in COPY_STRATEGIES:
+            raise ValueError(
+                f"Unknown copy strategy: {strategy!r}, "
+                f"must be one of {tuple(COPY_STRATEGIES)}"
+            )
+        return strategy
+
+    is_file_copy = (
+        backend == imasdef.MDSPLUS_BACKEND
+        and source.is_local_db
+        and target.is_local_db
+        and source.exists()
+    )
+
+    return "reflink" if is_file_copy else "imas"
 
 
 @add_to_op_queue("Copy ids from template to", "{target}", quiet=True)
-def copy_ids_entry(source: ImasHandle, target: ImasHandle):
+def copy_ids_entry(
+    source: ImasHandle, target: ImasHandle, strategy: Optional[str] = None
+):
     """Copies the ids entry to a new location.
 
     Parameters
@@ -136,6 +332,9 @@ def copy_ids_entry(source: ImasHandle, target: ImasHandle):
         Source ids entry
     target : ImasHandle
         Target ids entry
+    strategy : Optional[str]
+        How to copy the data, one of `imas`, `bytecopy` or `reflink`.
+        If None, select the strategy using `get_copy_strategy`.
 
     Raises
     ------
@@ -144,10 +343,11 @@ def copy_ids_entry(source: ImasHandle, target: ImasHandle):
     """
     target.validate()
 
-    if os.environ.get("SIMPLE_IDS_COPY"):
-        for src_file, dst_file in zip(source.paths(), target.paths()):
-            shutil.copyfile(src_file, dst_file)
-    else:
-        copy_ids_entry_complex(source, target)
+    if strategy is None:
+        strategy = get_copy_strategy(source, target)
+
+    logger.debug("Copy %s to %s using strategy %r", source, target, strategy)
+
+    COPY_STRATEGIES[strategy](source, target)
 
     add_provenance_info(handle=target)
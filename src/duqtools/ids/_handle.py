@@ -6,13 +6,14 @@ import re
 from contextlib import contextmanager
 from getpass import getuser
 from pathlib import Path
-from typing import TYPE_CHECKING, List, Sequence
+from typing import TYPE_CHECKING, List, Optional, Sequence
 
 from pydantic import field_validator
 
 from ..operations import add_to_op_queue
+from ._cache import VariableCache, cache_enabled
 from ._copy import copy_ids_entry
-from ._imas import imas, imasdef
+from ._imas import IMAS_LOCK, imas, imasdef
 from ._mapping import IDSMapping
 from ._rebase import squash_placeholders
 from ._schema import ImasBaseModel
@@ -215,26 +216,30 @@ class ImasHandle(ImasBaseModel):
 
         return data
 
-    def get(self, ids: str = "core_profiles") -> IDSMapping:
+    def get(self, ids: str = "core_profiles", lazy: bool = False) -> IDSMapping:
         """Map the data to a dict-like structure.
 
         Parameters
         ----------
         ids : str, optional
             Name of profiles to open
+        lazy : bool, optional
+            If True, resolve the keys in the mapping on demand instead of
+            walking the complete IDS up front.
 
         Returns
         -------
         IDSMapping
         """
         raw_data = self.get_raw_data(ids)
-        return IDSMapping(raw_data)
+        return IDSMapping(raw_data, lazy=lazy)
 
     def get_all_variables(
         self,
         extra_variables: Sequence[IDSVariableModel] = list(),
         squash: bool = True,
         ids: str = "core_profiles",
+        cache: Optional[bool] = None,
         **kwargs,
     ) -> xr.Dataset:
         """Get all variables that duqtools knows of from selected ids from the
@@ -249,6 +254,9 @@ class ImasHandle(ImasBaseModel):
             Extra variables to load in addition to the ones known by duqtools.
         squash : bool
             Squash placeholder variables
+        cache : Optional[bool]
+            Read from and store data in the on-disk cache. If None (default),
+            the cache is used if `$DUQTOOLS_CACHE` is set.
 
         Returns
         -------
@@ -266,12 +274,15 @@ class ImasHandle(ImasBaseModel):
 
         idsvar_lookup = var_lookup.filter_ids(ids)
         variables = list(set(list(extra_variables) + list(idsvar_lookup.keys())))
-        return self.get_variables(variables, squash, empty_var_ok=True, **kwargs)
+        return self.get_variables(
+            variables, squash, cache=cache, empty_var_ok=True, **kwargs
+        )
 
     def get_variables(
         self,
         variables: Sequence[str | IDSVariableModel],
         squash: bool = True,
+        cache: Optional[bool] = None,
         **kwargs,
     ) -> xr.Dataset:
         """Get variables from data set.
@@ -285,6 +296,9 @@ class ImasHandle(ImasBaseModel):
             Variable names of the data to load.
         squash : bool
             Squash placeholder variables
+        cache : Optional[bool]
+            Read from and store data in the on-disk cache. If None (default),
+            the cache is used if `$DUQTOOLS_CACHE` is set.
 
         Returns
         -------
@@ -309,13 +323,32 @@ class ImasHandle(ImasBaseModel):
 
         ids = var_models[0].ids
 
-        data_map = self.get(ids)
+        if cache is None:
+            cache = cache_enabled()
+
+        if cache:
+            store = VariableCache.from_environment()
+            key = store.make_key(self, ids, var_models, squash=squash, **kwargs)
+            ds = store.get(key, self)
+            if ds is not None:
+                return ds
+
+        data_map = self.get(ids, lazy=True)
 
         ds = data_map.to_xarray(variables=var_models, **kwargs)
 
         if squash:
             ds = squash_placeholders(ds)
 
+        if cache:
+            store.put(
+                key,
+                self,
+                ds,
+                ids=ids,
+                variables=[var.name for var in var_models],
+            )
+
         return ds
 
     def entry(self, backend=imasdef.MDSPLUS_BACKEND):
@@ -337,6 +370,9 @@ class ImasHandle(ImasBaseModel):
     def open(self, backend=imasdef.MDSPLUS_BACKEND, create: bool = False):
         """Context manager to open database entry.
 
+        IMAS is not thread-safe, so the entry is opened while holding
+        `IMAS_LOCK`, which is released when the entry is closed.
+
         Parameters
         ----------
         backend : optional
@@ -349,24 +385,25 @@ class ImasHandle(ImasBaseModel):
         entry : `imas.DBEntry`
             Opened IMAS database entry
         """
-        entry = self.entry(backend=backend)
-        opcode, _ = entry.open()
-
-        if opcode == 0:
-            logger.debug("Data entry opened: %s", self)
-        elif create:
-            cpcode, _ = entry.create()
-            if cpcode == 0:
-                logger.debug("Data entry created: %s", self)
+        with IMAS_LOCK:
+            entry = self.entry(backend=backend)
+            opcode, _ = entry.open()
+
+            if opcode == 0:
+                logger.debug("Data entry opened: %s", self)
+            elif create:
+                cpcode, _ = entry.create()
+                if cpcode == 0:
+                    logger.debug("Data entry created: %s", self)
+                else:
+                    raise OSError(
+                        f"Cannot create data entry: {self}. "
+                        f"Create a new db first using `imasdb {self.db}`"
+                    )
             else:
-                raise OSError(
-                    f"Cannot create data entry: {self}. "
-                    f"Create a new db first using `imasdb {self.db}`"
-                )
-        else:
-            raise OSError(f"Data entry does not exist: {self}")
+                raise OSError(f"Data entry does not exist: {self}")
 
-        try:
-            yield entry
-        finally:
-            entry.close()
+            try:
+                yield entry
+            finally:
+                entry.close()
@@ -2,10 +2,15 @@
 from __future__ import annotations
 
 import logging
+import threading
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 imas_mocked = False
 
+# The IMAS access layer is not thread-safe, hold this lock while using it
+IMAS_LOCK = threading.RLock()
+
 try:
     import os
     import xml.sax
@@ -33,7 +38,9 @@ try:
                 self.idss.append(ids)
 
         @classmethod
+        @lru_cache
         def load_idsdef(cls):
+            """Parse `IDSDef.xml`, the result is cached."""
             parser = cls()
             xml.sax.parse(PATH_IDSDEF, parser)
             return parser
@@ -0,0 +1,194 @@
+"""Load data from many IMAS handles into a single dataset."""
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Callable, Hashable, Mapping, Optional, Sequence
+
+import numpy as np
+
+from ._rebase import rebase_all_coords
+
+if TYPE_CHECKING:
+    import xarray as xr
+
+    from ._handle import ImasHandle
+
+logger = logging.getLogger(__name__)
+
+RebaseFunc = Callable[["xr.Dataset", "xr.Dataset"], "xr.Dataset"]
+
+
+def _rebase_on_reference(ds: xr.Dataset, reference: xr.Dataset) -> xr.Dataset:
+    (ds,) = rebase_all_coords((ds,), reference)
+    return ds
+
+
+def _load_one(
+    handle: ImasHandle,
+    *,
+    variables: Sequence[str],
+    reference: Optional[xr.Dataset],
+    rebase: RebaseFunc,
+    errors: tuple[type[Exception], ...],
+) -> Optional[xr.Dataset]:
+    """Load variables from handle and rebase them on the reference.
+
+    Returns None if loading fails with one of `errors`.
+    """
+    try:
+        ds = handle.get_variables(variables=variables)
+    except errors as err:
+        logger.warning("Skipping %s, %s.", handle, err)
+        return None
+
+    return rebase(ds, ds if reference is None else reference)
+
+
+def load_datasets(
+    handles: Mapping[Hashable, ImasHandle],
+    *,
+    variables: Sequence[str],
+    rebase: Optional[RebaseFunc] = None,
+    lazy: bool = False,
+    errors: tuple[type[Exception], ...] = (),
+) -> xr.Dataset:
+    """Load variables for all handles and concatenate them along `run`.
+
+    The first handle that can be loaded is the reference, the data from
+    all other handles are rebased onto its coordinates.
+
+    With `lazy=True`, the data are read with dask. Every handle becomes
+    a single chunk that is read and rebased when it is needed, so that only
+    the data that are selected are materialized. This requires `dask`.
+
+    Parameters
+    ----------
+    handles : Mapping[Hashable, ImasHandle]
+        Handles to load, the keys are used as names for the runs.
+    variables : Sequence[str]
+        Names of the variables to load.
+    rebase : Optional[Callable[[xr.Dataset, xr.Dataset], xr.Dataset]]
+        Function to rebase a dataset (first argument) onto the reference
+        (second argument). Defaults to `rebase_all_coords`.
+    lazy : bool
+        Load the data lazily using dask.
+    errors : tuple[type[Exception], ...]
+        Skip handles that fail to load with one of these errors.
+        In lazy mode, the handle is only read when the data are computed,
+        so it cannot be skipped. Its run is kept and filled with NaN instead.
+
+    Returns
+    -------
+    xr.Dataset
+        Dataset with the data from all handles along the `run` dimension.
+    """
+    import xarray as xr
+
+    if rebase is None:
+        rebase = _rebase_on_reference
+
+    names = list(handles)
+
+    reference: Optional[xr.Dataset] = None
+    runs: list[Hashable] = []
+    others: list[Hashable] = []
+
+    for i, name in enumerate(names):
+        reference = _load_one(
+            handles[name],
+            variables=variables,
+            reference=None,
+            rebase=rebase,
+            errors=errors,
+        )
+        if reference is not None:
+            runs = [name]
+            others = names[i + 1 :]
+            break
+
+    if reference is None:
+        raise ValueError("None of the data could be loaded.")
+
+    if lazy:
+        runs.extend(others)
+        data_vars = _load_lazy(
+            [handles[name] for name in others],
+            variables=variables,
+            reference=reference,
+            rebase=rebase,
+            errors=errors,
+        )
+        dataset = xr.Dataset(data_vars, coords=reference.coords, attrs=reference.attrs)
+    else:
+        datasets = [reference]
+        for name in others:
+            ds = _load_one(
+                handles[name],
+                variables=variables,
+                reference=reference,
+                rebase=rebase,
+                errors=errors,
+            )
+            if ds is None:
+                continue
+            runs.append(name)
+            datasets.append(ds)
+
+        dataset = xr.concat(datasets, "run")
+
+    dataset = dataset.assign_coords(run=runs)
+
+    return dataset
+
+
+def _read_arrays(
+    handle: ImasHandle, *, reference: xr.Dataset, **kwargs
+) -> dict[Hashable, np.ndarray]:
+    """Read the data variables of a single handle as numpy arrays.
+
+    The arrays have the same shape as in the reference, the data for
+    handles that cannot be loaded are filled with NaN.
+    """
+    ds = _load_one(handle, reference=reference, **kwargs)
+
+    arrays = {}
+    for name, template in reference.data_vars.items():
+        if ds is None:
+            arrays[name] = np.full(template.shape, np.nan)
+        else:
+            arrays[name] = ds[name].transpose(*template.dims).data
+    return arrays
+
+
+def _load_lazy(
+    handles: Sequence[ImasHandle],
+    *,
+    reference: xr.Dataset,
+    **kwargs,
+) -> dict[Hashable, tuple]:
+    """Create dask arrays for the data variables, one chunk per handle."""
+    try:
+        import dask
+        import dask.array as da
+    except ImportError as err:
+        raise ImportError(
+            "Lazy loading requires dask, install it with `pip install dask`"
+        ) from err
+
+    chunks: dict[Hashable, list] = {
+        name: [da.from_array(var.data)] for name, var in reference.data_vars.items()
+    }
+
+    for handle in handles:
+        arrays = dask.delayed(_read_arrays)(handle, reference=reference, **kwargs)
+
+        for name, template in reference.data_vars.items():
+            dtype = np.result_type(template.dtype, float)
+            chunks[name].append(
+                da.from_delayed(arrays[name], shape=template.shape, dtype=dtype)
+            )
+
+    return {
+        name: (("run", *reference[name].dims), da.stack(arrays))
+        for name, arrays in chunks.items()
+    }
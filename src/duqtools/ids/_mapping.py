@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import logging
 import re
 from collections.abc import Mapping
-from typing import TYPE_CHECKING, Any, Sequence
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Iterator, Optional, Sequence, Union
 
 import numpy as np
 
@@ -14,8 +16,12 @@ if TYPE_CHECKING:
 
     from ._handle import ImasHandle
 
+logger = logging.getLogger(__name__)
+
 INDEX_STR = "*"
 
+PLAIN_PART = re.compile(r"^\w+$")
+
 
 class EmptyVarError(Exception):
     ...
@@ -35,8 +41,81 @@ def replace_index_str(string: str) -> str:
     return string.replace(INDEX_STR, r"(\d+)")
 
 
+@lru_cache(maxsize=None)
+def compile_pattern(pattern: str) -> Union[tuple[str, ...], re.Pattern]:
+    """Compile a key pattern for matching against the keys of an `IDSMapping`.
+
+    Patterns that consist only of literal parts and `*` wildcards, such as
+    `profiles_1d/*/ion/*/temperature`, are returned as a tuple of parts.
+    These can be answered directly from the key tree. Any other pattern
+    is compiled to a regex.
+
+    Parameters
+    ----------
+    pattern : str
+        Key pattern, `*` matches any index.
+
+    Returns
+    -------
+    Union[tuple[str, ...], re.Pattern]
+        Tuple of path parts or compiled regex.
+    """
+    parts = tuple(pattern.split("/"))
+
+    if all(part == INDEX_STR or PLAIN_PART.match(part) for part in parts):
+        return parts
+
+    pattern = insert_re_caret_dollar(pattern)
+    pattern = replace_index_str(pattern)
+
+    return re.compile(pattern)
+
+
+def _has_toplevel_alternation(pattern: str) -> bool:
+    """Return True if `pattern` contains `|` outside a group or set."""
+    depth = 0
+    in_set = False
+    chars = iter(pattern)
+
+    for char in chars:
+        if char == "\\":
+            next(chars, None)
+        elif in_set:
+            in_set = char != "]"
+        elif char == "[":
+            in_set = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+
+    return False
+
+
+def _literal_prefix(pattern: str) -> str:
+    """Return the leading part of a key pattern without regex characters.
+
+    For example, `profiles_1d/*/ion/(0|1)/temperature` returns `profiles_1d`.
+    Patterns with an alternation outside a group, such as `a/b|c/d`, do not
+    share a prefix, these return an empty string.
+    """
+    if _has_toplevel_alternation(pattern):
+        return ""
+
+    prefix = []
+
+    for part in pattern.split("/"):
+        if not PLAIN_PART.match(part):
+            break
+        prefix.append(part)
+
+    return "/".join(prefix)
+
+
 class IDSMapping(Mapping):
-    def __init__(self, ids: Any) -> None:
+    def __init__(self, ids: Any, lazy: bool = False) -> None:
         """Map the IMASDB object.
 
         Empty arrays are excluded from the mapping.
@@ -47,6 +126,12 @@ class IDSMapping(Mapping):
         ----------
         ids :
             IMAS DB entry for the IDS.
+        lazy : bool
+            If True, do not walk the complete IDS on construction. Keys are
+            resolved when they are accessed, and the key index is built for
+            the parts of the tree that are touched by `findall`,
+            `find_by_group` or `in`. Iterating over the mapping or
+            calling `len` loads the full tree (see `IDSMapping.load_all`).
 
         Attributes
         ----------
@@ -58,7 +143,154 @@ class IDSMapping(Mapping):
         self._keys: set[str] = set()
         self._paths: dict[str, Any] = dict()
 
-        self.dive(ids, list())
+        # Prefixes of sub-trees that have been added to `_keys`
+        self._loaded: set[str] = set()
+        self._fully_loaded = False
+
+        if not lazy:
+            self.load_all()
+
+    @property
+    def is_fully_loaded(self) -> bool:
+        """Return True if all keys in the IDS have been indexed."""
+        return self._fully_loaded
+
+    def load_all(self) -> None:
+        """Walk the complete IDS and index all keys.
+
+        This is a no-op if the tree has already been loaded.
+        """
+        if self._fully_loaded:
+            return
+
+        self.dive(self._ids, list())
+        self._fully_loaded = True
+
+    def _is_loaded(self, prefix: str) -> bool:
+        """Return True if the sub-tree at `prefix` has been indexed."""
+        if self._fully_loaded:
+            return True
+
+        return any(
+            prefix == loaded or prefix.startswith(f"{loaded}/")
+            for loaded in self._loaded
+        )
+
+    def _load_prefix(self, prefix: str) -> None:
+        """Index all keys in the sub-tree at `prefix`."""
+        if not prefix:
+            self.load_all()
+            return
+
+        if self._is_loaded(prefix):
+            return
+
+        parts = prefix.split("/")
+
+        try:
+            val = self._walk(parts)
+        except KeyError:
+            pass
+        else:
+            self.dive(val, parts)
+
+        self._loaded.add(prefix)
+
+    def _keys_for_prefix(self, prefix: str) -> set[str] | list[str]:
+        """Return the keys in the sub-tree at `prefix`."""
+        if not prefix:
+            return self._keys
+
+        return [
+            key for key in self._keys if key == prefix or key.startswith(f"{prefix}/")
+        ]
+
+    def _match_tree(self, parts: Sequence[str]) -> Iterator[tuple[str, tuple, Any]]:
+        """Walk the key tree (`_paths`) for `parts`, where `*` matches any
+        index.
+
+        The IDS is walked alongside the key tree, so that values do not
+        have to be looked up from the root for every match.
+
+        Yields the matching keys, the indices matched by `*`, and the values.
+        """
+        nodes: list[tuple[Any, Any, tuple]] = [(self._paths, self._ids, ())]
+
+        for part in parts:
+            matched: list[tuple[Any, Any, tuple]] = []
+
+            for node, pointer, groups in nodes:
+                if not isinstance(node, dict):
+                    continue
+                if part == INDEX_STR:
+                    matched.extend(
+                        (child, pointer[int(index)], (*groups, index))
+                        for index, child in node.items()
+                        if index.isdigit()
+                    )
+                elif part in node:
+                    matched.append(
+                        (node[part], self._getattr(pointer, part), groups)
+                    )
+
+            nodes = matched
+
+        for node, pointer, groups in nodes:
+            if isinstance(node, str):
+                yield node, groups, pointer
+
+    def _match(self, pattern: str) -> Iterator[tuple[str, tuple, Any]]:
+        """Yield keys matching `pattern` together with the matched groups and
+        the values.
+
+        Wildcard patterns are looked up in the key tree, other patterns
+        fall back to matching the regex against all candidate keys.
+        """
+        prefix = _literal_prefix(pattern)
+        self._load_prefix(prefix)
+
+        compiled = compile_pattern(pattern)
+
+        if isinstance(compiled, tuple):
+            yield from self._match_tree(compiled)
+            return
+
+        for key in self._keys_for_prefix(prefix):
+            m = compiled.match(key)
+            if m:
+                yield key, m.groups(), self[key]
+
+    def _walk(self, parts: Sequence[str]) -> Any:
+        """Follow `parts` from the root like `IDSMapping.dive` would.
+
+        Unlike `__getitem__`, this does not index into data arrays or strings.
+
+        Raises
+        ------
+        KeyError
+            If `parts` does not point to a node in the tree.
+        """
+        pointer = self._ids
+
+        for part in parts:
+            if isinstance(pointer, (str, np.ndarray, np.generic)):
+                raise KeyError("/".join(parts))
+            try:
+                pointer = self._getattr(pointer, part)
+            except (AttributeError, IndexError, TypeError) as err:
+                raise KeyError("/".join(parts)) from err
+
+        return pointer
+
+    def _is_data_key(self, key: str) -> bool:
+        """Check if `key` points to a non-empty data array, without walking
+        the rest of the tree."""
+        try:
+            val = self._walk(key.split("/"))
+        except KeyError:
+            return False
+
+        return isinstance(val, (np.ndarray, np.generic)) and val.size > 0
 
     def __repr__(self):
         s = f"{self.__class__.__name__}(\n"
@@ -114,13 +346,25 @@ class IDSMapping(Mapping):
             setattr(pointer, attr, value)
 
     def __iter__(self):
+        self.load_all()
         yield from self._keys
 
     def __len__(self):
+        self.load_all()
         return len(self._keys)
 
     def __contains__(self, key):
-        return key in self._keys
+        if key in self._keys:
+            return True
+
+        if self._fully_loaded or not isinstance(key, str):
+            return False
+
+        if self._is_data_key(key):
+            self._keys.add(key)
+            return True
+
+        return False
 
     @staticmethod
     def _path_at_index(variable: str | IDSVariableModel, index: int | Sequence[int]):
@@ -184,7 +428,7 @@ class IDSMapping(Mapping):
         except Exception:
             pass
 
-    def sync(self, target: ImasHandle):
+    def sync(self, target: ImasHandle, provenance: bool = True):
         """Synchronize updated data back to IMAS db entry.
 
         Shortcut for 'put' command.
@@ -193,9 +437,11 @@ class IDSMapping(Mapping):
         ----------
         target : ImasHandle
             Points to an IMAS db entry of where the data should be written.
+        provenance : bool
+            If True, add provenance information to the target.
         """
-
-        add_provenance_info(handle=target)
+        if provenance:
+            add_provenance_info(handle=target)
 
         with target.open() as db_entry:
             self._ids.put(db_entry=db_entry)
@@ -246,6 +492,9 @@ class IDSMapping(Mapping):
     def findall(self, pattern: str) -> dict[str, Any]:
         """Find keys matching regex pattern.
 
+        Patterns with only `*` wildcards (e.g. `profiles_1d/*/t_i_ave`)
+        are looked up directly in the key tree.
+
         Parameters
         ----------
         pattern : str
@@ -256,12 +505,7 @@ class IDSMapping(Mapping):
         dict
             New dict with all matching key/value pairs.
         """
-        pattern = insert_re_caret_dollar(pattern)
-        pattern = replace_index_str(pattern)
-
-        pat = re.compile(pattern)
-
-        return {key: self[key] for key in self._keys if pat.match(key)}
+        return {key: value for key, _, value in self._match(pattern)}
 
     def find_by_group(self, pattern: str) -> dict[tuple | str, Any]:
         """Find keys matching regex pattern by group.
@@ -279,42 +523,138 @@ class IDSMapping(Mapping):
         dict
             New dict with all matching key/value pairs.
         """
-        pattern = insert_re_caret_dollar(pattern)
-        pattern = replace_index_str(pattern)
-
-        pat = re.compile(pattern)
-
         new = dict()
-        for key in self._keys:
-            m = pat.match(key)
-            if m:
-                groups = m.groups()
-                idx = groups[0] if len(groups) == 1 else groups
-                new[idx] = self[key]
+        for _, groups, value in self._match(pattern):
+            idx = groups[0] if len(groups) == 1 else groups
+            new[idx] = value
 
         return new
 
-    def _read_array_from_parts(self, *parts: str):
-        arr = list()
-        root, sub, *remaining = parts
-        nodes = self[root]
-
-        for index in range(len(nodes)):
-            path = f"{root}/{index}/{sub}"
+    @staticmethod
+    def _split_sub(sub: str) -> tuple[int | str, ...]:
+        """Split sub path into attribute names and (integer) indices."""
+        return tuple(int(part) if part.isdigit() else part for part in sub.split("/"))
 
-            if remaining:
-                sub_arr = self._read_array_from_parts(path, *remaining)
+    @staticmethod
+    def _resolve(pointer: Any, sub_parts: tuple[int | str, ...]) -> Any:
+        """Follow the parts of a sub path (see `_split_sub`) relative to
+        `pointer`."""
+        for part in sub_parts:
+            if isinstance(part, int):
+                pointer = pointer[part]
             else:
-                sub_arr = self[path]
+                pointer = getattr(pointer, part)
+
+        return pointer
+
+    def _read_array_from_parts(
+        self, *parts: str, nodes_cache: Optional[dict[str, list]] = None
+    ) -> tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """Read data from nested struct arrays into a single array.
+
+        The struct arrays are walked once, relative to their parent node,
+        and the data are copied into a preallocated array. Ragged data
+        (i.e. struct arrays or data arrays that differ in length) are
+        padded with NaN.
+
+        Parameters
+        ----------
+        *parts : str
+            Parts of the variable path, split by `/*/`.
+        nodes_cache : dict[str, list], optional
+            Resolved struct array nodes by path, can be shared between
+            variables that live in the same struct arrays.
+
+        Returns
+        -------
+        data : np.ndarray, optional
+            Data array, None if the variable contains empty data.
+        mask : np.ndarray, optional
+            Boolean array which is True for valid data. Only returned if
+            the data are ragged, otherwise None.
+        """
+        if nodes_cache is None:
+            nodes_cache = dict()
+
+        root, *subs = parts
+        n_levels = len(subs)
+        subs_parts = [self._split_sub(sub) for sub in subs]
+
+        outer_shape = [0] * n_levels
+        leaves: list[tuple[tuple[int, ...], np.ndarray]] = list()
+        is_empty = False
+
+        def walk(pointer: Any, path: str, index: tuple[int, ...]):
+            nonlocal is_empty
+
+            level = len(index)
+
+            if path not in nodes_cache:
+                nodes_cache[path] = [pointer[i] for i in range(len(pointer))]
+            nodes = nodes_cache[path]
+
+            if not nodes:
+                is_empty = True
+
+            outer_shape[level] = max(outer_shape[level], len(nodes))
+            sub = subs[level]
+            sub_parts = subs_parts[level]
+            is_leaf = level + 1 == n_levels
+
+            for i, node in enumerate(nodes):
+                try:
+                    child = self._resolve(node, sub_parts)
+                except (AttributeError, IndexError) as err:
+                    raise KeyError(f"{path}/{i}/{sub}") from err
 
-            arr.append(sub_arr)
+                if is_leaf:
+                    leaves.append(((*index, i), np.asarray(child)))
+                else:
+                    walk(child, f"{path}/{i}/{sub}", (*index, i))
+
+        walk(self[root], root, ())
+
+        if is_empty or any(leaf.size == 0 for _, leaf in leaves):
+            return None, None
+
+        ndims = {leaf.ndim for _, leaf in leaves}
+        if len(ndims) > 1:
+            raise ValueError(f"Inconsistent number of dimensions for {parts}")
+
+        inner_shape = tuple(np.max([leaf.shape for _, leaf in leaves], axis=0))
+        shape = (*outer_shape, *inner_shape)
+
+        is_ragged = len(leaves) != np.prod(outer_shape) or any(
+            leaf.shape != inner_shape for _, leaf in leaves
+        )
+
+        dtype = np.result_type(*{leaf.dtype for _, leaf in leaves})
+
+        if not is_ragged:
+            data = np.empty(shape, dtype=dtype)
+            for index, leaf in leaves:
+                data[index] = leaf
+            return data, None
+
+        dtype = np.promote_types(dtype, np.float16)
+        data = np.full(shape, np.nan, dtype=dtype)
+        mask = np.zeros(shape, dtype=bool)
+
+        for index, leaf in leaves:
+            loc: tuple[int | slice, ...] = (
+                *index,
+                *(slice(0, n) for n in leaf.shape),
+            )
+            data[loc] = leaf
+            mask[loc] = True
 
-        return arr
+        return data, mask
 
     def to_xarray(
         self,
         variables: Sequence[str | IDSVariableModel],
         empty_var_ok: bool = False,
+        ragged_mask: bool = False,
         **kwargs,
     ) -> xr.Dataset:
         """Return dataset for given variables.
@@ -327,25 +667,16 @@ class IDSMapping(Mapping):
             If True, silently skip data that are missing from the mapping.
             If False (default), raise an error when data that are missing
             from the dataset are requested.
+        ragged_mask : bool
+            Ragged data (i.e. the grid size changes between time slices)
+            are padded with NaN. If True, add a boolean `<name>_mask`
+            variable for ragged data that is True where data are valid.
 
         Returns
         -------
         ds : xr.Dataset
             Return query as Dataset
         """
-
-        def _contains_empty(arr):
-            if isinstance(arr, list):
-                if len(arr) == 0:
-                    return True
-                return any(_contains_empty(sub_arr) for sub_arr in arr)
-            elif isinstance(arr, np.ndarray):
-                return arr.size == 0
-            elif isinstance(arr, (float, int)):
-                return False
-            else:
-                raise ValueError(f"Don't know how to deal with: {var.name}: {arr}")
-
         import xarray as xr
 
         from duqtools.config import lookup_vars
@@ -354,6 +685,8 @@ class IDSMapping(Mapping):
 
         variables = lookup_vars(variables)
 
+        nodes_cache: dict[str, list] = dict()
+
         for var in variables:
             parts = var.path.split("/*/")
 
@@ -361,37 +694,96 @@ class IDSMapping(Mapping):
                 xr_data_vars[var.name] = (var.dims, self[var.path])
                 continue
 
-            arr = self._read_array_from_parts(*parts)
+            arr, mask = self._read_array_from_parts(*parts, nodes_cache=nodes_cache)
 
-            if _contains_empty(arr):
+            if arr is None:
                 if empty_var_ok:
                     continue
                 else:
                     raise EmptyVarError(f"Variable {var.name!r} contains empty data.")
+
             xr_data_vars[var.name] = ([*var.dims], arr)
 
+            if mask is not None:
+                logger.debug("Variable %r contains ragged data", var.name)
+                if ragged_mask:
+                    xr_data_vars[f"{var.name}_mask"] = ([*var.dims], mask)
+
         ds = xr.Dataset(data_vars=xr_data_vars)  # type: ignore
 
         return ds
 
-    def _write_array_in_parts(self, data, *parts: str) -> None:
+    def _write_array_in_parts(
+        self, data, *parts: str, nodes_cache: Optional[dict[str, Any]] = None
+    ) -> list[str]:
         """_write_array_in_parts.
 
-        inner function that determines the path and writes back the data
+        inner function that determines the path and writes back the data.
+        Struct array nodes and parent pointers are looked up once and stored
+        in `nodes_cache`, so that they can be reused for other variables.
+
+        Returns
+        -------
+        list[str]
+            Paths that were written.
         """
+        if nodes_cache is None:
+            nodes_cache = dict()
+
         if len(parts) < 2:
             # Write back
             (path,) = parts
             self[path] = data
-            return
+            return [path]
+
+        root, *subs = parts
+        n_levels = len(subs)
+        subs_parts = [self._split_sub(sub) for sub in subs]
+
+        written: list[str] = list()
+
+        def walk(pointer: Any, path: str, data, level: int):
+            if path not in nodes_cache:
+                nodes_cache[path] = [pointer[i] for i in range(len(pointer))]
+            nodes = nodes_cache[path]
+
+            sub = subs[level]
+            *parent_parts, attr = subs_parts[level]
+            parent_sub = sub.rpartition("/")[0]
+
+            for i, node in enumerate(nodes):
+                sub_path = f"{path}/{i}/{sub}"
+
+                try:
+                    if level + 1 < n_levels:
+                        child = self._resolve(node, subs_parts[level])
+                        walk(child, sub_path, data[i], level + 1)
+                        continue
+
+                    parent_path = f"{path}/{i}/{parent_sub}"
+                    if parent_path not in nodes_cache:
+                        nodes_cache[parent_path] = self._resolve(
+                            node, tuple(parent_parts)
+                        )
+                    parent = nodes_cache[parent_path]
+
+                    if isinstance(attr, int):
+                        parent[attr] = data[i]
+                    else:
+                        getattr(parent, attr)
+                        setattr(parent, attr, data[i])
+                except (AttributeError, IndexError) as err:
+                    raise KeyError(sub_path) from err
 
-        root, sub, *remaining = parts
-        nodes = self[root]
-        for index in range(len(nodes)):
-            path = f"{root}/{index}/{sub}"
-            self._write_array_in_parts(data[index], path, *remaining)
+                written.append(sub_path)
 
-    def write_array_in_parts(self, variable_path: str, data: xr.DataArray) -> None:
+        walk(self[root], root, data, 0)
+
+        return written
+
+    def write_array_in_parts(
+        self, variable_path: str, data: xr.DataArray
+    ) -> list[str]:
         """write_back data, give the data, and the variable path, where `*`
         denotes the dimensions. This function will figure out how to write it
         back to the IDS.
@@ -406,7 +798,77 @@ class IDSMapping(Mapping):
 
         Returns
         -------
-        None
+        list[str]
+            Paths that were written.
         """
         parts = variable_path.split("/*/")
-        self._write_array_in_parts(data.data, *parts)
+        return self._write_array_in_parts(data.data, *parts)
+
+    def write_arrays_in_parts(
+        self, data: Mapping[str, xr.DataArray | np.ndarray]
+    ) -> list[str]:
+        """Write back data for multiple variables in one pass.
+
+        Like `IDSMapping.write_array_in_parts`, but the struct array nodes
+        are resolved once and shared between all variables.
+
+        Parameters
+        ----------
+        data : Mapping[str, xr.DataArray | np.ndarray]
+            Maps the variable path (where `*` denotes a dimension) to the data.
+
+        Returns
+        -------
+        list[str]
+            All paths in the IDS that were written.
+        """
+        nodes_cache: dict[str, Any] = dict()
+        written: list[str] = list()
+
+        for variable_path, arr in data.items():
+            parts = variable_path.split("/*/")
+            arr = getattr(arr, "data", arr)
+            written.extend(
+                self._write_array_in_parts(arr, *parts, nodes_cache=nodes_cache)
+            )
+
+        return written
+
+    def write_xarray(
+        self,
+        dataset: xr.Dataset,
+        variables: Sequence[str | IDSVariableModel],
+        *,
+        suffix: str = "",
+    ) -> list[str]:
+        """Write data variables in the dataset back to the IDS.
+
+        This is the inverse of `IDSMapping.to_xarray`.
+
+        Parameters
+        ----------
+        dataset : xr.Dataset
+            Dataset with the data to write back.
+        variables : Sequence[str | IDSVariableModel]
+            Variables to look up the path in the IDS by name. Data variables
+            in the dataset without a matching variable are skipped.
+        suffix : str, optional
+            Append this suffix to the path of every variable, for example
+            `_error_upper` to write the data to the error nodes.
+
+        Returns
+        -------
+        list[str]
+            All paths in the IDS that were written.
+        """
+        from duqtools.config import lookup_vars
+
+        paths = {var.name: var.path for var in lookup_vars(variables)}
+
+        data = {
+            paths[name] + suffix: dataset[name]
+            for name in dataset.data_vars
+            if name in paths
+        }
+
+        return self.write_arrays_in_parts(data)
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING, Sequence
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Iterator, Sequence
 
+import numpy as np
 import xarray as xr
 
 from ..operations import add_to_op_queue
@@ -18,17 +21,130 @@ logger = logging.getLogger(__name__)
 info = logger.info
 
 
+class RunningStats:
+    """Accumulate the mean and standard deviation of datasets one at a time.
+
+    Uses Welford's online algorithm, so that only the running count, mean
+    and sum of squared differences (`m2`) are kept in memory. Like
+    `xr.Dataset.mean`/`xr.Dataset.std` with `skipna=True`, missing
+    values (NaN) are ignored. Datasets are aligned using an outer join,
+    as `xr.concat` would do.
+    """
+
+    def __init__(self) -> None:
+        self.count: dict[str, xr.DataArray] = dict()
+        self.mean: dict[str, xr.DataArray] = dict()
+        self.m2: dict[str, xr.DataArray] = dict()
+
+    def __len__(self):
+        return len(self.mean)
+
+    def add(self, ds: xr.Dataset):
+        """Add dataset to the running statistics."""
+        for name, x in ds.data_vars.items():
+            name = str(name)
+
+            x = x.astype(float)
+
+            if name not in self.mean:
+                self.count[name] = x.notnull().astype(int)
+                self.mean[name] = x.fillna(0.0)
+                self.m2[name] = xr.zeros_like(self.mean[name])
+                continue
+
+            mean, x = xr.align(self.mean[name], x, join="outer")
+            mean = mean.fillna(0.0)
+            count = self.count[name].reindex_like(mean, fill_value=0)
+            m2 = self.m2[name].reindex_like(mean, fill_value=0.0)
+
+            valid = x.notnull()
+            count = count + valid
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                delta = x - mean
+                mean = mean + (delta / count).where(valid, 0.0)
+                m2 = m2 + (delta * (x - mean)).where(valid, 0.0)
+
+            self.count[name] = count
+            self.mean[name] = mean
+            self.m2[name] = m2
+
+    def get_mean(self) -> xr.Dataset:
+        """Return mean, NaN where there are no data."""
+        return xr.Dataset(
+            {name: mean.where(self.count[name] > 0) for name, mean in self.mean.items()}
+        )
+
+    def get_std(self) -> xr.Dataset:
+        """Return (population) standard deviation, NaN where there are no
+        data."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return xr.Dataset(
+                {
+                    name: ((m2 / self.count[name]) ** 0.5).where(self.count[name] > 0)
+                    for name, m2 in self.m2.items()
+                }
+            )
+
+
+def _get_rebased_data(
+    handle: ImasHandle,
+    variables: Sequence[IDSVariableModel],
+    target_data: xr.Dataset,
+) -> xr.Dataset:
+    """Get data from handle and rebase on the coordinates of the target."""
+    ds = handle.get_variables(variables, empty_var_ok=True)  # type: ignore
+    (ds,) = rebase_all_coords((ds,), target_data)
+    return ds
+
+
+def _iter_rebased_data(
+    handles: Sequence[ImasHandle],
+    variables: Sequence[IDSVariableModel],
+    target_data: xr.Dataset,
+    *,
+    workers: int = 1,
+) -> Iterator[xr.Dataset]:
+    """Yield rebased data for every handle, in order.
+
+    With `workers > 1`, the data are read and rebased in a process pool.
+    At most `2 * workers` datasets are in flight at the same time.
+    """
+    if workers <= 1:
+        for handle in handles:
+            yield _get_rebased_data(handle, variables, target_data)
+        return
+
+    max_in_flight = 2 * workers
+    pending: deque = deque()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for handle in handles:
+            pending.append(
+                executor.submit(_get_rebased_data, handle, variables, target_data)
+            )
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
 @add_to_op_queue("Merging to", "{target}")
 def merge_data(
     handles: Sequence[ImasHandle],
     target: ImasHandle,
     variables: list[IDSVariableModel],
     callback=None,
+    workers: int = 1,
 ):
     """merge_data merges the data from the handles to the target, only merges
     over the listed variables, coordination variables are never overwritten,
     and data is rebased according to the target coordination variable.
 
+    The data are streamed, only the running mean and variance are kept
+    in memory, so memory use does not grow with the number of handles.
+
     Parameters
     ----------
     handles : Sequence[ImasHandle]
@@ -37,6 +153,8 @@ def merge_data(
         target
     variables : Sequence[IDSVariableModel]
         variables
+    workers : int
+        Number of processes used for reading and rebasing the data.
     """
     from ..config import var_lookup
 
@@ -76,24 +194,25 @@ def merge_data(
         target_data = target_ids.to_xarray(variables=ids_vars, empty_var_ok=True)
         target_data = squash_placeholders(target_data)
 
-        ids_data = [
-            handle.get_variables(ids_vars, empty_var_ok=True)  # type: ignore
-            for handle in handles
-        ]
+        stats = RunningStats()
 
-        ids_data = rebase_all_coords(ids_data, target_data)
-        ids_data = xr.concat(ids_data, "handle")
+        for ds in _iter_rebased_data(
+            handles, ids_vars, target_data, workers=workers  # type: ignore
+        ):
+            stats.add(ds)
 
         # Now we have to get the stddeviations
-        mean_data = ids_data.mean(dim="handle")
-        std_data = ids_data.std(dim="handle", skipna=True)
+        mean_data = stats.get_mean()
+        std_data = stats.get_std()
 
         # Then, write it back to target
-        for name in ids_data.data_vars.keys():
+        data = dict()
+        for name in mean_data.data_vars.keys():
             path = variable_dict[name].path
-            target_ids.write_array_in_parts(path, mean_data[name])
+            data[path] = mean_data[name]
+            data[path + "_error_upper"] = std_data[name]
 
-            path_upper = path + "_error_upper"
-            target_ids.write_array_in_parts(path_upper, std_data[name])
+        written = target_ids.write_arrays_in_parts(data)
+        logger.debug("Merged %d paths into %s:%s", len(written), target, ids_name)
 
         target_ids.sync(target)
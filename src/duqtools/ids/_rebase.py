@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import hashlib
 import logging
-from typing import TYPE_CHECKING, Optional, Sequence, Union
+import threading
+from typing import TYPE_CHECKING, Hashable, Literal, Optional, Sequence, Union
+
+import numpy as np
 
 if TYPE_CHECKING:
-    import numpy as np
     import xarray as xr
 
 logger = logging.getLogger(__name__)
@@ -63,6 +66,295 @@ def squash_placeholders(ds: xr.Dataset) -> xr.Dataset:
     return ds
 
 
+def _interp_weights(
+    xp: np.ndarray, x: np.ndarray, *, extrapolate: bool = False
+) -> dict[str, Optional[np.ndarray]]:
+    """Compute linear interpolation weights for every row in `xp`.
+
+    Without extrapolation, the weights follow `np.interp` and points
+    outside the grid are NaN. With extrapolation, the weights follow
+    `scipy.interpolate.interp1d(..., fill_value="extrapolate")`. These are
+    the interpolators that xarray uses for `interp`.
+
+    Parameters
+    ----------
+    xp : np.ndarray
+        2D array with the old grid (groups x grid points), NaN values are
+        ignored.
+    x : np.ndarray
+        1D array with the new grid.
+    extrapolate : bool
+        Extrapolate outside the old grid.
+
+    Returns
+    -------
+    dict[str, Optional[np.ndarray]]
+        `order` sorts each row of `xp`. The other arrays have shape
+        (groups x new points): `lo` is the index of the lower bound into
+        the sorted rows, `offset` the distance to the lower bound, `width`
+        the width of the interval, `at_hi` is True where the new point
+        is on the upper bound, and `valid` is False outside the old grid.
+        `at_hi` and `valid` are None with extrapolation.
+    """
+    order = np.argsort(xp, axis=-1)
+    xs = np.take_along_axis(xp, order, axis=-1)
+    n_valid = np.count_nonzero(~np.isnan(xs), axis=-1)
+
+    side: Literal["left", "right"] = "left" if extrapolate else "right"
+
+    # searchsorted has no axis argument, a loop over the rows is cheap
+    idx = np.vstack(
+        [np.searchsorted(row[:n], x, side=side) for row, n in zip(xs, n_valid)]
+    )
+
+    lo = np.clip(idx - 1, 0, np.maximum(n_valid - 2, 0)[:, None])
+    x_lo = np.take_along_axis(xs, lo, axis=-1)
+    x_hi = np.take_along_axis(xs, np.minimum(lo + 1, xs.shape[-1] - 1), axis=-1)
+
+    weights = {
+        "order": order,
+        "lo": lo,
+        "offset": x - x_lo,
+        "width": x_hi - x_lo,
+        "at_hi": None,
+        "valid": None,
+    }
+
+    if not extrapolate:
+        first = xs[:, :1]
+        last = np.take_along_axis(xs, np.maximum(n_valid - 1, 0)[:, None], axis=-1)
+
+        weights["at_hi"] = x == x_hi
+        weights["valid"] = (n_valid[:, None] >= 2) & (x >= first) & (x <= last)
+
+    return weights
+
+
+def _apply_weights(
+    values: np.ndarray, weights: dict[str, Optional[np.ndarray]]
+) -> np.ndarray:
+    """Interpolate `values` (groups x old grid x ...) using `weights`.
+
+    Returns an array with shape (groups x new grid x ...).
+    """
+    # Broadcast the weights over the remaining dimensions
+    extra = (slice(None), slice(None)) + (None,) * (values.ndim - 2)
+    w = {key: arr[extra] for key, arr in weights.items() if arr is not None}
+
+    values = np.take_along_axis(values, w["order"], axis=1)
+    y_lo = np.take_along_axis(values, w["lo"], axis=1)
+    y_hi = np.take_along_axis(
+        values, np.minimum(w["lo"] + 1, values.shape[1] - 1), axis=1
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (y_hi - y_lo) / w["width"]
+        new_values = slope * w["offset"] + y_lo
+
+    if "at_hi" in w:
+        new_values = np.where(w["offset"] == 0, y_lo, new_values)
+        new_values = np.where(w["at_hi"], y_hi, new_values)
+    if "valid" in w:
+        new_values = np.where(w["valid"], new_values, np.nan)
+
+    return new_values
+
+
+class InterpolationPlan:
+    """Linear interpolation of a dimension from a source to a target grid.
+
+    The interpolation weights are computed once, and can be applied to any
+    dataset with the same source grid. Use `get_interpolation_plan` to
+    share plans between datasets.
+
+    Parameters
+    ----------
+    source : np.ndarray
+        Source coordinates.
+    target : np.ndarray
+        Target coordinates.
+    extrapolate : bool
+        Extrapolate outside the source grid, else fill with NaN.
+    """
+
+    def __init__(self, source: np.ndarray, target: np.ndarray, *, extrapolate=True):
+        self.target = np.asarray(target)
+        self.identity = np.array_equal(source, target)
+
+        if not self.identity:
+            weights = _interp_weights(
+                np.asarray(source, dtype=float)[None],
+                self.target,
+                extrapolate=extrapolate,
+            )
+            # Weights that are not used (None) are left out
+            self.weights = {
+                key: arr[0] for key, arr in weights.items() if arr is not None
+            }
+
+    def interp(self, values: np.ndarray, axis: int) -> np.ndarray:
+        """Interpolate `values` along `axis`."""
+        if self.identity:
+            return values
+
+        w = self.weights
+
+        # Broadcast the weights over the other dimensions
+        shape = [1] * values.ndim
+        shape[axis] = -1
+
+        values = np.take(values.astype(float), w["order"], axis=axis)
+        y_lo = np.take(values, w["lo"], axis=axis)
+        y_hi = np.take(values, np.minimum(w["lo"] + 1, values.shape[axis] - 1), axis)
+
+        offset = w["offset"].reshape(shape)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = (y_hi - y_lo) / w["width"].reshape(shape)
+            new_values = slope * offset + y_lo
+
+        if "at_hi" in w:
+            new_values = np.where(offset == 0, y_lo, new_values)
+            new_values = np.where(w["at_hi"].reshape(shape), y_hi, new_values)
+        if "valid" in w:
+            new_values = np.where(w["valid"].reshape(shape), new_values, np.nan)
+
+        return new_values
+
+    def apply(self, ds: xr.Dataset, dim: str) -> xr.Dataset:
+        """Interpolate all variables in `ds` along `dim`.
+
+        Parameters
+        ----------
+        ds : xr.Dataset
+            Dataset with `dim` as coordinate dimension.
+        dim : str
+            Dimension to interpolate.
+
+        Returns
+        -------
+        xr.Dataset
+            Interpolated dataset.
+        """
+        return _apply_plans(ds, {dim: self})
+
+
+def _apply_plans(
+    ds: xr.Dataset, plans: dict[Hashable, InterpolationPlan]
+) -> xr.Dataset:
+    """Apply interpolation plans to the dimensions of a dataset.
+
+    Variables that are not numeric are passed on to `xr.Dataset.interp`.
+    """
+    import xarray as xr
+
+    plans = {dim: plan for dim, plan in plans.items() if not plan.identity}
+
+    if not plans:
+        return ds
+
+    variables = {}
+    other = []
+
+    for name, var in ds.variables.items():
+        if name in plans:
+            continue
+
+        var_dims = [dim for dim in plans if dim in var.dims]
+
+        if not var_dims:
+            variables[name] = var
+        elif var.dtype.kind in "uifc":
+            values = var.data
+            for dim in var_dims:
+                values = plans[dim].interp(values, axis=var.dims.index(dim))
+            variables[name] = xr.Variable(var.dims, values, attrs=var.attrs)
+        else:
+            other.append(name)
+
+    if other:
+        subset = ds[other]
+        interpolated = subset.interp(
+            coords={
+                dim: plan.target for dim, plan in plans.items() if dim in subset.dims
+            },
+            kwargs={"fill_value": "extrapolate"},
+        )
+        variables.update(
+            (name, interpolated.variables[name])
+            for name in other
+            if name in interpolated.variables
+        )
+
+    coords = {name: var for name, var in variables.items() if name in ds.coords}
+    for dim, plan in plans.items():
+        coords[dim] = xr.Variable(dim, plan.target, attrs=ds[dim].attrs)
+
+    data_vars = {name: var for name, var in variables.items() if name not in ds.coords}
+
+    return xr.Dataset(data_vars, coords=coords, attrs=ds.attrs)
+
+
+# Maximum number of interpolation plans to keep
+MAX_PLANS = 128
+
+_plan_cache: dict[tuple[str, str, bool], InterpolationPlan] = {}
+_plan_cache_lock = threading.Lock()
+
+
+def _digest(arr: np.ndarray) -> str:
+    arr = np.ascontiguousarray(arr)
+    return hashlib.blake2b(
+        arr.tobytes() + str((arr.dtype, arr.shape)).encode()
+    ).hexdigest()
+
+
+def get_interpolation_plan(
+    source: np.ndarray, target: np.ndarray, *, extrapolate: bool = True
+) -> InterpolationPlan:
+    """Get interpolation plan, plans are cached by the hash of the source
+    and target coordinates.
+
+    Parameters
+    ----------
+    source : np.ndarray
+        Source coordinates.
+    target : np.ndarray
+        Target coordinates.
+    extrapolate : bool
+        Extrapolate outside the source grid, else fill with NaN.
+
+    Returns
+    -------
+    InterpolationPlan
+    """
+    key = (_digest(source), _digest(target), extrapolate)
+
+    with _plan_cache_lock:
+        if key in _plan_cache:
+            return _plan_cache[key]
+
+    plan = InterpolationPlan(source, target, extrapolate=extrapolate)
+
+    with _plan_cache_lock:
+        if key not in _plan_cache:
+            if len(_plan_cache) >= MAX_PLANS:
+                del _plan_cache[next(iter(_plan_cache))]
+            _plan_cache[key] = plan
+
+        return _plan_cache[key]
+
+
+def _can_plan(ds: xr.Dataset, dim: Hashable) -> bool:
+    """Return True if `dim` is a 1D numeric coordinate dimension."""
+    return (
+        dim in ds.dims
+        and dim in ds.coords
+        and ds[dim].ndim == 1
+        and ds[dim].dtype.kind in "uif"
+    )
+
+
 def standardize_grid(
     ds: xr.Dataset,
     *,
@@ -73,10 +365,11 @@ def standardize_grid(
 ) -> xr.Dataset:
     """Standardize the grid within a dataset.
 
-    Perform `split-apply-combine` routine on the data. Split
-    by the `group`, standardize the data in `new_dim` using
-    `new_dim_data` (interpolate if necessary),
-    and combine replacing `old_dim` by `new_dim`.
+    For every entry along `group`, the data along `old_dim` are
+    interpolated from the grid in `new_dim` to `new_dim_data`. The
+    interpolation weights are computed once and applied to all variables
+    at the same time. `old_dim` is replaced by `new_dim`. Points outside
+    the grid are set to NaN.
 
     Parameters
     ----------
@@ -97,21 +390,52 @@ def standardize_grid(
     xr.Dataset
         New dataset with `new_dim` as a coordinate dimension.
     """
+    import xarray as xr
+
+    if group is None:
+        if isinstance(new_dim_data, int):
+            new_dim_data = ds[new_dim].data
+        ds = ds.swap_dims({old_dim: new_dim})
+        return ds.interp({new_dim: new_dim_data})
+
     if isinstance(new_dim_data, int):
-        new_dim_data = ds.isel(**{group: new_dim_data})[  # type: ignore
-            new_dim
-        ].data  # type:ignore
+        new_dim_data = ds.isel({group: new_dim_data})[new_dim].data
+
+    new_grid = np.asarray(new_dim_data)
+
+    xp = ds[new_dim].transpose(group, old_dim).data.astype(float)
+    weights = _interp_weights(xp, new_grid)
+
+    data_vars: dict[Hashable, Union[xr.DataArray, xr.Variable]] = {}
 
-    gb = ds.groupby(group)
+    for name, var in ds.data_vars.items():
+        if name == new_dim:
+            continue
 
-    interp_kwargs = {new_dim: new_dim_data}
+        dims = var.dims
 
-    def standardize(group):
-        group = group.swap_dims({old_dim: new_dim})
-        group = group.interp(**interp_kwargs)
-        return group
+        if old_dim not in dims or group not in dims:
+            data_vars[name] = var
+            continue
+
+        rest = tuple(dim for dim in dims if dim not in (group, old_dim))
+        values = var.transpose(group, old_dim, *rest).data.astype(float)
+
+        new_values = _apply_weights(values, weights)
+
+        new_dims = (group, new_dim, *rest)
+        out_dims = tuple(new_dim if dim == old_dim else dim for dim in dims)
+
+        data_vars[name] = xr.Variable(new_dims, new_values, attrs=var.attrs).transpose(
+            *out_dims
+        )
+
+    coords = {
+        name: coord for name, coord in ds.coords.items() if old_dim not in coord.dims
+    }
+    coords[new_dim] = (new_dim, new_grid, ds[new_dim].attrs)
 
-    return gb.map(standardize)
+    return xr.Dataset(data_vars, coords=coords, attrs=ds.attrs)
 
 
 def rebase_on_grid(
@@ -119,7 +443,8 @@ def rebase_on_grid(
 ) -> xr.Dataset:
     """Rebase (interpolate) the coordinate dimension to the new coordinates.
 
-    Thin wrapper around `xarray.Dataset.interp`.
+    Values outside the grid are extrapolated. The interpolation plan is
+    cached, so rebasing many datasets with the same grid is cheap.
 
     Parameters
     ----------
@@ -135,9 +460,13 @@ def rebase_on_grid(
     xr.Dataset
         Rebased dataset
     """
-    return ds.interp(
-        coords={coord_dim: new_coords}, kwargs={"fill_value": "extrapolate"}
-    )
+    if not _can_plan(ds, coord_dim):
+        return ds.interp(
+            coords={coord_dim: new_coords}, kwargs={"fill_value": "extrapolate"}
+        )
+
+    plan = get_interpolation_plan(ds[coord_dim].data, new_coords)
+    return plan.apply(ds, coord_dim)
 
 
 def rebase_on_time(
@@ -145,7 +474,7 @@ def rebase_on_time(
 ) -> xr.Dataset:
     """Rebase (interpolate) the time dimension to the new coordinates.
 
-    Thin wrapper around `xarray.Dataset.interp`.
+    See `rebase_on_grid`.
 
     Parameters
     ----------
@@ -224,6 +553,9 @@ def rebase_all_coords(
 ) -> tuple[xr.Dataset, ...]:
     """Rebase all coords, by applying rebase operations.
 
+    Interpolation plans are shared between datasets with the same
+    coordinates, so the setup is done once for every unique grid.
+
     Parameters
     ----------
     datasets : Sequence[xr.Dataset]
@@ -240,7 +572,21 @@ def rebase_all_coords(
         name: dim for name, dim in reference_dataset.coords.items() if dim.size > 1
     }
 
-    return tuple(
-        ds.interp(coords=interp_dict, kwargs={"fill_value": "extrapolate"})
-        for ds in datasets
-    )
+    def rebase(ds: xr.Dataset) -> xr.Dataset:
+        plans = {}
+        remaining = {}
+
+        for name, coord in interp_dict.items():
+            if _can_plan(ds, name) and coord.ndim == 1:
+                plans[name] = get_interpolation_plan(ds[name].data, coord.data)
+            else:
+                remaining[name] = coord
+
+        ds = _apply_plans(ds, plans)
+
+        if remaining:
+            ds = ds.interp(coords=remaining, kwargs={"fill_value": "extrapolate"})
+
+        return ds
+
+    return tuple(rebase(ds) for ds in datasets)
@@ -8,6 +8,7 @@ from ..cli import (
     common_options,
     dry_run_option,
     logging_options,
+    threads_option,
     variables_option,
     yes_option,
 )
@@ -88,6 +89,13 @@ def cli_setup(**kwargs):
     is_flag=True,
     help="Create base runs (ignores `dimensions`/`sampler`).",
 )
+@click.option(
+    "--workers",
+    type=int,
+    default=1,
+    help="Number of worker processes used to create the runs (default = 1).",
+)
+@threads_option
 @common_options(*logging_options, yes_option, dry_run_option)
 def cli_create(**kwargs):
     """Create data sets for large scale validation.
@@ -106,6 +114,13 @@ def cli_create(**kwargs):
 @click.option(
     "--schedule", is_flag=True, help=("Schedule and submit jobs automatically. ")
 )
+@click.option(
+    "--retries",
+    "max_retries",
+    type=int,
+    default=0,
+    help="With --schedule, resubmit failed jobs up to this many times.",
+)
 @click.option(
     "-j",
     "--max_jobs",
@@ -113,6 +128,27 @@ def cli_create(**kwargs):
     help="Maximum number of jobs running simultaneously.",
     default=10,
 )
+@click.option(
+    "--workers",
+    type=int,
+    default=4,
+    help="Number of worker threads used to submit jobs (default = 4).",
+)
+@click.option(
+    "--submit-retries",
+    type=int,
+    default=3,
+    help=(
+        "Retry a submission up to this many times when the submit command "
+        "fails with a transient error, i.e. a timeout (default = 3)."
+    ),
+)
+@click.option(
+    "--rate",
+    type=float,
+    default=5.0,
+    help="Maximum number of submissions per second (default = 5).",
+)
 @click.option(
     "-s",
     "--status",
@@ -142,6 +178,15 @@ def cli_create(**kwargs):
         "Create script to submit jobs as array. " "Like --array, but does not submit."
     ),
 )
+@click.option(
+    "--pack",
+    type=int,
+    default=1,
+    help=(
+        "With --array, run this many runs at the same time per array task. "
+        "The tasks and nodes requested per array task are scaled accordingly."
+    ),
+)
 @click.option("--limit", type=int, help=("Limits total number of jobs to submit."))
 @click.option(
     "--max_array_size",
@@ -161,6 +206,15 @@ def cli_submit(**kwargs):
 @cli.command("status")
 @click.option("--detailed", is_flag=True, help="Detailed info on progress")
 @click.option("--progress", is_flag=True, help="Fancy progress bar")
+@click.option(
+    "--backend",
+    type=click.Choice(["auto", "slurm", "files"]),
+    default="auto",
+    help=(
+        "Query job status from slurm or from the status files (default = auto). "
+        "With slurm, jobs waiting in the queue are counted as submitted."
+    ),
+)
 @click.option(
     "-p",
     "--pattern",
@@ -178,6 +232,12 @@ def cli_status(**kwargs):
 
 @cli.command("merge")
 @click.option("--force", is_flag=True, help="Overwrite existing data")
+@click.option(
+    "--workers",
+    type=int,
+    default=1,
+    help="Number of worker processes used to read the data (default = 1).",
+)
 @variables_option
 @common_options(*logging_options, yes_option, dry_run_option)
 def cli_merge(**kwargs):
@@ -4,12 +4,15 @@ from pathlib import Path
 
 import click
 
+from .._status_backend import get_status_backend
 from ..config import load_config
 from ..models import Job, Locations
 from ..status import Status, StatusError
 
 
-def status(*, progress: bool, detailed: bool, pattern: str, **kwargs):
+def status(
+    *, progress: bool, detailed: bool, pattern: str, backend: str = "auto", **kwargs
+):
     """Show status of nested runs.
 
     Parameters
@@ -20,6 +23,8 @@ def status(*, progress: bool, detailed: bool, pattern: str, **kwargs):
         Show detailed progress for every job.
     pattern : str
         Show status only for subdirectories matching this glob pattern
+    backend : str
+        How to query the job status, one of `auto`, `slurm`, `files`.
     """
     if pattern is None:
         pattern = "**"
@@ -29,6 +34,7 @@ def status(*, progress: bool, detailed: bool, pattern: str, **kwargs):
     config_files = cwd.glob(f"{pattern}/duqtools.yaml")
 
     all_jobs: list[Job] = list()
+    groups = []
 
     click.echo(Job.status_symbol_help())
     click.echo()
@@ -48,15 +54,23 @@ def status(*, progress: bool, detailed: bool, pattern: str, **kwargs):
         all_jobs.extend(jobs)
 
         dirname = config_file.parent.relative_to(cwd)
-        tag = cfg.tag
-        status = "".join(job.status_symbol for job in jobs)
+        groups.append((dirname, cfg.tag, len(jobs)))
+
+    index_file = Locations(parent_dir=cwd).status_cache
+    tracker = Status(
+        all_jobs, backend=get_status_backend(backend, index_file=index_file)
+    )
+    tracker.update_status()
+
+    i = 0
+    for dirname, tag, n_jobs in groups:
+        status = "".join(s.symbol for s in tracker.statuses[i : i + n_jobs])
+        i += n_jobs
 
         click.echo(f"{dirname} ({tag}): {status}")
 
     click.echo()
 
-    tracker = Status(all_jobs)
-
     if detailed:
         tracker.detailed_status()
     elif progress:
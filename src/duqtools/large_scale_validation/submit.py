@@ -24,11 +24,16 @@ def submit(
     *,
     array: bool,
     array_script: bool,
+    pack: int = 1,
     limit: Optional[int],
     force: bool,
     max_jobs: int,
     schedule: bool,
     max_array_size: int,
+    max_retries: int = 0,
+    submit_retries: int = 3,
+    workers: int = 4,
+    rate: float = 5.0,
     input_file: str,
     pattern: str,
     status_filter: Sequence[str],
@@ -45,10 +50,21 @@ def submit(
     schedule : bool
         Schedule `max_jobs` to run at once, keeps the process alive until
         finished.
+    max_retries : int
+        With `schedule`, resubmit failed jobs up to this many times.
+    submit_retries : int
+        Retry a submission up to this many times when the submit command
+        fails with a transient error.
+    workers : int
+        Number of threads used to submit jobs
+    rate : float
+        Maximum number of submissions per second
     array : bool
         Submit the jobs as a single array
     array_script : bool
         Create script to submit the jobs as a single array
+    pack : int
+        Number of runs to run at the same time in every array task
     max_array_size : int
         Maximum array size for slurm (usually 1001, default = 100)
     limit : Optional[int]
@@ -56,7 +72,7 @@ def submit(
     input_file : str
         Only submit jobs for configs where template_data matches a handle in the data.csv
     pattern : str
-        Find runs.yaml files only in subdirectories matching this glob pattern
+        Find created runs only in subdirectories matching this glob pattern
     status_filter : list[str]
         Only submit jobs with this status.
     """
@@ -69,7 +85,12 @@ def submit(
 
     cwd = Path.cwd()
 
-    dirs = [file.parent for file in cwd.glob(f"{pattern}/runs.yaml")]
+    # Configs for which runs have been created (`runs.yaml` or the registry)
+    dirs = [
+        file.parent
+        for file in cwd.glob(f"{pattern}/duqtools.yaml")
+        if Locations(parent_dir=file.parent).runs_file
+    ]
 
     jobs: list[Job] = list()
 
@@ -108,16 +129,24 @@ def submit(
             break
 
     if schedule:
-        job_scheduler(job_queue, max_jobs=max_jobs)
+        job_scheduler(job_queue, max_jobs=max_jobs, max_retries=max_retries)
     elif array or array_script:
         job_array_submitter(
             job_queue,
             max_jobs=max_jobs,
             max_array_size=max_array_size,
             create_only=array_script,
+            pack=pack,
             cfg=cfg,
         )
     else:
-        job_submitter(job_queue, max_jobs=max_jobs)
+        job_submitter(
+            job_queue,
+            max_jobs=max_jobs,
+            workers=workers,
+            rate=rate,
+            max_retries=submit_retries,
+            report=Locations(parent_dir=cwd).submit_report,
+        )
 
     return job_queue
@@ -1,12 +1,100 @@
 from __future__ import annotations
 
 import itertools
-from typing import Any, Optional
+import math
+from abc import abstractmethod
+from collections.abc import Sequence
+from typing import Any, Optional, Union
 
+import numpy as np
 from scipy.stats import qmc
 
 
-def cartesian_product(*iterables, **kwargs) -> list[Any]:
+class Design(Sequence):
+    """Index-addressable sampling design.
+
+    The i-th sample is computed on access, the samples are not stored.
+
+    Parameters
+    ----------
+    *iterables
+        Iterables to sample from.
+    """
+
+    def __init__(self, *iterables):
+        self.iterables = tuple(tuple(iterable) for iterable in iterables)
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    @abstractmethod
+    def sample_indices(self, i: int) -> Sequence[int]:
+        """Return the index into every iterable for sample `i`."""
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("design index out of range")
+
+        indices = self.sample_indices(i)
+
+        return tuple(iterable[j] for iterable, j in zip(self.iterables, indices))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(n_samples={len(self)})"
+
+
+class CartesianDesign(Design):
+    """Cartesian product of the input iterables.
+
+    The samples are in the same order as `itertools.product`.
+    """
+
+    def __len__(self) -> int:
+        return math.prod(len(iterable) for iterable in self.iterables)
+
+    def __iter__(self):
+        return itertools.product(*self.iterables)
+
+    def sample_indices(self, i: int) -> Sequence[int]:
+        indices = []
+        for iterable in reversed(self.iterables):
+            i, j = divmod(i, len(iterable))
+            indices.append(j)
+        return indices[::-1]
+
+
+class IndexDesign(Design):
+    """Samples given by an array of indices into the input iterables.
+
+    Parameters
+    ----------
+    *iterables
+        Iterables to sample from.
+    indices : np.ndarray
+        Array with shape `(n_samples, len(iterables))`.
+    """
+
+    def __init__(self, *iterables, indices: np.ndarray):
+        super().__init__(*iterables)
+        self.indices = indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def sample_indices(self, i: int) -> Sequence[int]:
+        return self.indices[i]
+
+
+def cartesian_product(
+    *iterables, lazy: bool = False, **kwargs
+) -> Union[list[Any], CartesianDesign]:
     """Return cartesian product of input iterables.
 
     Uses `itertools.product`
@@ -15,32 +103,48 @@ def cartesian_product(*iterables, **kwargs) -> list[Any]:
     ----------
     *iterables
         Input iterables.
+    lazy : bool
+        Return a `CartesianDesign` that computes the samples on access.
 
     Returns
     -------
-    list[Any]
+    list[Any] | CartesianDesign
         List of product of input arguments.
     """
-    return list(itertools.product(*iterables))
+    design = CartesianDesign(*iterables)
+
+    if lazy:
+        return design
 
+    return list(design)
 
-def _sampler(func, *iterables, n_samples: int, **kwargs) -> list[Any]:
+
+def _sampler(
+    func, *iterables, n_samples: int, lazy: bool = False, **kwargs
+) -> Union[list[Any], IndexDesign]:
     """Generic sampler."""
     bounds = tuple(len(iterable) for iterable in iterables)
 
     sampler = func(d=len(iterables), **kwargs)
     indices = sampler.integers(l_bounds=bounds, n=n_samples)
 
-    samples = []
-    for row in indices:
-        samples.append(tuple(arg[col] for col, arg in zip(row, iterables)))
+    # Only the indices are stored
+    dtype = np.min_scalar_type(max(bounds, default=0))
+    design = IndexDesign(*iterables, indices=indices.astype(dtype))
+
+    if lazy:
+        return design
 
-    return samples
+    return list(design)
 
 
 def latin_hypercube(
-    *iterables, n_samples: int, seed: Optional[int] = None, **kwargs
-) -> list[Any]:
+    *iterables,
+    n_samples: int,
+    seed: Optional[int] = None,
+    lazy: bool = False,
+    **kwargs,
+) -> Union[list[Any], IndexDesign]:
     """Sample input iterables using Latin hypercube sampling (LHS).
 
     Uses `scipy.stats.qmc.LatinHyperCube`.
@@ -53,18 +157,26 @@ def latin_hypercube(
         Number of samples to return.
     seed : int, optional
         Seed to use for the randomizer
+    lazy : bool
+        Return an `IndexDesign` that computes the samples on access.
 
     Returns
     -------
-    samples : list[Any]
+    samples : list[Any] | IndexDesign
         List of sampled input arguments.
     """
-    return _sampler(qmc.LatinHypercube, *iterables, n_samples=n_samples, seed=seed)
+    return _sampler(
+        qmc.LatinHypercube, *iterables, n_samples=n_samples, seed=seed, lazy=lazy
+    )
 
 
 def sobol(
-    *iterables, n_samples: int, seed: Optional[int] = None, **kwargs
-) -> list[Any]:
+    *iterables,
+    n_samples: int,
+    seed: Optional[int] = None,
+    lazy: bool = False,
+    **kwargs,
+) -> Union[list[Any], IndexDesign]:
     """Sample input iterables using the Sobol sampling method for generating
     low discrepancy sequences.
 
@@ -80,18 +192,26 @@ def sobol(
         of two.
     seed : int, optional
         Seed to use for the randomizer
+    lazy : bool
+        Return an `IndexDesign` that computes the samples on access.
 
     Returns
     -------
-    samples : list[Any]
+    samples : list[Any] | IndexDesign
         List of sampled input arguments.
     """
-    return _sampler(qmc.Sobol, *iterables, n_samples=n_samples, seed=seed)
+    return _sampler(
+        qmc.Sobol, *iterables, n_samples=n_samples, seed=seed, lazy=lazy
+    )
 
 
 def halton(
-    *iterables, n_samples: int, seed: Optional[int] = None, **kwargs
-) -> list[Any]:
+    *iterables,
+    n_samples: int,
+    seed: Optional[int] = None,
+    lazy: bool = False,
+    **kwargs,
+) -> Union[list[Any], IndexDesign]:
     """Sample input iterables using the Halton sampling method.
 
     Uses `scipy.stats.qmc.Halton`.
@@ -104,13 +224,17 @@ def halton(
         Number of samples to return.
     seed : int, optional
         Seed to use for the randomizer
+    lazy : bool
+        Return an `IndexDesign` that computes the samples on access.
 
     Returns
     -------
-    samples : list[Any]
+    samples : list[Any] | IndexDesign
         List of sampled input arguments.
     """
-    return _sampler(qmc.Halton, *iterables, n_samples=n_samples, seed=seed)
+    return _sampler(
+        qmc.Halton, *iterables, n_samples=n_samples, seed=seed, lazy=lazy
+    )
 
 
 _SAMPLERS = {
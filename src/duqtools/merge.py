@@ -39,6 +39,7 @@ def _merge(
     target: ImasHandle,
     variables: Sequence[IDSVariableModel],
     force: bool = False,
+    workers: int = 1,
 ):
     """Merge mas data.
 
@@ -54,6 +55,8 @@ def _merge(
         These are the IDS variables to be merged.
     force : bool
         Force overwriting existing files.
+    workers : int
+        Number of processes used to read the data.
     """
     for handle in handles:
         logger.debug("Source for merge %s", handle)
@@ -69,7 +72,7 @@ def _merge(
 
     template.copy_data_to(target)
 
-    merge_data(handles, target, variables)
+    merge_data(handles, target, variables, workers=workers)
 
 
 def merge(
@@ -80,6 +83,7 @@ def merge(
     input_files: list[str],
     var_names: list[str],
     force: bool,
+    workers: int = 1,
     **kwargs,
 ):
     """Merge as many data as possible."""
@@ -99,4 +103,5 @@ def merge(
         template=template,
         target=target,
         variables=variables,
+        workers=workers,
     )
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from ._job import Job, JobStatus
 from ._locations import Locations
+from ._registry import RunRegistry
 from ._run import Run, Runs
 
 __all__ = [
@@ -10,4 +11,5 @@ __all__ = [
     "JobStatus",
     "Run",
     "Runs",
+    "RunRegistry",
 ]
@@ -87,7 +87,7 @@ class Job:
         """Return true if the job has been submitted."""
         return (self.path / "duqtools.submit.lock").exists()
 
-    def status(self) -> str:
+    def status(self) -> JobStatus:
         """Return the status of the job."""
         if not self.has_status:
             return JobStatus.NOSTATUS
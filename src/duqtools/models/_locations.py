@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Optional, Sequence
 
 from pydantic_yaml import parse_yaml_raw_as
 
+from ._registry import RunRegistry
 from ._run import Runs
 
 if TYPE_CHECKING:
@@ -44,14 +45,56 @@ class Locations:
         return self.parent_dir / "runs.yaml.old"
 
     @property
-    def runs(self) -> list[Run]:
-        """Get a list of the runs currently created from this config."""
-        runs_yaml = self.runs_yaml
+    def runs_registry(self):
+        """Location of the compact run registry."""
+        return self.parent_dir / "runs_registry.json"
 
-        if not runs_yaml.exists():
-            raise OSError(f"Cannot find {runs_yaml}.")
+    @property
+    def runs_registry_old(self):
+        """Location of runs_registry.json.old."""
+        return self.parent_dir / "runs_registry.json.old"
+
+    @property
+    def status_cache(self):
+        """Location of the job status cache."""
+        return self.parent_dir / ".duqtools_status.json"
+
+    @property
+    def submit_report(self):
+        """Location of the report of the last submission."""
+        return self.parent_dir / "duqtools_submit_report.json"
+
+    @property
+    def runs_file(self) -> Optional[Path]:
+        """Location of the file with the created runs, None if there is none.
+
+        This is the compact run registry or `runs.yaml`. If both exist,
+        the one that was written last is used.
+        """
+        runs_files = [
+            path for path in (self.runs_registry, self.runs_yaml) if path.exists()
+        ]
+
+        if not runs_files:
+            return None
+
+        return max(runs_files, key=lambda path: path.stat().st_mtime_ns)
+
+    @property
+    def runs(self) -> Sequence[Run]:
+        """Get a list of the runs currently created from this config.
+
+        Reads the compact run registry or `runs.yaml`, see `runs_file`.
+        """
+        runs_file = self.runs_file
+
+        if runs_file is None:
+            raise OSError(f"Cannot find {self.runs_yaml}.")
+
+        if runs_file == self.runs_registry:
+            return RunRegistry.read(runs_file)
 
-        with open(runs_yaml) as f:
+        with open(runs_file) as f:
             model = parse_yaml_raw_as(Runs, f)
 
         return model.root
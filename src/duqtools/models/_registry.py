@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+from pydantic import TypeAdapter
+
+from ._run import Run, RunOperation
+
+REGISTRY_VERSION = 1
+
+HANDLE_FIELDS = ("relative_location", "user", "db", "shot", "run")
+
+_operations_adapter = TypeAdapter(list[RunOperation])
+
+
+def _dump_operations(operations: Sequence[Any]) -> list[Any]:
+    return _operations_adapter.dump_python(list(operations), mode="json")
+
+
+def _handles_to_columns(handles: Sequence[Any]) -> dict[str, list[Any]]:
+    """Store data locations as one list per field, `None` if not set."""
+    return {
+        field: [getattr(handle, field) if handle else None for handle in handles]
+        for field in HANDLE_FIELDS
+    }
+
+
+def _handle_from_columns(columns: dict[str, list[Any]], i: int) -> Optional[dict]:
+    if columns["db"][i] is None:
+        return None
+    return {field: columns[field][i] for field in HANDLE_FIELDS}
+
+
+class RunRegistry(Sequence):
+    """Compact registry of the runs created from a config.
+
+    Instead of storing the expanded operations for every run (as in
+    `runs.yaml`), the registry stores the base operations and the values of
+    every dimension once. For every run, only an index into each dimension
+    is stored. The run models are expanded when they are accessed.
+
+    Parameters
+    ----------
+    base_operations : Sequence[Any]
+        Operations applied to every run.
+    dimensions : Sequence[Sequence[Any]]
+        Operations for every dimension.
+    indices : np.ndarray
+        Index into every dimension for every run, shape `(n_runs, n_dims)`.
+    columns : dict[str, Any]
+        Run names, directories and data locations, one list per field.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_operations: Sequence[Any],
+        dimensions: Sequence[Sequence[Any]],
+        indices: np.ndarray,
+        columns: dict[str, Any],
+    ):
+        self.base_operations = list(base_operations)
+        self.dimensions = [list(dimension) for dimension in dimensions]
+        self.indices = indices
+        self.columns = columns
+
+    @classmethod
+    def from_runs(
+        cls,
+        runs: Sequence[Run],
+        *,
+        base_operations: Sequence[Any],
+        dimensions: Sequence[Sequence[Any]],
+        indices: Sequence[Sequence[int]],
+    ) -> RunRegistry:
+        """Create registry from run models and the indices of their samples.
+
+        Parameters
+        ----------
+        runs : Sequence[Run]
+            Run models, the operations are not used.
+        base_operations : Sequence[Any]
+            Operations applied to every run.
+        dimensions : Sequence[Sequence[Any]]
+            Operations for every dimension.
+        indices : Sequence[Sequence[int]]
+            Index into every dimension for every run.
+
+        Returns
+        -------
+        RunRegistry
+        """
+        bounds = [len(dimension) for dimension in dimensions]
+        dtype = np.min_scalar_type(max(bounds, default=0))
+        indices = np.asarray(indices, dtype=dtype).reshape(len(runs), len(bounds))
+
+        columns = {
+            "shortname": [str(run.shortname) for run in runs],
+            "dirname": [str(run.dirname) for run in runs],
+            "data_in": _handles_to_columns([run.data_in for run in runs]),
+            "data_out": _handles_to_columns([run.data_out for run in runs]),
+        }
+
+        return cls(
+            base_operations=base_operations,
+            dimensions=dimensions,
+            indices=indices,
+            columns=columns,
+        )
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+
+        columns = self.columns
+        sampled = (
+            dimension[j] for dimension, j in zip(self.dimensions, self.indices[i])
+        )
+
+        return Run(
+            dirname=Path(columns["dirname"][i]),
+            shortname=Path(columns["shortname"][i]),
+            data_in=_handle_from_columns(columns["data_in"], i),
+            data_out=_handle_from_columns(columns["data_out"], i),
+            operations=[*self.base_operations, *sampled],
+        )
+
+    def write(self, path: Path):
+        """Write registry to json file."""
+        data = {
+            "version": REGISTRY_VERSION,
+            "base_operations": _dump_operations(self.base_operations),
+            "dimensions": [
+                _dump_operations(dimension) for dimension in self.dimensions
+            ],
+            # One column per dimension
+            "indices": self.indices.T.tolist(),
+            "runs": self.columns,
+        }
+
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+    @classmethod
+    def read(cls, path: Path) -> RunRegistry:
+        """Read registry from json file."""
+        with open(path) as f:
+            data = json.load(f)
+
+        if data.get("version") != REGISTRY_VERSION:
+            raise ValueError(f"Unsupported run registry version in {path}.")
+
+        dimensions = [
+            _operations_adapter.validate_python(dimension)
+            for dimension in data["dimensions"]
+        ]
+        columns = data["runs"]
+
+        bounds = [len(dimension) for dimension in dimensions]
+        dtype = np.min_scalar_type(max(bounds, default=0))
+        indices = np.asarray(data["indices"], dtype=dtype).T.reshape(
+            len(columns["dirname"]), len(dimensions)
+        )
+
+        return cls(
+            base_operations=_operations_adapter.validate_python(
+                data["base_operations"]
+            ),
+            dimensions=dimensions,
+            indices=indices,
+            columns=columns,
+        )
@@ -11,19 +11,17 @@ from ..ids import ImasHandle
 from ..ids._schema import ImasBaseModel
 from ..schema import BaseModel, IDSOperation, RootModel
 
+RunOperation = Union[
+    IDSOperation, JettoOperation, list[Union[IDSOperation, JettoOperation]]
+]
+
 
 class Run(BaseModel):
     dirname: Path = Field(description="Directory of run")
     shortname: Optional[Path] = Field(None, description="Short name (`dirname.name`)")
     data_in: Optional[ImasBaseModel] = Field(None)
     data_out: Optional[ImasBaseModel] = Field(None)
-    operations: Optional[
-        list[
-            Union[
-                IDSOperation, JettoOperation, list[Union[IDSOperation, JettoOperation]]
-            ]
-        ]
-    ] = Field(None)
+    operations: Optional[list[RunOperation]] = Field(None)
 
     @model_validator(mode="before")
     def shortname_compat(cls, root):
@@ -2,13 +2,19 @@ from __future__ import annotations
 
 import atexit
 import logging
+import numbers
+import string
+import threading
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from functools import wraps
 from inspect import signature
+from pathlib import PurePath
 from typing import Any, Callable, Optional, Sequence
 
 import click
-from pydantic import Field, field_validator
+from pydantic import Field
 
 from ._logging_utils import duqlog_screen
 from .schema import BaseModel
@@ -61,31 +67,105 @@ class Warning(LongDescription):
         return hash(self) == hash(other)
 
 
-class Operation(LongDescription):
+class Operation:
     """Operation, simple class which has a callable action.
 
     Usually not called directly but used through Operations.
-    """
 
-    quiet: bool = Field(False, description="print out this operation to the screen")
+    The descriptions may be format strings, these are formatted with
+    `format_kwargs` when they are first needed. The values in
+    `format_kwargs` must not change after the operation is created.
+
+    Parameters
+    ----------
+    description : str
+        Description of the operation to be done.
+    extra_description : Optional[str]
+        Extra description.
+    action : Optional[Callable]
+        A function which can be executed when we decide to apply this
+        operation, no-op if None.
+    args : Optional[Sequence]
+        Positional arguments that have to be passed to the action.
+    kwargs : Optional[dict]
+        Keyword arguments that will be passed to the action.
+    quiet : bool
+        Do not print out this operation to the screen.
+    style : Optional[dict[str, Any]]
+        Styling for op description.
+    group : Optional[str]
+        Operations in the same group are applied in order, different
+        groups may be applied concurrently.
+    format_kwargs : Optional[dict]
+        If given, format the descriptions with these values.
+    """
 
-    action: Optional[Callable] = Field(
-        None,
-        description="a function which can be executed when we "
-        "decide to apply this operation",
+    __slots__ = (
+        "action",
+        "args",
+        "kwargs",
+        "quiet",
+        "style",
+        "group",
+        "_description",
+        "_extra_description",
+        "_format_kwargs",
     )
 
-    args: Optional[Sequence] = Field(
-        None,
-        validate_default=True,
-        description="positional arguments that have to be " "passed to the action",
-    )
+    def __init__(
+        self,
+        *,
+        description: str,
+        extra_description: Optional[str] = None,
+        action: Optional[Callable] = None,
+        args: Optional[Sequence] = None,
+        kwargs: Optional[dict] = None,
+        quiet: bool = False,
+        style: Optional[dict[str, Any]] = None,
+        group: Optional[str] = None,
+        format_kwargs: Optional[dict] = None,
+    ):
+        self.action = action
+        self.args = () if args is None else args
+        self.kwargs = {} if kwargs is None else kwargs
+        self.quiet = quiet
+        self.style = OP_STYLE if style is None else style
+        self.group = group
+        self._description = description
+        self._extra_description = extra_description
+        self._format_kwargs = format_kwargs
+
+    def _format(self):
+        fkwargs = self._format_kwargs
+        self._format_kwargs = None
+
+        self._description = self._description.format(**fkwargs)
+        if self._extra_description:
+            self._extra_description = self._extra_description.format(**fkwargs)
 
-    kwargs: Optional[dict] = Field(
-        None,
-        validate_default=True,
-        description="keyword arguments that will be " "passed to the action",
-    )
+    @property
+    def description(self) -> str:
+        if self._format_kwargs is not None:
+            self._format()
+        return self._description
+
+    @property
+    def extra_description(self) -> Optional[str]:
+        if self._format_kwargs is not None:
+            self._format()
+        return self._extra_description
+
+    @property
+    def long_description(self) -> str:
+        description = style(self.description, **self.style)
+
+        if self.extra_description:
+            description = f"{description} : {self.extra_description}"
+
+        return description
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.description!r})"
 
     def __call__(self) -> Operation:
         """Execute the action with the args and kwargs.
@@ -96,22 +176,11 @@ class Operation(LongDescription):
             The operation that was executed
         """
         if self.action:
-            logger.debug(self.long_description)
-            self.action(*self.args, **self.kwargs)  # type: ignore
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(self.long_description)
+            self.action(*self.args, **self.kwargs)
         return self
 
-    @field_validator("args")
-    def validate_args(cls, v):
-        if v is None:
-            v = ()
-        return v
-
-    @field_validator("kwargs")
-    def validate_kwargs(cls, v):
-        if v is None:
-            v = dict()
-        return v
-
 
 class Operations(deque):
     """Operations Queue which keeps track of all the operations that need to be
@@ -128,7 +197,9 @@ class Operations(deque):
     yes = False  # Apply operations without prompt
     enabled = False  # Actually do something
     dry_run = False  # Never apply any operations (do not even ask)
+    workers = 1  # Number of threads to apply independent groups
     warnings: set[Warning] = set()
+    _group: Optional[str] = None
 
     def __new__(cls, *args, **kwargs):
         # Make it a singleton
@@ -151,8 +222,31 @@ class Operations(deque):
         description="Function that prints hello world")
         ```
         """
+        kwargs.setdefault("group", self._group)
         self.append(Operation(**kwargs))
 
+    @contextmanager
+    def group(self, name: str):
+        """Put all operations added within this context in group `name`.
+
+        Operations in a group are applied in order. With `workers > 1`,
+        consecutive groups are applied concurrently. Operations without a
+        group act as a barrier: they are applied after all operations
+        before them have finished. Actions that are not thread-safe must
+        hold a lock (see `duqtools.ids._imas.IMAS_LOCK`).
+
+        ```python
+        for run in runs:
+            with op_queue.group(run.name):
+                create_run(run)
+        ```
+        """
+        previous, self._group = self._group, name
+        try:
+            yield
+        finally:
+            self._group = previous
+
     def add_no_op(self, description: str, extra_description: str | None = None):
         """Adds a line to specify an action will not be undertaken."""
         self.add(
@@ -183,7 +277,7 @@ class Operations(deque):
     def append(self, item: Operation):  # type: ignore
         """Restrict our diet to Operation objects only."""
         if self.enabled:
-            logger.debug(f"Appended {item.description} to the operations queue")
+            logger.debug("Appended %r to the operations queue", item)
             super().append(item)
         else:
             loginfo("- " + item.long_description)
@@ -197,10 +291,47 @@ class Operations(deque):
 
     def _apply_all(self, callback: Optional[Callable] = None) -> None:
         """Pop and apply all operations in the queue."""
-        while self:
-            op = self.apply()
-            if callback:
-                callback(op)
+        if self.workers <= 1:
+            while self:
+                op = self.apply()
+                if callback:
+                    callback(op)
+            return
+
+        # IMAS access stays serialized by `IMAS_LOCK` in the threads
+        lock = threading.Lock()
+
+        def apply_group(ops: list[Operation]):
+            for op in ops:
+                op()
+                if callback:
+                    with lock:
+                        callback(op)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while self:
+                if self[0].group is None:
+                    op = self.apply()
+                    if callback:
+                        callback(op)
+                    continue
+
+                groups: dict[str, list[Operation]] = {}
+                while self and self[0].group is not None:
+                    op = self.popleft()
+                    groups.setdefault(op.group, []).append(op)  # type: ignore
+
+                futures = [
+                    executor.submit(apply_group, ops) for ops in groups.values()
+                ]
+
+                try:
+                    for future in futures:
+                        future.result()
+                except Exception:
+                    for future in futures:
+                        future.cancel()
+                    raise
 
     def apply_all(self) -> None:
         """Apply all queued operations and empty the queue.
@@ -316,6 +447,71 @@ def confirm_operations(func):
     return wrapper
 
 
+# Values of these types cannot change, so they can be formatted later
+IMMUTABLE_TYPES = (str, numbers.Number, PurePath, type(None))
+
+_formatter = string.Formatter()
+
+
+class _Formatted(str):
+    """Value that was already formatted with its format spec."""
+
+    def __format__(self, spec: str) -> str:
+        return str(self)
+
+
+def _compile_descriptions(
+    *descriptions: Optional[str],
+) -> tuple[list[Optional[str]], list[tuple[str, Optional[str], str]]]:
+    """Replace the fields in the descriptions by `{f<i>}`.
+
+    Returns the new descriptions and the name, conversion and format
+    spec of every field.
+    """
+    compiled: list[Optional[str]] = []
+    fields: list[tuple[str, Optional[str], str]] = []
+
+    for description in descriptions:
+        if description is None:
+            compiled.append(None)
+            continue
+
+        parts = []
+        for literal, name, spec, conversion in _formatter.parse(description):
+            parts.append(literal.replace("{", "{{").replace("}", "}}"))
+            if name is not None:
+                parts.append(f"{{f{len(fields)}:{spec}}}")
+                fields.append((name, conversion, spec or ""))
+
+        compiled.append("".join(parts))
+
+    return compiled, fields
+
+
+def _snapshot_fields(
+    fields: Sequence[tuple[str, Optional[str], str]], kwargs: dict[str, Any]
+) -> dict[str, Any]:
+    """Look up the values of the fields in `kwargs`.
+
+    Values that may change later are formatted immediately, so that
+    the description shows the state at the time the operation was queued.
+    Invalid fields raise here, instead of when the description is shown.
+    """
+    values = {}
+
+    for i, (name, conversion, spec) in enumerate(fields):
+        value, _ = _formatter.get_field(name, (), kwargs)
+
+        if conversion:
+            value = _formatter.convert_field(value, conversion)
+        elif not isinstance(value, IMMUTABLE_TYPES):
+            value = _Formatted(format(value, spec))
+
+        values[f"f{i}"] = value
+
+    return values
+
+
 def add_to_op_queue(op_desc: str, extra_desc: str | None = None, quiet=False):
     """Decorator which adds the function call to the op_queue, instead of
     executing it directly, the string can be a format string and use the
@@ -335,26 +531,29 @@ def add_to_op_queue(op_desc: str, extra_desc: str | None = None, quiet=False):
     ```
     """
 
+    (description, extra_description), fields = _compile_descriptions(
+        op_desc, extra_desc
+    )
+
     def op_queue_real(func):
+        # For the description format we must convert args to kwargs
+        parameters = tuple(signature(func).parameters)
+
+        @wraps(func)
         def wrapper(*args, **kwargs) -> None:
-            # For the description format we must convert args to kwargs
-            sig = signature(func)
-            args_to_kw = dict(zip(sig.parameters, args))
             fkwargs = kwargs.copy()
-            fkwargs.update(args_to_kw)
-            extra_formatted = None
-            if extra_desc:
-                extra_formatted = extra_desc.format(**fkwargs)
-            op_formatted = op_desc.format(**fkwargs)
+            fkwargs.update(zip(parameters, args))
 
-            # add the function to the queue
+            # add the function to the queue, immutable values in the
+            # descriptions are formatted lazily
             op_queue.add(
                 action=func,
                 args=args,
                 kwargs=kwargs,
-                description=op_formatted,
-                extra_description=extra_formatted,
+                description=description,
+                extra_description=extra_description,
                 quiet=quiet,
+                format_kwargs=_snapshot_fields(fields, fkwargs),
             )
 
         return wrapper
@@ -4,18 +4,19 @@ import logging
 from pathlib import Path
 
 import click
-import xarray as xr
 
 from ._plot_utils import alt_line_chart
 from .config import var_lookup
-from .ids import ImasHandle, rebase_all_coords
+from .ids import ImasHandle, load_datasets
 from .utils import read_imas_handles_from_file
 
 logger = logging.getLogger(__name__)
 info, debug = logger.info, logger.debug
 
 
-def plot(*, var_names, handles, input_files, extensions, errorbars, **kwargs):
+def plot(
+    *, var_names, handles, input_files, extensions, errorbars, lazy=False, **kwargs
+):
     handle_lst = []
 
     for n, imas_str in enumerate(handles):
@@ -42,13 +43,7 @@ def plot(*, var_names, handles, input_files, extensions, errorbars, **kwargs):
         if errorbars:
             variables.append(var_lookup.error_upper(data_var))
 
-        datasets = []
-        for handle in handles.values():
-            ds = handle.get_variables(variables=variables)
-            datasets.append(ds)
-
-        datasets = rebase_all_coords(datasets, datasets[0])
-        dataset = xr.concat(datasets, "run")
+        dataset = load_datasets(handles, variables=variables, lazy=lazy)
 
         chart = alt_line_chart(
             dataset, x=grid_var_norm, y=data_var, z=time_var, std=errorbars
@@ -1,16 +1,17 @@
 from __future__ import annotations
 
+import hashlib
 import logging
-import subprocess as sp
+import os
+import re
 from collections import Counter
+from pathlib import Path
 from time import sleep
-from typing import Sequence
-
-from jetto_tools import config, template
+from typing import NamedTuple, Optional, Sequence
 
+from ._status_backend import StatusBackend, get_status_backend
 from .config import Config
 from .models import Job, JobStatus, Locations
-from .systems.jetto._system import jetto_lookup
 
 logger = logging.getLogger(__name__)
 info, debug = logger.info, logger.debug
@@ -32,18 +33,26 @@ class Status:
     jobs_running: int
     jobs_unknown: int
 
-    def __init__(self, jobs=Sequence[Job]):
+    def __init__(self, jobs=Sequence[Job], backend: Optional[StatusBackend] = None):
         self.jobs = jobs
+        self.backend = backend or get_status_backend()
+        self.n_submit_script: Optional[int] = None
 
         debug("Case directories: %s", self.jobs)
 
         debug("Total number of jobs: %i", len(self.jobs))
 
     def update_status(self):
-        self.n_submit_script = sum(job.has_submit_script for job in self.jobs)
+        # Submit scripts are not removed, only count them once
+        if self.n_submit_script is None:
+            self.n_submit_script = sum(job.has_submit_script for job in self.jobs)
+
+        self.statuses = self.backend.query(self.jobs)
+
+        # Jobs that slurm reports as queued have a status, but no status file
         self.n_status = sum(job.has_status for job in self.jobs)
 
-        counter = Counter(job.status() for job in self.jobs)
+        counter = Counter(self.statuses)
 
         self.n_submitted = counter[JobStatus.SUBMITTED]
         self.n_completed = counter[JobStatus.COMPLETED]
@@ -102,11 +111,160 @@ class Status:
             monitors.append(monitor)
 
         while not all([monitor.finished for monitor in monitors]):
-            for monitor in monitors:
-                monitor.update()
+            statuses = self.backend.query(self.jobs)
+            for monitor, status in zip(monitors, statuses):
+                monitor.update(status)
             sleep(5)
 
 
+def _parse_steptime(line: bytes) -> Optional[float]:
+    """Parse time from `STEP` line, i.e. `  STEP=  10  TIME=  4.5E+01 ...`."""
+    if not line.lstrip().startswith(b"STEP"):
+        return None
+    try:
+        return float(line.split(b"=")[2].split()[0])
+    except (IndexError, ValueError):
+        return None
+
+
+class StepTimeReader:
+    """Incrementally read the time of the last `STEP` line in a file.
+
+    Only data appended since the previous read are parsed. The first read
+    scans the file backwards from the end. If the file is replaced or
+    truncated, it is read again from the start.
+
+    Parameters
+    ----------
+    path : Path
+        File to read, i.e. `jetto.out`.
+    """
+
+    chunk_size = 2**16
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.time: Optional[float] = None
+        self._inode: Optional[int] = None
+        self._offset = 0
+        self._remainder = b""
+
+    def _scan_backwards(self, f, end: int) -> Optional[float]:
+        pos = end
+        partial = b""
+
+        while pos > 0:
+            n = min(self.chunk_size, pos)
+            pos -= n
+            f.seek(pos)
+            lines = (f.read(n) + partial).split(b"\n")
+
+            # The first line is incomplete unless we are at the start
+            partial = lines.pop(0) if pos > 0 else b""
+
+            for line in reversed(lines):
+                if (time := _parse_steptime(line)) is not None:
+                    return time
+
+        return None
+
+    def read(self) -> Optional[float]:
+        """Return time of the last `STEP` line, None if there is none."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return self.time
+
+        rotated = stat.st_ino != self._inode or stat.st_size < self._offset
+
+        with open(self.path, "rb") as f:
+            if rotated:
+                self._inode = stat.st_ino
+                self._remainder = b""
+                self._offset = stat.st_size
+                self.time = self._scan_backwards(f, stat.st_size)
+                return self.time
+
+            if stat.st_size == self._offset:
+                return self.time
+
+            f.seek(self._offset)
+            data = f.read(stat.st_size - self._offset)
+
+        self._offset += len(data)
+
+        lines = (self._remainder + data).split(b"\n")
+        self._remainder = lines.pop()
+
+        for line in reversed(lines):
+            if (time := _parse_steptime(line)) is not None:
+                self.time = time
+                break
+
+        return self.time
+
+
+class RunSettings(NamedTuple):
+    """Settings of a jetto run needed to monitor its progress."""
+
+    kwmain: Optional[int]
+    start_time: float
+    end_time: float
+
+
+JSET_TIME_SETTING = re.compile(
+    rb"^SetUpPanel\.(startTime|endTime)\s*:\s*(\S+)\s*$", re.MULTILINE
+)
+NLIST2_BLOCK = re.compile(rb"&NLIST2\b(.*?)^\s*(?:&END|/)", re.MULTILINE | re.DOTALL)
+KWMAIN_FIELD = re.compile(rb"\bKWMAIN\s*=\s*([-+]?\d+)", re.IGNORECASE)
+
+
+# Parsed run settings, keyed by the hash of the input files
+_run_settings_cache: dict[str, RunSettings] = {}
+
+
+def _parse_run_settings(jset: bytes, namelist: bytes) -> RunSettings:
+    times = {key: float(value) for key, value in JSET_TIME_SETTING.findall(jset)}
+
+    kwmain = None
+    if block := NLIST2_BLOCK.search(namelist):
+        if match := KWMAIN_FIELD.search(block.group(1)):
+            kwmain = int(match.group(1))
+
+    return RunSettings(
+        kwmain=kwmain,
+        start_time=times[b"startTime"],
+        end_time=times[b"endTime"],
+    )
+
+
+def read_run_settings(run_dir: Path) -> RunSettings:
+    """Read `kwmain`, start and end time from `jetto.jset` and `jetto.in`.
+
+    Only these settings are extracted, instead of loading the complete
+    template. Results are cached by the hash of the file contents, so that
+    runs with the same input files are parsed only once.
+
+    Parameters
+    ----------
+    run_dir : Path
+        Jetto run directory.
+
+    Returns
+    -------
+    RunSettings
+    """
+    jset = (run_dir / "jetto.jset").read_bytes()
+    namelist = (run_dir / "jetto.in").read_bytes()
+
+    digest = hashlib.blake2b(jset + b"\0" + namelist).hexdigest()
+
+    if digest not in _run_settings_cache:
+        _run_settings_cache[digest] = _parse_run_settings(jset, namelist)
+
+    return _run_settings_cache[digest]
+
+
 class Monitor:
     """Convenience class to keep track of submissions and update progress
     bars."""
@@ -115,27 +273,26 @@ class Monitor:
         self.pbar = pbar
         self.job = job
         self.outfile = None
+        self.step_reader = StepTimeReader(job.out_file)
 
-        jetto_template = template.from_directory(job.path)
-        jetto_template.lookup.update(jetto_lookup)
-        jetto_config = config.RunConfig(jetto_template)
+        settings = read_run_settings(job.path)
 
-        self.check_kwmain_flag(jetto_config)
+        self.check_kwmain_flag(settings)
 
         infile = job.in_file
         if not infile.exists():
             debug("%s does not exist, but the job is running", infile)
             return
 
-        self.start = jetto_config.start_time
-        self.end = jetto_config.end_time
+        self.start = settings.start_time
+        self.end = settings.end_time
         self.time = self.start
 
         self.finished = False
 
         self.set_status()
 
-    def check_kwmain_flag(self, jetto_config):
+    def check_kwmain_flag(self, settings: RunSettings):
         """Check for NLIST2/KWMAIN in jetto.jset. If this flag is not set, the
         output in `job.out_file` does not contain the output that is grepped
         for the progress.
@@ -147,31 +304,26 @@ class Monitor:
             "Cannot show detailed status, `nlist2.KWMAIN` flag"
             " is not set to 1 in `{self.job.status_file}`"
         )
-        if jetto_config["kwmain"] != 1:
+        if settings.kwmain != 1:
             raise StatusError(msg)
 
-    def set_status(self):
-        status = self.job.status()
+    def set_status(self, status: Optional[JobStatus] = None):
+        if status is None:
+            status = self.job.status()
 
         self.pbar.set_description(f"{self.job.path.name:8s}, {status:12s}")
         self.pbar.refresh()
 
         return status
 
-    def get_steptime(self):
-        if not self.job.out_file.exists():
-            debug(f"{self.job.out_file} does not exists, but the job is running")
-            return None
-
-        of = self.job.out_file
-        cmd = f"tac {of} | grep -m 1 ^\\s*STEP"
-        ret = sp.run(cmd, shell=True, capture_output=True)
-        if len(ret.stdout) > 0:
-            return float(ret.stdout.split("=")[2].lstrip(" ").split(" ")[0])
-        return None
+    def get_steptime(self) -> Optional[float]:
+        steptime = self.step_reader.read()
+        if steptime is None:
+            debug(f"No time step in {self.job.out_file}, but the job is running")
+        return steptime
 
-    def update(self):
-        status = self.set_status()
+    def update(self, status: Optional[JobStatus] = None):
+        status = self.set_status(status)
         if status in (JobStatus.COMPLETED, JobStatus.FAILED):
             self.pbar.n = 100 if status == JobStatus.COMPLETED else 0
             self.pbar.refresh()
@@ -188,7 +340,14 @@ class Monitor:
         self.pbar.refresh()
 
 
-def status(*, cfg: Config, progress: bool = False, detailed: bool = False, **kwargs):
+def status(
+    *,
+    cfg: Config,
+    progress: bool = False,
+    detailed: bool = False,
+    backend: str = "auto",
+    **kwargs,
+):
     """Show status of runs.
 
     Parameters
@@ -197,13 +356,18 @@ def status(*, cfg: Config, progress: bool = False, detailed: bool = False, **kwa
         Show progress bar.
     detailed : bool
         Show detailed progress for every job.
+    backend : str
+        How to query the job status, one of `auto`, `slurm`, `files`.
     """
     debug("Submit config: %s", cfg.system)
 
-    runs = Locations(cfg=cfg).runs
-    jobs = [Job(run.dirname, cfg=cfg) for run in runs]
+    locations = Locations(cfg=cfg)
+    jobs = [Job(run.dirname, cfg=cfg) for run in locations.runs]
 
-    tracker = Status(jobs)
+    tracker = Status(
+        jobs,
+        backend=get_status_backend(backend, index_file=locations.status_cache),
+    )
 
     if detailed:
         tracker.detailed_status()
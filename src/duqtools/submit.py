@@ -1,17 +1,27 @@
 from __future__ import annotations
 
+import asyncio
+import heapq
+import json
 import logging
+import subprocess as sp
+import threading
 import time
 from collections import deque
-from itertools import cycle
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import count, cycle
 from pathlib import Path
-from typing import Deque, Optional, Sequence
+from typing import Any, Callable, Deque, Optional, Sequence
+
+import click
 
 from ._logging_utils import duqlog_screen
 from .config import Config
 from .create import CreateError
-from .models import Job, Locations
+from .models import Job, JobStatus, Locations
 from .operations import add_to_op_queue, op_queue
+from .schema import BaseModel
 from .systems import get_system
 
 logger = logging.getLogger(__name__)
@@ -27,60 +37,346 @@ def Spinner(frames="⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"):
     yield from cycle(frames)
 
 
-@add_to_op_queue("Submitting", "{job}")
-def _submit_job(job: Job, *, delay: float = 0):
-    """
+class TokenBucket:
+    """Thread-safe token bucket rate limiter.
+
     Parameters
     ----------
-    delay : float
-        Add a delay to avoid all jobs starting at the same time.
-        This causes issues with slurm, for example.
+    rate : float
+        Number of tokens added per second.
+    burst : int
+        Maximum number of tokens in the bucket.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token from the bucket, wait until one is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._last) * self.rate
+                )
+                self._last = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+# Messages from `sbatch` for errors that go away by trying again later
+TRANSIENT_ERRORS = (
+    "socket timed out",
+    "unable to contact slurm controller",
+    "connection refused",
+    "resource temporarily unavailable",
+    "temporarily unable to accept job",
+    "try again",
+)
+
+
+def _is_transient(err: sp.CalledProcessError | sp.TimeoutExpired) -> bool:
+    """Return True if the submit command failed because the scheduler was
+    busy or could not be reached, i.e. a retry may succeed."""
+    if isinstance(err, sp.TimeoutExpired):
+        return True
+
+    stderr = err.stderr or b""
+    if isinstance(stderr, bytes):
+        stderr = stderr.decode(errors="replace")
+
+    return any(msg in stderr.lower() for msg in TRANSIENT_ERRORS)
+
+
+class SubmitResult(BaseModel):
+    """Outcome of submitting a single job."""
+
+    job: str
+    submitted: bool
+    attempts: int
+    duration: float
+    error: Optional[str] = None
+
+
+def _submit_job(
+    job: Job,
+    *,
+    bucket: TokenBucket,
+    max_retries: int,
+    backoff: float,
+) -> SubmitResult:
+    """Submit job, retry with exponential backoff on transient errors.
+
+    Only transient errors from the submit command (i.e. `sbatch` timing
+    out or refusing connections, see `TRANSIENT_ERRORS`) are retried.
+    Other errors, such as an invalid batch script, are not.
     """
-    if delay:
-        time.sleep(delay)
-    job.submit()
+    start = time.monotonic()
+    attempt = 0
 
+    while True:
+        attempt += 1
+        bucket.acquire()
 
-def job_submitter(jobs: Sequence[Job], *, max_jobs: int, **kwargs):
-    for n, job in enumerate(jobs):
-        if max_jobs and (n >= max_jobs):
-            info(f"Max jobs ({max_jobs}) reached.")
+        try:
+            job.submit()
+        except (sp.CalledProcessError, sp.TimeoutExpired) as err:
+            if attempt > max_retries or not _is_transient(err):
+                error = f"{err} {getattr(err, 'stderr', None) or ''}".strip()
+                break
+            delay = backoff * 2 ** (attempt - 1)
+            debug("Submitting %s failed (%s), retry in %.1f s", job, err, delay)
+            time.sleep(delay)
+        except Exception as err:
+            error = str(err)
             break
+        else:
+            return SubmitResult(
+                job=str(job.path),
+                submitted=True,
+                attempts=attempt,
+                duration=time.monotonic() - start,
+            )
 
-        _submit_job(job, delay=0.1)
+    return SubmitResult(
+        job=str(job.path),
+        submitted=False,
+        attempts=attempt,
+        duration=time.monotonic() - start,
+        error=error,
+    )
 
 
-@add_to_op_queue("Start job scheduler")
-def job_scheduler(queue: Deque[Job], *, max_jobs: int = 10, **kwargs):
-    interval = 1.0
+@add_to_op_queue("Submitting jobs", "({workers} workers, max {rate} jobs/s)")
+def _submit_jobs(
+    jobs: Sequence[Job],
+    *,
+    workers: int,
+    rate: float,
+    max_retries: int,
+    backoff: float,
+    report: Optional[Path],
+) -> list[SubmitResult]:
+    bucket = TokenBucket(rate=rate, burst=workers)
+    submit = partial(
+        _submit_job, bucket=bucket, max_retries=max_retries, backoff=backoff
+    )
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(submit, jobs))
+
+    failed = [result for result in results if not result.submitted]
+
+    info("Submitted %d of %d jobs", len(results) - len(failed), len(results))
+
+    for result in failed:
+        logger.error("Failed to submit %s: %s", result.job, result.error)
+
+    if report:
+        with open(report, "w") as f:
+            json.dump([result.model_dump() for result in results], f, indent=2)
+        info("Submission report written to %s", report)
+
+    return results
+
 
+def job_submitter(
+    jobs: Sequence[Job],
+    *,
+    max_jobs: int,
+    workers: int = 4,
+    rate: float = 5.0,
+    max_retries: int = 3,
+    backoff: float = 1.0,
+    report: Optional[Path] = None,
+    **kwargs,
+):
+    """Submit jobs concurrently.
+
+    Submissions are spread over a thread pool, the total rate is limited
+    by a token bucket so that the scheduler is not overloaded.
+
+    Parameters
+    ----------
+    jobs : Sequence[Job]
+        Jobs to submit.
+    max_jobs : int
+        Maximum number of jobs to submit.
+    workers : int
+        Number of threads used to submit jobs.
+    rate : float
+        Maximum number of submissions per second.
+    max_retries : int
+        Number of retries when the submit command fails with a transient
+        error (default = 3).
+    backoff : float
+        Delay in seconds before the first retry, doubles with every retry.
+    report : Optional[Path]
+        Write the result for every job to this json file.
+    """
+    if max_jobs and len(jobs) > max_jobs:
+        info(f"Max jobs ({max_jobs}) reached.")
+        jobs = list(jobs)[:max_jobs]
+
+    # Listed only, the jobs are submitted by a single operation
+    for job in jobs:
+        op_queue.add(action=None, description="Submitting", extra_description=f"{job}")
+
+    if not jobs:
+        return
+
+    _submit_jobs(
+        jobs,
+        workers=workers,
+        rate=rate,
+        max_retries=max_retries,
+        backoff=backoff,
+        report=report,
+    )
+
+
+async def _run_job(job: Job, *, interval: float, stagger: float) -> str:
+    """Submit job and wait until it is done.
+
+    Returns
+    -------
+    str
+        Final status of the job.
+    """
+    # starting jobs at the same time causes issues
+    await asyncio.sleep(stagger)
+
+    click.echo(f"Submitting {job}\033[K")
+    await asyncio.to_thread(job.submit)
+
+    while True:
+        status = await asyncio.to_thread(job.status)
+        if status not in (JobStatus.RUNNING, JobStatus.NOSTATUS):
+            return status
+        await asyncio.sleep(interval)
+
+
+async def _job_scheduler(
+    queue: Deque[Job],
+    *,
+    max_jobs: int,
+    max_retries: int,
+    priority: Optional[Callable[[Job], Any]],
+    interval: float,
+):
     s = Spinner()
 
-    tasks: Deque[Job] = deque()
-    completed: Deque[Job] = deque()
+    # Entries are (priority, sequence number, attempt, job)
+    pending: list[tuple[Any, int, int, Job]] = []
+    counter = count()
 
-    while tasks or queue:
-        while queue and len(tasks) < max_jobs:
-            job = queue.popleft()
-            task = job.start()
-            tasks.append(task)
-            # starting jobs at the same time causes issues
-            time.sleep(0.1)
+    for job in queue:
+        key = priority(job) if priority else 0
+        heapq.heappush(pending, (key, next(counter), 0, job))
 
-        time.sleep(interval)
-        task = tasks.popleft()
-        try:
-            next(task)  # Run to the next yield
-            tasks.append(task)  # Reschedule
-        except StopIteration:
-            completed.append(task)
+    queue.clear()
+
+    running: dict[asyncio.Task, tuple[Any, int, Job]] = {}
+    completed: list[Job] = []
+    failed: list[Job] = []
+
+    while pending or running:
+        n_new = 0
+
+        while pending and len(running) < max_jobs:
+            key, _, attempt, job = heapq.heappop(pending)
+            task = asyncio.create_task(
+                _run_job(job, interval=interval, stagger=0.1 * n_new)
+            )
+            running[task] = (key, attempt, job)
+            n_new += 1
+
+        done, _ = await asyncio.wait(
+            running, timeout=interval, return_when=asyncio.FIRST_COMPLETED
+        )
+
+        for task in done:
+            key, attempt, job = running.pop(task)
+
+            try:
+                status = task.result()
+            except Exception as err:
+                logger.error("Failed to run %s: %s", job, err)
+                status = JobStatus.FAILED
+
+            if status != JobStatus.FAILED:
+                completed.append(job)
+            elif attempt < max_retries:
+                info("Retrying %s (attempt %d of %d)", job, attempt + 1, max_retries)
+                job.status_file.unlink(missing_ok=True)
+                heapq.heappush(pending, (key, next(counter), attempt + 1, job))
+            else:
+                failed.append(job)
 
         print(
-            f" {next(s)} Running: {len(tasks)},"
-            f" queue: {len(queue)}, completed: {len(completed)}",
+            f" {next(s)} Running: {len(running)},"
+            f" queue: {len(pending)}, completed: {len(completed)},"
+            f" failed: {len(failed)}",
             end="\033[K\r",
         )
 
+    print()
+
+    if failed:
+        logger.warning("%d jobs failed: %s", len(failed), failed)
+
+
+@add_to_op_queue("Start job scheduler")
+def job_scheduler(
+    queue: Deque[Job],
+    *,
+    max_jobs: int = 10,
+    max_retries: int = 0,
+    priority: Optional[Callable[[Job], Any]] = None,
+    interval: float = 1.0,
+    **kwargs,
+):
+    """Submit jobs, keeping `max_jobs` jobs running at the same time.
+
+    The status of all running jobs is polled concurrently every `interval`
+    seconds. When a job finishes, the next job from the queue is submitted
+    immediately.
+
+    Parameters
+    ----------
+    queue : Deque[Job]
+        Jobs to submit, the queue is emptied.
+    max_jobs : int
+        Maximum number of jobs running at the same time.
+    max_retries : int
+        Number of times a failed job is resubmitted.
+    priority : Optional[Callable[[Job], Any]]
+        Key function for the order in which jobs are submitted,
+        jobs with the lowest value go first. By default, jobs are
+        submitted in the order of the queue.
+    interval : float
+        Time in seconds between status updates.
+    """
+    asyncio.run(
+        _job_scheduler(
+            queue,
+            max_jobs=max_jobs,
+            max_retries=max_retries,
+            priority=priority,
+            interval=interval,
+        )
+    )
+
 
 def job_array_submitter(
     jobs: Sequence[Job],
@@ -88,6 +384,7 @@ def job_array_submitter(
     max_jobs: int = 10,
     max_array_size: int = 100,
     create_only: bool = False,
+    pack: int = 1,
     cfg: Config,
 ):
     if len(jobs) == 0:
@@ -107,7 +404,11 @@ def job_array_submitter(
     system = get_system(cfg=cfg)
 
     system.submit_array(
-        jobs, max_jobs=max_jobs, max_array_size=max_array_size, create_only=create_only
+        jobs,
+        max_jobs=max_jobs,
+        max_array_size=max_array_size,
+        create_only=create_only,
+        pack=pack,
     )
 
 
@@ -193,8 +494,13 @@ def submit(
     max_jobs: int = 10,
     max_array_size: int = 100,
     schedule: bool = False,
+    max_retries: int = 0,
+    submit_retries: int = 3,
+    workers: int = 4,
+    rate: float = 5.0,
     array: bool = False,
     array_script: bool = False,
+    pack: int = 1,
     limit: Optional[int] = None,
     resubmit: Sequence[Path] = (),
     status_filter: Sequence[str] = (),
@@ -214,10 +520,21 @@ def submit(
     schedule : bool
         Schedule `max_jobs` to run at once, keeps the process alive until
         finished.
+    max_retries : int
+        With `schedule`, resubmit failed jobs up to this many times.
+    submit_retries : int
+        Retry a submission up to this many times when the submit command
+        fails with a transient error.
+    workers : int
+        Number of threads used to submit jobs
+    rate : float
+        Maximum number of submissions per second
     array : bool
         Submit the jobs as a single array
     array_script : bool
         Create script to submit the jobs as a single array
+    pack : int
+        Number of runs to run at the same time in every array task
     limit : Optional[int]
         Limit total number of jobs
     resubmit : Sequence[Path]
@@ -269,17 +586,25 @@ def submit(
             break
 
     if schedule:
-        job_scheduler(job_queue, max_jobs=max_jobs)
+        job_scheduler(job_queue, max_jobs=max_jobs, max_retries=max_retries)
     elif array or array_script:
         job_array_submitter(
             job_queue,
             max_jobs=max_jobs,
             max_array_size=max_array_size,
             create_only=array_script,
+            pack=pack,
             cfg=cfg,
         )
     else:
-        job_submitter(job_queue, max_jobs=max_jobs)
+        job_submitter(
+            job_queue,
+            max_jobs=max_jobs,
+            workers=workers,
+            rate=rate,
+            max_retries=submit_retries,
+            report=locations.submit_report,
+        )
 
     return job_queue
 
@@ -1,6 +1,7 @@
 """Function to create llcmd file."""
 from __future__ import annotations
 
+import re
 import stat
 from os.path import commonpath
 from pathlib import Path
@@ -67,25 +68,95 @@ cd {run_dir}
     llcmd_path.chmod(llcmd_path.stat().st_mode | stat.S_IXUSR)
 
 
-def write_array_batchfile(jobs: Sequence[Job], max_jobs: int, max_array_size: int):
-    """Write array batchfile to start jetto runs.
+ARRAY_BATCHFILE = "duqtools_slurm_array.sh"
+
+
+def array_batchfile_name(index: int) -> Path:
+    """Return name of the batchfile for array chunk `index`.
+
+    The first chunk is always written to `duqtools_slurm_array.sh`.
+    """
+    if index == 0:
+        return Path(ARRAY_BATCHFILE)
+    return Path(f"duqtools_slurm_array_{index}.sh")
+
+
+def array_chunks(
+    jobs: Sequence[Job], max_array_size: int, pack: int = 1
+) -> list[Sequence[Job]]:
+    """Split jobs into chunks that fit in a single slurm array.
+
+    With `pack` runs per array task, a chunk holds up to
+    `max_array_size * pack` jobs.
+    """
+    size = max_array_size * pack
+    return [jobs[i : i + size] for i in range(0, len(jobs), size)]
+
+
+# `#SBATCH` option for the number of tasks or nodes, i.e. `-n 4`,
+# `--ntasks=4`, `--nodes 2` or `--nodes=2-4`
+_NTASKS_OPTION = re.compile(
+    r"^(#SBATCH\s+(?:-n|-N|--ntasks|--nodes)(?:=|\s+))(\d+)(?:-(\d+))?(?=\s|$)"
+)
+
+
+def _scale_match(match: re.Match, pack: int) -> str:
+    scaled = "-".join(str(int(n) * pack) for n in match.groups()[1:] if n)
+    return f"{match[1]}{scaled}"
+
+
+def _scale_ntasks(line: str, pack: int) -> str:
+    """Request `pack` times more tasks and nodes for `#SBATCH` lines with
+    `-n`/`--ntasks` or `-N`/`--nodes`."""
+    if pack > 1:
+        return _NTASKS_OPTION.sub(lambda match: _scale_match(match, pack), line)
+    return line
+
+
+def write_array_batchfile(
+    jobs: Sequence[Job], max_jobs: int, max_array_size: int, pack: int = 1
+) -> list[Path]:
+    """Write array batchfiles to start jetto runs.
+
+    Every array task runs `pack` runs at the same time in a single
+    allocation. The number of tasks and nodes requested for the allocation
+    are scaled accordingly, so that every run gets the resources from its
+    own submission script. If a run exits with an error without writing its final
+    status, the status file is marked as failed.
+
+    If there are more jobs than fit in `max_array_size` tasks, the jobs are
+    split over multiple arrays (see `array_chunks`), which are submitted
+    independently.
 
     Parameters
     ----------
     jobs : Sequence[Job]
         List of jobs to run.
     max_jobs : int
-        Maximum number of jobs to run at the same time.
+        Maximum number of array tasks to run at the same time.
+    max_array_size : int
+        Maximum number of tasks in a single array.
+    pack : int
+        Number of runs per array task.
+
+    Returns
+    -------
+    list[Path]
+        Batchfiles in order of submission.
     """
     common_dir = Path(commonpath(job.path for job in jobs))  # type: ignore
     logs_dir = common_dir / "logs"
     logs_dir.mkdir(exist_ok=True)
 
+    system = jobs[0].cfg.system
+
     # Get the first jobs submission script as a template
     lines = open(jobs[0].submit_script)
     sbatch_lines = (line for line in lines if line.startswith("#SBATCH"))
     option_lines = (
-        line for line in sbatch_lines if line.split()[1] not in ("-o", "-e", "-J")
+        _scale_ntasks(line, pack)
+        for line in sbatch_lines
+        if line.split()[1] not in ("-o", "-e", "-J")
     )
     options = "".join(option_lines)
 
@@ -93,29 +164,52 @@ def write_array_batchfile(jobs: Sequence[Job], max_jobs: int, max_array_size: in
     out_file = logs_dir / "duqtools-%A_%a.out"
     err_file = logs_dir / "duqtools-%A_%a.err"
 
-    scripts = "\n".join(f"    {job.submit_script}" for job in jobs)
+    # Remove left-over chunks from a previous (larger) array
+    for stale in Path().glob("duqtools_slurm_array_*.sh"):
+        stale.unlink()
 
-    # Calculate array size
-    array_size = min(len(jobs), max_array_size)
+    batchfiles = []
 
-    string = f"""#!/bin/sh
+    for index, chunk in enumerate(array_chunks(jobs, max_array_size, pack)):
+        scripts = "\n".join(f"    {job.submit_script}" for job in chunk)
+        n_tasks = -(-len(chunk) // pack)
+
+        string = f"""#!/bin/bash
 {options}
 #SBATCH -o {out_file}
 #SBATCH -e {err_file}
-#SBATCH --array=0-{array_size-1}%{max_jobs}
+#SBATCH --array=0-{n_tasks-1}%{max_jobs}
 #SBATCH -J duqtools-array
 
 scripts=(
 {scripts}
 )
-i=$SLURM_ARRAY_TASK_ID
-while [ $i -le {len(jobs)} ]; do
-    echo executing ${{scripts[$i]}}
-    ${{scripts[$i]}} || true
-    i=$((i+{array_size}))
+
+run_script() {{
+    echo executing $1
+    $1
+    if [ $? -ne 0 ]; then
+        status_file=$(dirname $1)/{system.status_file}
+        if ! grep -qs -e "{system.msg_completed}" -e "{system.msg_failed}" \\
+            $status_file; then
+            echo "{system.msg_failed}" >> $status_file
+        fi
+    fi
+}}
+
+start=$((SLURM_ARRAY_TASK_ID*{pack}))
+for script in "${{scripts[@]:$start:{pack}}}"; do
+    run_script $script &
 done
+wait
 
 """
 
-    with open("duqtools_slurm_array.sh", "w") as f:
-        f.write(string)
+        batchfile = array_batchfile_name(index)
+
+        with open(batchfile, "w") as f:
+            f.write(string)
+
+        batchfiles.append(batchfile)
+
+    return batchfiles
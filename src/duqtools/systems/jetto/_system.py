@@ -19,6 +19,7 @@ from duqtools.operations import add_to_op_queue
 
 from ..base_system import AbstractSystem
 from ..jintrac import V210921Mixin, V220922Mixin
+from ._batchfile import array_batchfile_name, array_chunks
 from ._batchfile import write_array_batchfile as _write_array_batchfile
 from ._batchfile import write_batchfile as _write_batchfile
 from ._jettovar_to_json import jettovar_to_json
@@ -208,14 +209,17 @@ class BaseJettoSystem(AbstractSystem):
         max_jobs: int = 10,
         max_array_size: int = 100,
         create_only=False,
+        pack: int = 1,
         **kwargs,
     ):
         if self.options.submit_system == "slurm":
             self.create_array_slurm(
-                jobs, max_jobs=max_jobs, max_array_size=max_array_size
+                jobs, max_jobs=max_jobs, max_array_size=max_array_size, pack=pack
             )
             if not create_only:
-                self.submit_array_slurm(jobs)
+                self.submit_array_slurm(
+                    jobs, max_array_size=max_array_size, pack=pack
+                )
 
         else:
             raise NotImplementedError(
@@ -230,31 +234,49 @@ class BaseJettoSystem(AbstractSystem):
         jobs: Sequence[Job],
         max_jobs: int,
         max_array_size: int,
+        pack: int = 1,
         **kwargs,
     ):
         logger.info("writing duqtools_slurm_array.sh file")
-        _write_array_batchfile(jobs, max_jobs, max_array_size)
+        batchfiles = _write_array_batchfile(jobs, max_jobs, max_array_size, pack)
+
+        if len(batchfiles) > 1:
+            logger.info(
+                "Jobs are split over %d arrays, submit every array with `sbatch`",
+                len(batchfiles),
+            )
 
     @add_to_op_queue("Submit array job", "duqtools_slurm_array.sh")
     def submit_array_slurm(
         self,
         jobs: Sequence[Job],
+        *,
+        max_array_size: int = 100,
+        pack: int = 1,
         **kwargs,
     ):
-        for job in jobs:
-            job.lockfile.touch()
+        """Submit array batchfiles.
 
+        If the jobs are split over multiple arrays, the arrays are submitted
+        independently. Every array runs at most `max_jobs` tasks at the
+        same time.
+        """
         submit_cmd = self.options.submit_command.split()
-        cmd: list[Any] = [*submit_cmd, "duqtools_slurm_array.sh"]
 
-        logger.info(f"Submitting script via: {cmd}")
+        for index, chunk in enumerate(array_chunks(jobs, max_array_size, pack)):
+            for job in chunk:
+                job.lockfile.touch()
 
-        ret = sp.run(cmd, check=True, capture_output=True)
-        logger.info("submission returned: " + str(ret.stdout))
+            cmd: list[Any] = [*submit_cmd, str(array_batchfile_name(index))]
+
+            logger.info(f"Submitting script via: {cmd}")
+
+            ret = sp.run(cmd, check=True, capture_output=True)
+            logger.info("submission returned: " + str(ret.stdout))
 
-        for job in jobs:
-            with open(job.lockfile, "wb") as f:
-                f.write(ret.stdout)
+            for job in chunk:
+                with open(job.lockfile, "wb") as f:
+                    f.write(ret.stdout)
 
     def _apply_patches_to_template(self, jetto_template: template.Template):
         """Apply settings that are necessary for duqtools to function."""
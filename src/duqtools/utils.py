@@ -6,13 +6,14 @@ from contextlib import contextmanager
 from itertools import filterfalse, tee
 from pathlib import Path
 from textwrap import dedent
-from typing import TYPE_CHECKING, Any, Callable, Hashable, Iterable
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Iterable, Sequence, Union
 
 from pydantic_yaml import parse_yaml_raw_as
 
 if TYPE_CHECKING:
     from ._types import PathLike
     from .ids import ImasHandle
+    from .models import Run
 
 
 def no_op(*args, **kwargs):
@@ -43,10 +44,12 @@ def work_directory(path: PathLike):
         os.chdir(prev_cwd)
 
 
-def read_imas_handles_from_file(inp: PathLike) -> dict[str, ImasHandle]:
+def read_imas_handles_from_file(
+    inp: Union[str, os.PathLike]
+) -> dict[str, ImasHandle]:
     """Read a collection of imas paths from a file.
 
-    Input can be a `Runs.yaml` file `data.csv` file.
+    Input can be a `runs.yaml`, `runs_registry.json` or `data.csv` file.
 
     The CSV file must have contain at least 5 columns, including: `user`,
     `db`, `shot`, and `run`. The first column is used as the index.
@@ -71,7 +74,7 @@ def read_imas_handles_from_file(inp: PathLike) -> dict[str, ImasHandle]:
     import csv
 
     from .ids import ImasHandle
-    from .models import Runs
+    from .models import RunRegistry, Runs
 
     inp = Path(inp)
 
@@ -95,9 +98,13 @@ def read_imas_handles_from_file(inp: PathLike) -> dict[str, ImasHandle]:
                 index = row.pop(index_col)
                 handles[index] = ImasHandle(**row)
 
-    elif inp.name == "runs.yaml":
-        with open(inp) as f:
-            runs = parse_yaml_raw_as(Runs, f)
+    elif inp.name in ("runs.yaml", "runs_registry.json"):
+        runs: Sequence[Run]
+        if inp.suffix == ".json":
+            runs = RunRegistry.read(inp)
+        else:
+            with open(inp) as f:
+                runs = parse_yaml_raw_as(Runs, f).root
         handles = {
             str(run.dirname): ImasHandle.model_validate(
                 run.data_out, from_attributes=True
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pytest
+import xarray as xr
+
+from duqtools.ids import ImasHandle
+from duqtools.ids._cache import VariableCache
+from duqtools.ids._handle import SUFFIXES
+from duqtools.schema import IDSVariableModel
+
+
+@pytest.fixture
+def handle(tmp_path):
+    handle = ImasHandle(user=str(tmp_path / "imasdb"), db="jet", shot=123, run=1)
+    handle.validate()
+    for suffix in SUFFIXES:
+        handle.path(suffix).write_bytes(b"data")
+    return handle
+
+
+@pytest.fixture
+def store(tmp_path):
+    return VariableCache(directory=tmp_path / "cache", max_size=1024**2)
+
+
+def gen_dataset(n: int = 10):
+    return xr.Dataset(
+        {"$x": np.linspace(0, 1, n), "t_e": (("time", "$x"), np.ones((2, n)))},
+        coords={"time": [0.0, 1.0]},
+    )
+
+
+VARIABLES = [
+    IDSVariableModel(
+        name="t_e",
+        ids="core_profiles",
+        path="profiles_1d/*/electrons/temperature",
+        dims=["time", "$x"],
+    ),
+]
+
+
+def test_key(handle):
+    key = VariableCache.make_key(handle, "core_profiles", VARIABLES, squash=True)
+
+    assert key == VariableCache.make_key(
+        handle, "core_profiles", VARIABLES[::-1], squash=True
+    )
+    assert key != VariableCache.make_key(
+        handle, "core_profiles", VARIABLES, squash=False
+    )
+
+    other = ImasHandle(user=handle.user, db="jet", shot=123, run=2)
+    assert key != VariableCache.make_key(other, "core_profiles", VARIABLES, squash=True)
+
+
+def test_roundtrip(store, handle):
+    ds = gen_dataset()
+    key = store.make_key(handle, "core_profiles", VARIABLES)
+
+    assert store.get(key, handle) is None
+
+    store.put(key, handle, ds, ids="core_profiles", variables=["t_e"])
+
+    xr.testing.assert_identical(store.get(key, handle), ds)
+
+    (entry,) = store.entries()
+    assert entry["handle"] == handle.to_string()
+    assert entry["variables"] == ["t_e"]
+
+
+def test_invalidate(store, handle):
+    ds = gen_dataset()
+    key = store.make_key(handle, "core_profiles", VARIABLES)
+    store.put(key, handle, ds)
+
+    handle.path().write_bytes(b"new data")
+
+    assert store.get(key, handle) is None
+    assert store.entries() == []
+
+
+def test_no_data_files(store, handle):
+    ds = gen_dataset()
+    key = store.make_key(handle, "core_profiles", VARIABLES)
+    store.put(key, handle, ds)
+
+    for path in handle.paths():
+        path.unlink()
+
+    # Changes cannot be detected without data files
+    assert store.get(key, handle) is None
+    assert store.entries() == []
+
+    store.put(key, handle, ds)
+    assert store.entries() == []
+
+
+def test_evict(store, handle):
+    ds = gen_dataset(n=5000)
+
+    keys = [str(i) for i in range(4)]
+
+    for i, key in enumerate(keys):
+        store.put(key, handle, ds)
+        os.utime(store._meta_path(key), (i, i))
+
+    # refresh usage of first entry
+    assert store.get(keys[0], handle) is not None
+
+    store.max_size = 2.5 * store.entries()[0]["size"]
+    store.evict()
+
+    remaining = {entry["key"] for entry in store.entries()}
+    assert remaining == {keys[0], keys[3]}
+    assert store.size <= store.max_size
+
+    assert store.clear() == 2
+    assert store.entries() == []
+
+
+def test_from_environment(monkeypatch, tmp_path):
+    monkeypatch.setenv("DUQTOOLS_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("DUQTOOLS_CACHE_SIZE", "10")
+
+    store = VariableCache.from_environment()
+
+    assert store.directory == tmp_path
+    assert store.max_size == 10 * 1024**2
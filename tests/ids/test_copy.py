@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import pytest
+
+from duqtools.ids import ImasHandle
+from duqtools.ids._copy import (
+    copy_ids_entry_bytecopy,
+    copy_ids_entry_reflink,
+    get_copy_strategy,
+)
+
+
+@pytest.fixture
+def source(tmp_path):
+    handle = ImasHandle(user=str(tmp_path / "source"), db="jet", shot=123, run=1)
+    handle.validate()
+    for i, path in enumerate(handle.paths()):
+        path.write_bytes(bytes(range(256)) * (i + 1))
+    return handle
+
+
+@pytest.fixture
+def target(tmp_path):
+    handle = ImasHandle(user=str(tmp_path / "target"), db="jet", shot=123, run=2)
+    handle.validate()
+    return handle
+
+
+@pytest.mark.parametrize("copy_func", (copy_ids_entry_bytecopy, copy_ids_entry_reflink))
+def test_copy_files(source, target, copy_func):
+    copy_func(source, target)
+
+    for src, dst in zip(source.paths(), target.paths()):
+        assert dst.read_bytes() == src.read_bytes()
+
+
+def test_get_copy_strategy(source, target, monkeypatch):
+    monkeypatch.delenv("DUQTOOLS_COPY_STRATEGY", raising=False)
+    monkeypatch.delenv("SIMPLE_IDS_COPY", raising=False)
+
+    assert get_copy_strategy(source, target) == "reflink"
+
+    public = ImasHandle(user="public", db="jet", shot=123, run=2)
+    assert get_copy_strategy(source, public) == "imas"
+
+    monkeypatch.setenv("SIMPLE_IDS_COPY", "1")
+    assert get_copy_strategy(source, public) == "bytecopy"
+
+    monkeypatch.setenv("DUQTOOLS_COPY_STRATEGY", "imas")
+    assert get_copy_strategy(source, target) == "imas"
+
+    monkeypatch.setenv("DUQTOOLS_COPY_STRATEGY", "invalid")
+    with pytest.raises(ValueError):
+        get_copy_strategy(source, target)
+
+
+def test_copy_ids_entry_complex_skips_empty(source, target, monkeypatch):
+    from types import SimpleNamespace
+
+    from duqtools.ids import _copy
+
+    empty = -999999999
+    puts = []
+
+    class FakeIDS:
+        def __init__(self, name):
+            self.name = name
+            self.ids_properties = SimpleNamespace(homogeneous_time=empty)
+
+        def partialGet(self, path, occurrence=0):
+            return 1 if occurrence == 0 else empty
+
+        def get(self, occurrence=0):
+            self.ids_properties.homogeneous_time = 1 if self.name == "a" else empty
+
+        def put(self, occurrence=0):
+            puts.append((self.name, occurrence))
+
+        def setExpIdx(self, idx):
+            pass
+
+    class FakeEntry:
+        expIdx = 0
+
+        def __init__(self, *args):
+            self.a = FakeIDS("a")
+            self.b = FakeIDS("b")
+
+        def open_env(self, *args):
+            return (0,)
+
+        create_env = open_env
+
+        def close(self):
+            pass
+
+    idss = [{"name": "a", "maxoccur": "2"}, {"name": "b", "maxoccur": "2"}]
+
+    monkeypatch.setattr(
+        _copy, "imas", SimpleNamespace(names=["imas_3_38_0_ual_4_11_0"], ids=FakeEntry)
+    )
+    monkeypatch.setattr(_copy, "imasdef", SimpleNamespace(EMPTY_INT=empty))
+    monkeypatch.setattr(
+        _copy, "Parser", SimpleNamespace(load_idsdef=lambda: SimpleNamespace(idss=idss))
+    )
+
+    _copy.copy_ids_entry_complex(source, target)
+
+    assert puts == [("a", 0)]
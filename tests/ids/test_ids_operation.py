@@ -150,3 +150,65 @@ def test_apply_model(model, output):
     apply_model(model, ids_mapping=data)
 
     assert_equal(data[model.variable.path], output)
+
+
+def test_apply_ids_operations(monkeypatch):
+    from types import SimpleNamespace
+
+    from duqtools.ids import ImasHandle
+    from duqtools.ids._apply_model import apply_ids_operations
+
+    synced = []
+    monkeypatch.setattr(
+        IDSMapping,
+        "sync",
+        lambda self, target, provenance=True: synced.append((target, provenance)),
+    )
+
+    t0 = SimpleNamespace(x=np.array((10.0, 20.0, 30.0)), y=np.array((1.0, 2.0, 3.0)))
+    data = IDSMapping(SimpleNamespace(data=[t0], time=np.array((0,))), lazy=True)
+
+    models = [
+        IDSOperation(variable=get_test_var("data/*/x"), operator="add", value=1),
+        IDSOperation(variable=get_test_var("data/*/x"), operator="multiply", value=2),
+        IDSOperation(variable=get_test_var("data/*/y"), operator="multiply", value=3),
+    ]
+
+    target = ImasHandle(user="/tmp", db="test", shot=1, run=1)
+
+    apply_ids_operations(models, ids_mapping=data, target=target)
+
+    assert_equal(data["data/0/x"], (22, 42, 62))
+    assert_equal(data["data/0/y"], (3, 6, 9))
+    # Provenance is added to core_profiles of the target when syncing
+    assert synced == [(target, True)]
+
+
+def test_apply_ids_operations_core_profiles(monkeypatch):
+    from types import SimpleNamespace
+
+    from duqtools.ids import ImasHandle, _apply_model
+
+    synced = []
+    monkeypatch.setattr(
+        IDSMapping,
+        "sync",
+        lambda self, target, provenance=True: synced.append((target, provenance)),
+    )
+    monkeypatch.setattr(
+        _apply_model, "set_provenance_info", lambda ids: setattr(ids, "provenance", 1)
+    )
+
+    ids = SimpleNamespace(x=np.array((1.0, 2.0)))
+    data = IDSMapping(ids, lazy=True)
+
+    variable = IDSVariableModel(name="x", path="x", ids="core_profiles", dims=[])
+    models = [IDSOperation(variable=variable, operator="add", value=1)]
+
+    target = ImasHandle(user="/tmp", db="test", shot=1, run=1)
+
+    _apply_model.apply_ids_operations(models, ids_mapping=data, target=target)
+
+    # Provenance is set in memory, the IDS is not written twice
+    assert ids.provenance == 1
+    assert synced == [(target, False)]
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+import xarray as xr
+
+from duqtools.ids import load_datasets, rebase_all_coords
+
+
+class FakeHandle:
+    """Stand-in for `ImasHandle` returning a fixed dataset."""
+
+    def __init__(self, dataset: xr.Dataset | None):
+        self.dataset = dataset
+        self.calls = 0
+
+    def get_variables(self, variables):
+        self.calls += 1
+        if self.dataset is None:
+            raise KeyError("no data")
+        return self.dataset[[var for var in variables if var in self.dataset]]
+
+
+@pytest.fixture
+def handles():
+    rng = np.random.default_rng(0)
+
+    def make_dataset(time, grid):
+        return xr.Dataset(
+            {"var": (("time", "grid"), rng.random((len(time), len(grid))))},
+            coords={"time": time, "grid": grid},
+        )
+
+    return {
+        "a": FakeHandle(make_dataset(np.linspace(0, 1, 4), np.linspace(0, 1, 6))),
+        "b": FakeHandle(None),
+        "c": FakeHandle(make_dataset(np.linspace(0, 2, 5), np.linspace(0, 1, 9))),
+        "d": FakeHandle(make_dataset(np.linspace(0, 1, 3), np.linspace(0, 2, 7))),
+    }
+
+
+def test_load_datasets(handles):
+    dataset = load_datasets(handles, variables=["var"], errors=(KeyError,))
+
+    assert list(dataset["run"].values) == ["a", "c", "d"]
+
+    datasets = [handles[name].dataset for name in "acd"]
+    expected = xr.concat(rebase_all_coords(datasets, datasets[0]), "run")
+    expected["run"] = ["a", "c", "d"]
+
+    xr.testing.assert_allclose(dataset, expected)
+
+
+def test_load_datasets_errors(handles):
+    with pytest.raises(KeyError):
+        load_datasets(handles, variables=["var"])
+
+
+def test_load_datasets_lazy(handles):
+    pytest.importorskip("dask")
+
+    dataset = load_datasets(handles, variables=["var"], lazy=True, errors=(KeyError,))
+
+    assert list(dataset["run"].values) == ["a", "b", "c", "d"]
+    assert dataset["var"].data.chunks[0] == (1, 1, 1, 1)
+
+    # Only the reference has been read so far
+    assert [handle.calls for handle in handles.values()] == [1, 0, 0, 0]
+
+    eager = load_datasets(handles, variables=["var"], errors=(KeyError,))
+
+    assert dataset["var"].sel(run="b").isnull().all()
+    xr.testing.assert_allclose(dataset.drop_sel(run="b").compute(), eager)
@@ -92,3 +92,93 @@ def test_length():
     assert len(s) == 8
     assert s.length_of_key("data") == 3
     assert s.length_of_key("data/1/z") is None
+
+
+def test_lazy_mapping():
+    s = IDSMapping(Sample, lazy=True)
+
+    assert not s.is_fully_loaded
+    assert len(s._keys) == 0
+
+    assert_equal(s["data/1/y"], np.array([6, 7]))
+    assert "data/1/y" in s
+    assert "data/0/z" not in s
+    assert "data/0/x/0" not in s
+    assert "this key does not exist" not in s
+
+    assert not s.is_fully_loaded
+
+    s.load_all()
+
+    assert s.is_fully_loaded
+    assert set(s) == set(IDSMapping(Sample))
+
+
+def test_lazy_find_all():
+    s = IDSMapping(Sample, lazy=True)
+    d = s.findall("data/[0-2]/x")
+
+    assert not s.is_fully_loaded
+    assert all(key.startswith("data/") for key in s._keys)
+
+    assert d.keys() == IDSMapping(Sample).findall("data/[0-2]/x").keys()
+    assert s.findall("data/*/y").keys() == {"data/0/y", "data/1/y", "data/2/y"}
+
+
+def test_lazy_find_group():
+    s = IDSMapping(Sample, lazy=True)
+    d = s.find_by_group(r"data/(0)/(x|y)")
+
+    assert d.keys() == IDSMapping(Sample).find_by_group(r"data/(0)/(x|y)").keys()
+
+
+def test_lazy_length():
+    s = IDSMapping(Sample, lazy=True)
+
+    assert len(s) == 8
+    assert s.is_fully_loaded
+
+
+def test_compile_pattern():
+    from duqtools.ids._mapping import compile_pattern
+
+    assert compile_pattern("data/*/x") == ("data", "*", "x")
+    assert not isinstance(compile_pattern("data/[0-2]/x"), tuple)
+
+
+def test_find_all_alternation():
+    from duqtools.ids._mapping import _literal_prefix
+
+    assert _literal_prefix("data/(0|1)/x") == "data"
+    assert _literal_prefix("data/0/x|time") == ""
+    assert _literal_prefix("data/[|]/x") == "data"
+
+    for lazy in (False, True):
+        s = IDSMapping(Sample, lazy=lazy)
+
+        assert s.findall("data/0/x|time").keys() == {"data/0/x", "time"}
+        assert s.findall("data/(0|1)/x").keys() == {"data/0/x", "data/1/x"}
+
+
+def test_find_all_wildcard():
+    s = IDSMapping(Sample)
+    d = s.findall("data/*/x")
+
+    assert d.keys() == {"data/0/x", "data/1/x", "data/2/x"}
+    assert_equal(d["data/2/x"], np.array([8, 9]))
+
+    assert s.findall("data/*/z") == {}
+    assert s.findall("*/0/x") == {}
+
+
+def test_find_group_wildcard():
+    s = IDSMapping(Sample)
+    d = s.find_by_group("data/*/y")
+
+    assert d.keys() == {"0", "1", "2"}
+    assert_equal(d["1"], np.array([6, 7]))
+
+    d = s.find_by_group("data/*/(x|y)")
+
+    assert len(d) == 6
+    assert ("2", "y") in d
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import numpy as np
+import xarray as xr
+
+from duqtools.ids._merge import RunningStats
+
+
+def gen_datasets(n: int = 5):
+    rng = np.random.default_rng(123)
+
+    datasets = []
+
+    for i in range(n):
+        data = rng.random((3, 4))
+        if i == 2:
+            data[0, 0] = np.nan
+
+        ds = xr.Dataset(
+            {
+                "var": (("time", "x"), data),
+                "int_var": (("x",), np.arange(4) * i),
+            },
+            coords={"time": [0, 1, 2], "x": np.linspace(0, 1, 4)},
+        )
+        datasets.append(ds)
+
+    return datasets
+
+
+def test_running_stats():
+    datasets = gen_datasets()
+
+    stats = RunningStats()
+    for ds in datasets:
+        stats.add(ds)
+
+    ids_data = xr.concat(datasets, "handle")
+
+    xr.testing.assert_allclose(stats.get_mean(), ids_data.mean(dim="handle"))
+    xr.testing.assert_allclose(
+        stats.get_std(), ids_data.std(dim="handle", skipna=True)
+    )
+
+
+def test_running_stats_misaligned():
+    datasets = gen_datasets(n=3)
+    datasets[1] = datasets[1].assign_coords(time=[1, 2, 3])
+
+    stats = RunningStats()
+    for ds in datasets:
+        stats.add(ds)
+
+    ids_data = xr.concat(datasets, "handle", join="outer")
+
+    xr.testing.assert_allclose(stats.get_mean(), ids_data.mean(dim="handle"))
+    xr.testing.assert_allclose(
+        stats.get_std(), ids_data.std(dim="handle", skipna=True)
+    )
@@ -7,6 +7,7 @@ from idsmapping_sample_data import Sample
 
 from duqtools.ids import (
     IDSMapping,
+    rebase_all_coords,
     rebase_on_grid,
     rebase_on_time,
     rezero_time,
@@ -169,3 +170,91 @@ def test_rebase_on_time(sample_dataset, expected_time):
     new_xvar = np.linspace(22.5, 24.5, 5)
     rebased = rebase_on_time(sample_dataset, new_coords=new_xvar)
     xr.testing.assert_equal(rebased, expected_time)
+
+
+def test_standardize_grid_vectorized():
+    rng = np.random.default_rng(0)
+
+    grids = np.linspace(0, 1, 8) * (1 + 0.2 * rng.random((4, 1)))
+    values = rng.random((4, 8, 2))
+
+    ds = xr.Dataset(
+        {
+            "grid": (("time", "$grid"), grids),
+            "var": (("time", "$grid", "ion"), values),
+            "scalar": (("time",), np.arange(4.0)),
+        },
+        coords={"time": np.arange(4.0)},
+    )
+
+    ds_grid = standardize_grid(ds, old_dim="$grid", new_dim="grid", group="time")
+
+    assert ds_grid["var"].dims == ("time", "grid", "ion")
+    np.testing.assert_array_equal(ds_grid["grid"], grids[0])
+    xr.testing.assert_equal(ds_grid["scalar"], ds["scalar"])
+
+    for t in range(4):
+        for ion in range(2):
+            expected = np.interp(
+                grids[0], grids[t], values[t, :, ion], left=np.nan, right=np.nan
+            )
+            np.testing.assert_allclose(ds_grid["var"][t, :, ion], expected)
+
+
+def test_rebase_all_coords_plans():
+    from duqtools.ids._rebase import _plan_cache
+
+    rng = np.random.default_rng(0)
+
+    def make_dataset(time, grid):
+        return xr.Dataset(
+            {
+                "var": (("time", "grid"), rng.random((len(time), len(grid)))),
+                "label": (("grid",), np.array(["a"] * len(grid))),
+            },
+            coords={"time": time, "grid": grid},
+        )
+
+    reference = make_dataset(np.linspace(0, 1, 4), np.linspace(0, 1, 6))
+    datasets = [
+        make_dataset(np.linspace(0, 1.5, 5), np.linspace(-0.5, 1.5, 9))
+        for _ in range(3)
+    ]
+
+    _plan_cache.clear()
+
+    rebased = rebase_all_coords(datasets, reference)
+
+    # One plan for time and one for the grid, shared by all datasets
+    assert len(_plan_cache) == 2
+
+    for ds, new in zip(datasets, rebased):
+        expected = ds.interp(
+            time=reference["time"],
+            grid=reference["grid"],
+            kwargs={"fill_value": "extrapolate"},
+        )
+        xr.testing.assert_allclose(new, expected)
+
+    (same,) = rebase_all_coords([reference], reference)
+    assert same is reference
+
+
+def test_interpolation_plan_cache_threads(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from duqtools.ids import _rebase
+
+    monkeypatch.setattr(_rebase, "MAX_PLANS", 4)
+    _rebase._plan_cache.clear()
+
+    source = np.linspace(0, 1, 10)
+    targets = [np.linspace(0, 1, n) for n in range(2, 34)]
+
+    with ThreadPoolExecutor(8) as executor:
+        plans = list(
+            executor.map(_rebase.get_interpolation_plan, [source] * 32, targets)
+        )
+
+    assert len(plans) == 32
+    assert len(_rebase._plan_cache) <= 4
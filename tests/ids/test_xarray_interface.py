@@ -352,3 +352,95 @@ def test_raise_on_non_existant(sample_data):
     with pytest.raises(KeyError):
         sample_data.to_xarray(variables=(NonExistantVar,), skip_empty=True)
         sample_data.to_xarray(variables=(NonExistantVar,), skip_empty=False)
+
+
+def test_ragged():
+    import numpy as np
+
+    class t0:
+        grid = np.array([0.0, 1.0, 2.0])
+
+    class t1:
+        grid = np.array([0.0, 1.0])
+
+    class Ragged:
+        profiles_1d = [t0, t1]
+
+    variable = Variable(
+        name="grid",
+        ids="core_profiles",
+        path="profiles_1d/*/grid",
+        dims=["time", "x"],
+    )
+
+    mapping = IDSMapping(Ragged)
+    dataset = mapping.to_xarray(variables=[variable], ragged_mask=True)
+
+    np.testing.assert_array_equal(
+        dataset["grid"], [[0.0, 1.0, 2.0], [0.0, 1.0, np.nan]]
+    )
+    np.testing.assert_array_equal(
+        dataset["grid_mask"], [[True, True, True], [True, True, False]]
+    )
+
+    dataset = mapping.to_xarray(variables=[variable])
+    assert "grid_mask" not in dataset
+
+
+def test_write_xarray():
+    from types import SimpleNamespace
+
+    import numpy as np
+
+    def ion(i):
+        return SimpleNamespace(
+            variable=np.arange(3.0) * i,
+            variable_error_upper=np.zeros(3),
+        )
+
+    def profile(t):
+        return SimpleNamespace(
+            grid=np.arange(3.0) + t,
+            ions=[ion(1), ion(2)],
+        )
+
+    mapping = IDSMapping(SimpleNamespace(profiles_1d=[profile(0), profile(1)]))
+
+    variables = [
+        Variable(
+            name="grid",
+            ids="core_profiles",
+            path="profiles_1d/*/grid",
+            dims=["time", "x"],
+        ),
+        Variable(
+            name="ions",
+            ids="core_profiles",
+            path="profiles_1d/*/ions/*/variable",
+            dims=["time", "ion", "x"],
+        ),
+    ]
+
+    dataset = mapping.to_xarray(variables=variables)
+    dataset = dataset * 10
+
+    written = mapping.write_xarray(dataset, variables)
+
+    assert len(written) == 6
+    assert "profiles_1d/1/ions/0/variable" in written
+    xr.testing.assert_equal(mapping.to_xarray(variables=variables), dataset)
+
+    written = mapping.write_xarray(dataset, variables[1:], suffix="_error_upper")
+
+    assert written == [
+        "profiles_1d/0/ions/0/variable_error_upper",
+        "profiles_1d/0/ions/1/variable_error_upper",
+        "profiles_1d/1/ions/0/variable_error_upper",
+        "profiles_1d/1/ions/1/variable_error_upper",
+    ]
+    np.testing.assert_array_equal(
+        mapping["profiles_1d/1/ions/1/variable_error_upper"], [0.0, 20.0, 40.0]
+    )
+
+    with pytest.raises(KeyError):
+        mapping.write_arrays_in_parts({"profiles_1d/*/does_not_exist": dataset["grid"]})
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import yaml
+from pydantic_yaml import to_yaml_file
+
+from duqtools.large_scale_validation import submit as lsv_submit
+from duqtools.models import Locations, Run, RunRegistry, Runs
+from duqtools.utils import work_directory
+
+
+def write_config(drc: Path) -> list[Run]:
+    drc.mkdir()
+    config = {
+        "create": {
+            "runs_dir": str(drc / "runs"),
+            "template_data": {"user": "test", "db": "jet", "shot": 123, "run": 1},
+        },
+        "system": {"name": "nosystem"},
+    }
+    (drc / "duqtools.yaml").write_text(yaml.dump(config))
+
+    return [Run(dirname=drc / "runs" / f"run_{i:04d}") for i in range(2)]
+
+
+def test_submit_run_registry(tmp_path, monkeypatch):
+    queued = []
+
+    def job_submitter(job_queue, **kwargs):
+        queued.extend(job_queue)
+
+    monkeypatch.setattr(lsv_submit, "job_submitter", job_submitter)
+
+    # Runs listed in `runs.yaml`
+    runs = write_config(tmp_path / "a")
+    to_yaml_file(Locations(parent_dir=tmp_path / "a").runs_yaml, Runs(runs))
+
+    # Runs listed in the run registry only
+    runs = write_config(tmp_path / "b")
+    registry = RunRegistry.from_runs(
+        runs, base_operations=(), dimensions=(), indices=[(), ()]
+    )
+    registry.write(Locations(parent_dir=tmp_path / "b").runs_registry)
+
+    # No runs created
+    write_config(tmp_path / "c")
+
+    with work_directory(tmp_path):
+        lsv_submit.submit(
+            array=False,
+            array_script=False,
+            limit=None,
+            force=False,
+            max_jobs=10,
+            schedule=False,
+            max_array_size=100,
+            input_file=None,
+            pattern=None,
+            status_filter=(),
+        )
+
+    assert sorted(job.path.relative_to(tmp_path).as_posix() for job in queued) == [
+        "a/runs/run_0000",
+        "a/runs/run_0001",
+        "b/runs/run_0000",
+        "b/runs/run_0001",
+    ]
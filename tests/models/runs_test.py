@@ -28,3 +28,24 @@ def test_runs():
     assert len(runs) == 3
     assert isinstance(runs[0], Run)
     assert [run for run in runs]
+
+
+def test_runs_file(tmp_path):
+    import os
+
+    from duqtools.models import Locations
+
+    locations = Locations(parent_dir=tmp_path)
+    assert locations.runs_file is None
+
+    locations.runs_yaml.touch()
+    assert locations.runs_file == locations.runs_yaml
+
+    # The file that was written last is used
+    locations.runs_registry.touch()
+    os.utime(locations.runs_yaml, ns=(0, 0))
+    assert locations.runs_file == locations.runs_registry
+
+    os.utime(locations.runs_registry, ns=(0, 0))
+    locations.runs_yaml.touch()
+    assert locations.runs_file == locations.runs_yaml
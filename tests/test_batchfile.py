@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess as sp
+from types import SimpleNamespace
+
+import pytest
+
+from duqtools.config import Config
+from duqtools.models import Job, JobStatus
+from duqtools.systems import get_system
+from duqtools.systems.jetto._batchfile import _scale_ntasks, write_array_batchfile
+
+
+@pytest.fixture
+def jobs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    cfg = Config.from_dict({"system": {"name": "jetto"}})
+
+    jobs = []
+    for i in range(5):
+        run_dir = tmp_path / "runs" / f"run_{i:04d}"
+        run_dir.mkdir(parents=True)
+        (run_dir / ".llcmd").write_text("#!/bin/sh\n#SBATCH -J run\n#SBATCH -N 1\n")
+        jobs.append(Job(run_dir, cfg=cfg))
+
+    return jobs
+
+
+def test_write_array_batchfile(jobs, tmp_path):
+    (tmp_path / "duqtools_slurm_array_5.sh").touch()
+
+    batchfiles = write_array_batchfile(jobs, max_jobs=2, max_array_size=2)
+
+    assert [str(file) for file in batchfiles] == [
+        "duqtools_slurm_array.sh",
+        "duqtools_slurm_array_1.sh",
+        "duqtools_slurm_array_2.sh",
+    ]
+    assert not (tmp_path / "duqtools_slurm_array_5.sh").exists()
+
+    first = batchfiles[0].read_text()
+    assert "#SBATCH --array=0-1%2" in first
+    assert "#SBATCH -N 1" in first
+    assert "#SBATCH -J run" not in first
+    assert str(jobs[1].submit_script) in first
+    assert str(jobs[2].submit_script) not in first
+
+    last = batchfiles[-1].read_text()
+    assert "#SBATCH --array=0-0%2" in last
+    assert str(jobs[4].submit_script) in last
+
+
+def test_submit_array_chunks(jobs, monkeypatch):
+    commands = []
+
+    def run(cmd, **kwargs):
+        commands.append(cmd)
+        return SimpleNamespace(stdout=f"Submitted batch job {len(commands)}\n".encode())
+
+    monkeypatch.setattr(sp, "run", run)
+
+    system = get_system(jobs[0].cfg)
+    system.submit_array(jobs, max_jobs=2, max_array_size=2)
+
+    assert commands == [
+        ["sbatch", "duqtools_slurm_array.sh"],
+        ["sbatch", "duqtools_slurm_array_1.sh"],
+        ["sbatch", "duqtools_slurm_array_2.sh"],
+    ]
+
+    assert jobs[1].lockfile.read_text() == "Submitted batch job 1\n"
+    assert jobs[4].lockfile.read_text() == "Submitted batch job 3\n"
+
+
+@pytest.mark.parametrize(
+    "line,expected",
+    [
+        ("#SBATCH -n 2\n", "#SBATCH -n 6\n"),
+        ("#SBATCH -N 1\n", "#SBATCH -N 3\n"),
+        ("#SBATCH --ntasks=2\n", "#SBATCH --ntasks=6\n"),
+        ("#SBATCH --ntasks 2\n", "#SBATCH --ntasks 6\n"),
+        ("#SBATCH --nodes=1\n", "#SBATCH --nodes=3\n"),
+        ("#SBATCH --nodes=1-2\n", "#SBATCH --nodes=3-6\n"),
+        ("#SBATCH --ntasks-per-node=2\n", "#SBATCH --ntasks-per-node=2\n"),
+        ("#SBATCH -t 1:00:00\n", "#SBATCH -t 1:00:00\n"),
+    ],
+)
+def test_scale_ntasks(line, expected):
+    assert _scale_ntasks(line, pack=3) == expected
+
+
+@pytest.mark.skipif(shutil.which("bash") is None, reason="Requires bash")
+def test_write_array_batchfile_pack(jobs):
+    msg_completed = jobs[0].cfg.system.msg_completed
+
+    for i, job in enumerate(jobs):
+        # Even runs complete, odd runs crash without writing a status
+        exit_code = 1 if i % 2 else 0
+        write_status = "" if i % 2 else f"echo '{msg_completed}' > {job.status_file}"
+        job.submit_script.write_text(
+            f"#!/bin/sh\n#SBATCH -N 1\n#SBATCH -n 2\n{write_status}\nexit {exit_code}\n"
+        )
+        job.submit_script.chmod(0o755)
+
+    batchfiles = write_array_batchfile(jobs, max_jobs=2, max_array_size=2, pack=2)
+
+    assert len(batchfiles) == 2
+
+    first = batchfiles[0].read_text()
+    assert "#SBATCH --array=0-1%2" in first
+    assert "#SBATCH -n 4" in first
+    assert "#SBATCH -N 2" in first
+    assert "#SBATCH -N 1" not in first
+
+    for task_id in (0, 1):
+        sp.run(
+            ["bash", str(batchfiles[0])],
+            env={**os.environ, "SLURM_ARRAY_TASK_ID": str(task_id)},
+            check=True,
+            capture_output=True,
+        )
+
+    statuses = [job.status() for job in jobs]
+
+    assert statuses[:4] == [
+        JobStatus.COMPLETED,
+        JobStatus.FAILED,
+        JobStatus.COMPLETED,
+        JobStatus.FAILED,
+    ]
+    assert statuses[4] == JobStatus.NOSTATUS
@@ -216,3 +216,18 @@ def test_yolo(duqtools_tmpdir):
 
     assert ret.exit_code == 1
     assert ret.output.strip() == "[Errno 2] No such file or directory: 'duqtools.yaml'"
+
+
+def test_cache(duqtools_tmpdir, monkeypatch):
+    monkeypatch.setenv("DUQTOOLS_CACHE_DIR", str(duqtools_tmpdir / "cache"))
+
+    runner = CliRunner()
+    ret = runner.invoke(cli.cli_cache)
+
+    assert ret.exit_code == 0
+    assert "0 entries" in ret.output
+
+    ret = runner.invoke(cli.cli_cache, ["--clear"])
+
+    assert ret.exit_code == 0
+    assert "Removed 0 entries" in ret.output
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+
+from duqtools.config import Config
+from duqtools.create import CreateManager
+from duqtools.operations import op_queue
+
+
+class FakeCreateManager(CreateManager):
+    """Create only the run directory, fail for `run_0001`."""
+
+    def create_run(self, model, *, force=False):
+        op_queue.add(
+            action=model.dirname.mkdir,
+            kwargs={"parents": True, "exist_ok": force},
+            description="Creating run",
+        )
+        if str(model.shortname) == "run_0001":
+            raise OSError("Failed to copy")
+
+
+@pytest.fixture
+def create_mgr(tmp_path):
+    cfg = Config.from_dict(
+        {
+            "create": {
+                "runs_dir": str(tmp_path / "runs"),
+                "template_data": {
+                    "user": str(tmp_path / "imasdb"),
+                    "db": "jet",
+                    "shot": 123,
+                    "run": 1,
+                },
+                "dimensions": [
+                    {
+                        "variable": "t_e",
+                        "operator": "multiply",
+                        "values": [0.8, 0.9, 1.0, 1.1, 1.2],
+                    },
+                ],
+            },
+            "system": {"name": "nosystem"},
+        }
+    )
+    return FakeCreateManager(cfg)
+
+
+def test_create_runs_parallel(create_mgr, caplog):
+    ops_dict = create_mgr.generate_ops_dict()
+    runs = create_mgr.make_run_models(ops_dict=ops_dict, absolute_dirpath=True)
+
+    assert len(runs) == 5
+
+    with caplog.at_level(logging.INFO):
+        create_mgr.create_runs_parallel(runs, workers=2)
+
+    created = {str(run.shortname) for run in runs if run.dirname.exists()}
+    assert created == {"run_0000", "run_0002", "run_0003", "run_0004"}
+
+    assert "Created 4 of 5 runs" in caplog.text
+    assert "OSError: Failed to copy" in caplog.text
+    assert "duqtools recreate run_0001" in caplog.text
+
+
+def test_list_run(create_mgr):
+    ops_dict = create_mgr.generate_ops_dict()
+    runs = create_mgr.make_run_models(ops_dict=ops_dict, absolute_dirpath=True)
+    runs = [run for run in runs if str(run.shortname) != "run_0001"]
+
+    op_queue.enabled = True
+
+    try:
+        for run in runs:
+            create_mgr.list_run(run)
+        create_mgr.create_runs_parallel(runs, workers=2)
+
+        descriptions = [op.description for op in op_queue]
+        assert descriptions == [*("Creating run" for _ in runs), "Creating runs"]
+        assert op_queue.n_actions == 1
+    finally:
+        op_queue.clear()
+        op_queue.enabled = False
+
+    assert not any(run.dirname.exists() for run in runs)
+
+
+def test_generate_ops_dict(create_mgr):
+    ops_dict = create_mgr.generate_ops_dict()
+
+    assert len(ops_dict) == 5
+    assert list(ops_dict) == [f"run_{i:04d}" for i in range(5)]
+    assert "run_0005" not in ops_dict
+    assert "run_3" not in ops_dict
+
+    (op,) = ops_dict["run_0003"]
+    assert op.value == 1.1
+
+    assert dict(ops_dict.items()) == {name: ops_dict[name] for name in ops_dict}
+
+
+def test_write_runs_registry(create_mgr, tmp_path):
+    from duqtools.models import Locations, RunRegistry
+
+    create_mgr.runs_registry = Locations(parent_dir=tmp_path).runs_registry
+    create_mgr.runs_dir.mkdir()
+
+    ops_dict = create_mgr.generate_ops_dict()
+    runs = create_mgr.make_run_models(ops_dict=ops_dict, absolute_dirpath=True)
+
+    create_mgr.write_runs_registry(runs, ops_dict)
+
+    registry = Locations(parent_dir=tmp_path).runs
+
+    assert isinstance(registry, RunRegistry)
+    assert registry.indices.tolist() == [[0], [1], [2], [3], [4]]
+    assert [run.model_dump() for run in registry] == [
+        run.model_dump() for run in runs
+    ]
+
+    copy = RunRegistry.read(create_mgr.runs_dir / "runs_registry.json")
+    assert copy[-1].model_dump() == runs[-1].model_dump()
+
+
+def test_apply_operations_order(create_mgr, monkeypatch):
+    from duqtools import create
+
+    calls = []
+
+    monkeypatch.setattr(
+        create, "apply_model", lambda model, **kwargs: calls.append(("system", model))
+    )
+    monkeypatch.setattr(
+        create,
+        "apply_ids_operations",
+        lambda models, *, ids_mapping, target: calls.append((ids_mapping, models)),
+    )
+    monkeypatch.setattr(create_mgr, "get_source_ids", lambda ids: ids)
+
+    (op_a,), (op_b,), (op_c,) = list(create_mgr.generate_ops_dict().values())[:3]
+
+    create_mgr.apply_operations(None, None, [op_a, "jetto_1", [op_b, "jetto_2"], op_c])
+
+    assert calls == [
+        ("system", "jetto_1"),
+        ("system", "jetto_2"),
+        ("core_profiles", [op_a, op_b, op_c]),
+    ]
+
+
+def test_get_source_ids(create_mgr, monkeypatch):
+    from types import SimpleNamespace
+
+    import numpy as np
+
+    from duqtools.ids import IDSMapping, ImasHandle
+
+    calls = []
+
+    def get(self, ids="core_profiles", lazy=False):
+        calls.append(ids)
+        return IDSMapping(SimpleNamespace(x=np.arange(3.0)), lazy=lazy)
+
+    monkeypatch.setattr(ImasHandle, "get", get)
+
+    first = create_mgr.get_source_ids("core_profiles")
+    first["x"] *= 2
+
+    second = create_mgr.get_source_ids("core_profiles")
+
+    assert calls == ["core_profiles"]
+    np.testing.assert_array_equal(second["x"], (0, 1, 2))
+
+
+def test_create_threads(create_mgr, tmp_path, monkeypatch):
+    import threading
+    import time
+    from types import SimpleNamespace
+
+    import numpy as np
+
+    from duqtools import create
+    from duqtools.ids import IDSMapping, ImasHandle
+
+    active = []
+    n_active = []
+    lock = threading.Lock()
+
+    def use_imas():
+        with lock:
+            active.append(1)
+            n_active.append(len(active))
+        time.sleep(0.01)
+        with lock:
+            active.pop()
+
+    def get(self, ids="core_profiles", lazy=False):
+        with self.open():
+            use_imas()
+        return IDSMapping(SimpleNamespace(x=np.arange(3.0)), lazy=lazy)
+
+    def apply_ids_operations(models, *, ids_mapping, target):
+        with target.open(create=True):
+            use_imas()
+
+    monkeypatch.setattr(ImasHandle, "get", get)
+    monkeypatch.setattr(ImasHandle, "copy_data_to", lambda self, target: None)
+    monkeypatch.setattr(create, "apply_ids_operations", apply_ids_operations)
+    monkeypatch.chdir(tmp_path)
+
+    op_queue.enabled = True
+    op_queue.workers = 4
+
+    try:
+        runs = create.create(cfg=create_mgr.cfg)
+        op_queue.apply_all()
+    finally:
+        op_queue.clear()
+        op_queue.enabled = False
+        op_queue.workers = 1
+
+    assert len(runs) == 5
+    assert all(run.dirname.exists() for run in runs)
+    assert len(n_active) == 6
+    assert max(n_active) == 1
+
+
+def test_switch_runs_file_format(create_mgr, tmp_path):
+    from duqtools.models import Locations, RunRegistry
+
+    locations = Locations(parent_dir=tmp_path)
+    create_mgr.runs_yaml = locations.runs_yaml
+    create_mgr.runs_registry = locations.runs_registry
+    create_mgr.runs_dir.mkdir()
+
+    ops_dict = create_mgr.generate_ops_dict()
+    runs = create_mgr.make_run_models(ops_dict=ops_dict, absolute_dirpath=True)
+
+    create_mgr.write_runs_registry(runs, ops_dict)
+    assert isinstance(locations.runs, RunRegistry)
+
+    create_mgr.write_runs_file(runs[:2])
+
+    assert locations.runs_file == locations.runs_yaml
+    assert not locations.runs_registry.exists()
+    assert not (create_mgr.runs_dir / "runs_registry.json").exists()
+    assert len(locations.runs) == 2
+
+    create_mgr.write_runs_registry(runs, ops_dict)
+
+    assert locations.runs_file == locations.runs_registry
+    assert not locations.runs_yaml.exists()
+    assert not (create_mgr.runs_dir / "runs.yaml").exists()
+    assert len(locations.runs) == 5
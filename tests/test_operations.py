@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import threading
+import time
+
+import pytest
+
 from duqtools.operations import Operation, add_to_op_queue, op_queue, op_queue_context
 
 op_queue.yes = True
@@ -102,3 +107,111 @@ def test_without_queue_enabled(tmp_path):
     assert not test_file2.exists()
     op_queue.put(Operation(action=test_file2.touch, description="touching test file2"))
     assert test_file2.exists()
+
+
+def test_operation_groups(tmp_path):
+    events = []
+    lock = threading.Lock()
+
+    def record(name):
+        with lock:
+            events.append(name)
+        time.sleep(0.01)
+
+    try:
+        op_queue.workers = 4
+
+        with op_queue_context():
+            for group in ("a", "b", "c"):
+                with op_queue.group(group):
+                    for i in range(3):
+                        op_queue.add(
+                            action=record, args=(f"{group}{i}",), description="record"
+                        )
+
+            op_queue.add(action=record, args=("barrier",), description="record")
+
+            with op_queue.group("a"):
+                op_queue.add(action=record, args=("a3",), description="record")
+
+            assert [op.group for op in op_queue][-2:] == [None, "a"]
+    finally:
+        op_queue.workers = 1
+
+    assert len(events) == 11
+    assert events.index("barrier") == 9
+    assert events[-1] == "a3"
+
+    for group in ("a", "b", "c"):
+        order = [event for event in events if event.startswith(group)]
+        assert order == sorted(order)
+
+
+def test_operation_groups_error():
+    def fail():
+        raise ValueError("failed")
+
+    try:
+        op_queue.workers = 2
+
+        with pytest.raises(ValueError):
+            with op_queue_context():
+                with op_queue.group("a"):
+                    op_queue.add(action=fail, description="fail")
+                with op_queue.group("b"):
+                    op_queue.add(action=lambda: None, description="pass")
+    finally:
+        op_queue.workers = 1
+
+    assert len(op_queue) == 0
+
+
+def test_operation_lazy_description():
+    class Name(str):
+        n_formatted = 0
+
+        def __format__(self, spec):
+            Name.n_formatted += 1
+            return "snoozy"
+
+    @add_to_op_queue("Printing hello", "{name}")
+    def print_hello(name):
+        pass
+
+    op_queue.enabled = True
+    try:
+        print_hello(Name("snoozy"))
+        op = op_queue[-1]
+
+        assert Name.n_formatted == 0
+        assert op.extra_description == "snoozy"
+        assert op.description == "Printing hello"
+        assert op.extra_description == "snoozy"
+        assert Name.n_formatted == 1
+    finally:
+        op_queue.clear()
+        op_queue.enabled = False
+
+
+def test_operation_description_snapshot():
+    @add_to_op_queue("Printing hello", "{names} {names[0]!r:>6}")
+    def print_hello(names):
+        pass
+
+    @add_to_op_queue("Printing hello", "{name.missing}")
+    def print_missing(name):
+        pass
+
+    op_queue.enabled = True
+    try:
+        names = ["a"]
+        print_hello(names)
+        names.append("b")
+
+        assert op_queue[-1].extra_description == "['a']    'a'"
+
+        with pytest.raises(AttributeError):
+            print_missing("snoozy")
+    finally:
+        op_queue.clear()
+        op_queue.enabled = False
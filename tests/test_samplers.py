@@ -1,6 +1,16 @@
 from __future__ import annotations
 
-from duqtools.matrix_samplers import cartesian_product, halton, latin_hypercube, sobol
+import itertools
+
+import pytest
+
+from duqtools.matrix_samplers import (
+    CartesianDesign,
+    cartesian_product,
+    halton,
+    latin_hypercube,
+    sobol,
+)
 
 
 def test_cartesian_product():
@@ -47,3 +57,35 @@ def test_halton():
     ret = halton(i, j, k, n_samples=4, seed=123)
 
     assert ret == [("a", "c", "f"), ("b", "d", "g"), ("a", "e", "i"), ("b", "c", "h")]
+
+
+def test_cartesian_design():
+    iterables = ("ab", "cde", "fghi")
+
+    design = cartesian_product(*iterables, lazy=True)
+
+    assert isinstance(design, CartesianDesign)
+    assert len(design) == 24
+    assert list(design) == list(itertools.product(*iterables))
+    assert [design[i] for i in range(24)] == list(itertools.product(*iterables))
+    assert design[-1] == ("b", "e", "i")
+
+    with pytest.raises(IndexError):
+        design[24]
+
+
+def test_cartesian_design_large():
+    design = cartesian_product(*(range(10) for _ in range(9)), lazy=True)
+
+    assert len(design) == 10**9
+    assert design[123456789] == (1, 2, 3, 4, 5, 6, 7, 8, 9)
+
+
+@pytest.mark.parametrize("sampler", (latin_hypercube, sobol, halton))
+def test_sampler_lazy(sampler):
+    iterables = ("ab", "cde", "fghi")
+
+    design = sampler(*iterables, n_samples=4, seed=123, lazy=True)
+
+    assert len(design) == 4
+    assert list(design) == sampler(*iterables, n_samples=4, seed=123)
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from duqtools._status_backend import FileStatusBackend, SlurmStatusBackend
+from duqtools.config import Config
+from duqtools.models import Job, JobStatus
+from duqtools.status import Status, StatusError, read_run_settings
+
+
+@pytest.fixture
+def cfg():
+    return Config.from_dict({"system": {"name": "nosystem"}})
+
+
+def make_job(path, cfg, *, status=None, lock=None):
+    path.mkdir()
+    job = Job(path, cfg=cfg)
+    if status is not None:
+        job.status_file.write_text(status)
+    if lock is not None:
+        job.lockfile.write_text(lock)
+    return job
+
+
+@pytest.fixture
+def jobs(tmp_path, cfg):
+    completed = cfg.system.msg_completed
+    running = cfg.system.msg_running
+
+    return [
+        make_job(tmp_path / "run_0", cfg),
+        make_job(tmp_path / "run_1", cfg, status=completed, lock="1\n"),
+        make_job(tmp_path / "run_2", cfg, status=running, lock="Submitted batch job 2"),
+        make_job(tmp_path / "run_3", cfg, lock="Submitted batch job 3"),
+        make_job(tmp_path / "run_4", cfg, status=running, lock="Submitted batch job 4"),
+        make_job(tmp_path / "run_5", cfg, status=completed, lock="Submitted batch job 5"),
+    ]
+
+
+class FakeSlurm:
+    """Fake for `squeue`/`sacct`."""
+
+    def __init__(self, active, finished):
+        self.active = active
+        self.finished = finished
+        self.calls = []
+
+    def __call__(self, cmd):
+        self.calls.append(cmd[0])
+        if cmd[0] == "squeue":
+            return "".join(f"{i} {state}\n" for i, state in self.active.items())
+        elif cmd[0] == "sacct":
+            ids = cmd[-1].split(",")
+            return "".join(f"{i}|{state}\n" for i, state in self.finished.items() if i in ids)
+        raise ValueError(cmd)
+
+
+def test_file_backend(jobs):
+    backend = FileStatusBackend(workers=4)
+
+    expected = [
+        JobStatus.NOSTATUS,
+        JobStatus.COMPLETED,
+        JobStatus.RUNNING,
+        JobStatus.NOSTATUS,
+        JobStatus.RUNNING,
+        JobStatus.COMPLETED,
+    ]
+
+    assert backend.query(jobs) == expected
+
+    # Terminal states are frozen
+    assert len(backend._frozen) == 2
+    assert backend.query(jobs) == expected
+
+
+def test_slurm_backend(jobs):
+    run = FakeSlurm(
+        active={"2": "RUNNING", "3": "PENDING"},
+        finished={"4": "CANCELLED by 1234", "5": "COMPLETED"},
+    )
+    backend = SlurmStatusBackend(run=run)
+
+    assert backend.query(jobs) == [
+        JobStatus.NOSTATUS,
+        JobStatus.COMPLETED,
+        JobStatus.RUNNING,
+        JobStatus.SUBMITTED,
+        JobStatus.FAILED,
+        JobStatus.COMPLETED,
+    ]
+    assert run.calls == ["squeue", "sacct"]
+
+
+def test_status(jobs):
+    run = FakeSlurm(active={"2": "RUNNING", "3": "PENDING"}, finished={})
+    tracker = Status(jobs, backend=SlurmStatusBackend(run=run))
+    tracker.update_status()
+
+    assert tracker.n_running == 2
+    assert tracker.n_completed == 2
+
+    # The pending job counts as submitted, but not as a job with a status file
+    assert tracker.n_submitted == 1
+    assert tracker.n_status == 4
+
+    files = Status(jobs, backend=FileStatusBackend())
+    files.update_status()
+
+    assert files.n_submitted == 0
+    assert files.n_status == tracker.n_status
+
+
+def test_file_backend_index(jobs, tmp_path, cfg, monkeypatch):
+    index_file = tmp_path / "status.json"
+
+    n_reads = []
+    job_status = Job.status
+    monkeypatch.setattr(Job, "status", lambda job: n_reads.append(job) or job_status(job))
+
+    backend = FileStatusBackend(workers=1, index_file=index_file)
+    backend.query(jobs)
+
+    assert index_file.exists()
+    assert len(n_reads) == 4
+
+    # Unchanged files are not read again in a new session
+    n_reads.clear()
+    backend = FileStatusBackend(workers=1, index_file=index_file)
+    backend.query(jobs)
+    assert len(n_reads) == 0
+
+    # Changed files are read again
+    jobs[2].status_file.write_text(cfg.system.msg_failed + "\n")
+    assert backend.query(jobs)[2] == JobStatus.FAILED
+    assert n_reads == [jobs[2]]
+
+    # Completed and failed jobs are frozen
+    jobs[2].status_file.write_text(cfg.system.msg_running)
+    assert backend.query(jobs)[2] == JobStatus.FAILED
+
+
+def test_step_time_reader(tmp_path):
+    from duqtools.status import StepTimeReader
+
+    out_file = tmp_path / "jetto.out"
+    reader = StepTimeReader(out_file)
+    reader.chunk_size = 16
+
+    assert reader.read() is None
+
+    lines = [f"  STEP=  {i}  TIME=  {i * 0.5:.4E}  DT= 0.5\n" for i in range(10)]
+    out_file.write_text("header\n" + "".join(lines) + "some output\n")
+
+    assert reader.read() == 4.5
+
+    # Only appended data are parsed, also incomplete lines
+    with open(out_file, "a") as f:
+        f.write("  STEP=  10  TIME=  5.0")
+    assert reader.read() == 4.5
+
+    with open(out_file, "a") as f:
+        f.write("000E+00  DT= 0.5\n")
+    assert reader.read() == 5.0
+
+    # Truncated file is read from the start
+    out_file.write_text(lines[1])
+    assert reader.read() == 0.5
+
+
+def test_read_run_settings(tmp_path):
+    from duqtools.status import _run_settings_cache
+
+    template_dir = Path(__file__).parent / "test_data" / "template_model"
+
+    for name in ("jetto.jset", "jetto.in"):
+        shutil.copy(template_dir / name, tmp_path / name)
+
+    settings = read_run_settings(template_dir)
+
+    assert settings.kwmain == 1
+    assert settings.start_time == 45.75
+    assert settings.end_time == 45.76
+
+    n_cached = len(_run_settings_cache)
+    assert read_run_settings(tmp_path) is settings
+    assert len(_run_settings_cache) == n_cached
+
+    namelist = tmp_path / "jetto.in"
+    namelist.write_text(namelist.read_text().replace("KWMAIN   =  1", "KWMAIN   =  0"))
+
+    assert read_run_settings(tmp_path).kwmain == 0
+
+
+def test_monitor_kwmain(tmp_path, cfg):
+    from duqtools.status import Monitor
+
+    template_dir = Path(__file__).parent / "test_data" / "template_model"
+    jset = (template_dir / "jetto.jset").read_text()
+    namelist = (template_dir / "jetto.in").read_text()
+
+    (tmp_path / "jetto.jset").write_text(jset)
+    (tmp_path / "jetto.in").write_text(namelist.replace("KWMAIN   =  1", ""))
+
+    with pytest.raises(StatusError):
+        Monitor(pbar=None, job=Job(tmp_path, cfg=cfg))
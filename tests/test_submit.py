@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import json
+import subprocess as sp
+import time
+from collections import deque
+
+from duqtools.models import JobStatus
+from duqtools.operations import op_queue
+from duqtools.submit import TokenBucket, job_scheduler, job_submitter
+
+
+class FakeJob:
+    """Job that completes after `n_polls` status checks."""
+
+    def __init__(self, name, tmp_path, log, *, n_polls=2, n_failures=0):
+        self.name = name
+        self.log = log
+        self.n_polls = n_polls
+        self.n_failures = n_failures
+        self.status_file = tmp_path / f"{name}.status"
+        self.polls = 0
+
+    def __repr__(self):
+        return self.name
+
+    def submit(self):
+        self.log.append(self.name)
+        self.polls = 0
+
+    def status(self):
+        self.polls += 1
+        if self.polls < self.n_polls:
+            return JobStatus.RUNNING
+        if self.log.count(self.name) <= self.n_failures:
+            return JobStatus.FAILED
+        return JobStatus.COMPLETED
+
+
+def test_job_scheduler(tmp_path):
+    log = []
+    jobs = [FakeJob(f"job_{i}", tmp_path, log) for i in range(5)]
+
+    queue = deque(jobs)
+    job_scheduler(queue, max_jobs=2, interval=0.01)
+
+    assert sorted(log) == sorted(job.name for job in jobs)
+    assert len(queue) == 0
+
+
+def test_job_scheduler_priority(tmp_path):
+    log = []
+    jobs = [FakeJob(f"job_{i}", tmp_path, log) for i in range(5)]
+
+    job_scheduler(
+        deque(jobs),
+        max_jobs=1,
+        interval=0.01,
+        priority=lambda job: -int(job.name[-1]),
+    )
+
+    assert log == ["job_4", "job_3", "job_2", "job_1", "job_0"]
+
+
+def test_job_scheduler_retries(tmp_path):
+    log = []
+    jobs = [
+        FakeJob("job_0", tmp_path, log, n_failures=1),
+        FakeJob("job_1", tmp_path, log, n_failures=5),
+    ]
+
+    job_scheduler(deque(jobs), max_jobs=2, max_retries=2, interval=0.01)
+
+    assert log.count("job_0") == 2
+    assert log.count("job_1") == 3
+
+
+class FlakyJob:
+    """Job where the submit command fails `n_failures` times."""
+
+    def __init__(self, name, tmp_path, *, n_failures=0, error=None):
+        self.path = tmp_path / name
+        self.n_failures = n_failures
+        self.error = error
+        self.attempts = 0
+
+    def __repr__(self):
+        return self.path.name
+
+    def submit(self):
+        self.attempts += 1
+        if self.error:
+            raise self.error
+        if self.attempts <= self.n_failures:
+            raise sp.CalledProcessError(1, "sbatch", stderr=b"Socket timed out")
+
+
+def test_job_submitter(tmp_path):
+    jobs = [
+        FlakyJob("job_0", tmp_path),
+        FlakyJob("job_1", tmp_path, n_failures=1),
+        FlakyJob("job_2", tmp_path, n_failures=5),
+        FlakyJob("job_3", tmp_path, error=FileNotFoundError("submit script")),
+        FlakyJob(
+            "job_4",
+            tmp_path,
+            error=sp.CalledProcessError(1, "sbatch", stderr=b"Invalid partition"),
+        ),
+        FlakyJob("job_5", tmp_path),
+    ]
+    report = tmp_path / "report.json"
+
+    job_submitter(
+        jobs,
+        max_jobs=5,
+        workers=2,
+        rate=1000,
+        max_retries=2,
+        backoff=0.001,
+        report=report,
+    )
+
+    # Only transient errors are retried
+    assert [job.attempts for job in jobs] == [1, 2, 3, 1, 1, 0]
+
+    results = {result["job"]: result for result in json.loads(report.read_text())}
+
+    assert len(results) == 5
+    assert results[str(jobs[0].path)]["submitted"]
+    assert results[str(jobs[1].path)]["submitted"]
+    assert not results[str(jobs[2].path)]["submitted"]
+    assert "sbatch" in results[str(jobs[2].path)]["error"]
+    assert results[str(jobs[3].path)]["error"] == "submit script"
+    assert "Invalid partition" in results[str(jobs[4].path)]["error"]
+
+
+def test_job_submitter_listing(tmp_path):
+    jobs = [FlakyJob(f"job_{i}", tmp_path) for i in range(3)]
+
+    op_queue.enabled = True
+
+    try:
+        job_submitter(jobs, max_jobs=10)
+
+        assert len(op_queue) == 4
+        assert op_queue.n_actions == 1
+    finally:
+        op_queue.clear()
+        op_queue.enabled = False
+
+    assert [job.attempts for job in jobs] == [0, 0, 0]
+
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=100, burst=2)
+
+    start = time.monotonic()
+    for _ in range(7):
+        bucket.acquire()
+
+    # 2 tokens available at the start, 5 more at 100 per second
+    assert time.monotonic() - start >= 0.045